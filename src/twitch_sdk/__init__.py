@@ -2,11 +2,13 @@
 
 from .client import TwitchSDK
 from . import endpoints
+from . import helpers
 from . import schemas
 
 __all__ = [
     "TwitchSDK",
     "endpoints",
+    "helpers",
     "schemas",
 ]
 
@@ -0,0 +1,118 @@
+"""Stateful helpers built on top of the Helix endpoints.
+
+Helpers cache, batch and index endpoint results so hot paths can be
+served from memory instead of a Helix round trip.
+"""
+
+from .analytics import AnalyticsReports, CsvStream
+from .automod import ALLOW, DENY, AutoModQueue, AutoModQueueStats, HeldMessage
+from .bans import BannedUsersMirror
+from .blocked_terms import BlockedTermMatch, BlockedTermsAutomaton, BlockedTermsIndex
+from .channel_info import ChannelInfoWatcher, ChannelRefresh
+from .chat_colors import ChatColorResolver
+from .chat_settings import ChatSettingsMirror
+from .clips import ClipCrawler, ClipCrawlStats
+from .emotes import EmoteIndex, EmoteMatcher, MessageFragment
+from .followers import (
+    CsvFollowerSink,
+    FollowerCrawler,
+    FollowerCrawlResult,
+    FollowerSink,
+    JsonlFollowerSink,
+)
+from .games import GameCatalog
+from .live_status import LiveStatusTracker, PollCycle, StreamChange
+from .mass_moderation import BanTarget, MassActionProgress, MassModeration
+from ._ratelimit import RateBudget
+from .redemptions import (
+    CANCELED,
+    FULFILLED,
+    Redemption,
+    RedemptionBatch,
+    RedemptionBatcher,
+    RedemptionBatcherStats,
+)
+from .rewards import CustomRewardCache
+from .roles import MODERATOR, VIP, RoleIndex
+from .search import PrefixIndex, TypeaheadSearch, TypeaheadStats
+from .shield_mode import ChatRateSnapshot, ShieldModeDetector
+from .shoutouts import ShoutoutScheduler
+from .stream_crawl import Partition, PartitionStats, StreamCrawler, StreamSnapshot
+from .subscribers import SubscriberChange, SubscriberCrawl, SubscriberSet, SubscriberTracker
+from .tallies import POLL, PREDICTION, Predictor, Tally, TallyAggregator
+from .unban_requests import ChannelTriageStats, UnbanDecision, UnbanTriage
+from .user_resolver import UserResolver
+from .videos import JsonlVideoSink, VideoDelta, VideoSync, VideoSyncStats
+
+__all__ = [
+    "AnalyticsReports",
+    "CsvStream",
+    "ALLOW",
+    "DENY",
+    "AutoModQueue",
+    "AutoModQueueStats",
+    "HeldMessage",
+    "BannedUsersMirror",
+    "BlockedTermMatch",
+    "BlockedTermsAutomaton",
+    "BlockedTermsIndex",
+    "ChannelInfoWatcher",
+    "ChannelRefresh",
+    "ChatColorResolver",
+    "ChatSettingsMirror",
+    "ClipCrawler",
+    "ClipCrawlStats",
+    "EmoteIndex",
+    "EmoteMatcher",
+    "MessageFragment",
+    "CsvFollowerSink",
+    "FollowerCrawler",
+    "FollowerCrawlResult",
+    "FollowerSink",
+    "JsonlFollowerSink",
+    "GameCatalog",
+    "LiveStatusTracker",
+    "PollCycle",
+    "StreamChange",
+    "BanTarget",
+    "MassActionProgress",
+    "MassModeration",
+    "RateBudget",
+    "CANCELED",
+    "FULFILLED",
+    "Redemption",
+    "RedemptionBatch",
+    "RedemptionBatcher",
+    "RedemptionBatcherStats",
+    "CustomRewardCache",
+    "MODERATOR",
+    "VIP",
+    "RoleIndex",
+    "PrefixIndex",
+    "TypeaheadSearch",
+    "TypeaheadStats",
+    "ChatRateSnapshot",
+    "ShieldModeDetector",
+    "ShoutoutScheduler",
+    "Partition",
+    "PartitionStats",
+    "StreamCrawler",
+    "StreamSnapshot",
+    "SubscriberChange",
+    "SubscriberCrawl",
+    "SubscriberSet",
+    "SubscriberTracker",
+    "POLL",
+    "PREDICTION",
+    "Predictor",
+    "Tally",
+    "TallyAggregator",
+    "ChannelTriageStats",
+    "UnbanDecision",
+    "UnbanTriage",
+    "UserResolver",
+    "JsonlVideoSink",
+    "VideoDelta",
+    "VideoSync",
+    "VideoSyncStats",
+]
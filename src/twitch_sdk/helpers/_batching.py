@@ -0,0 +1,129 @@
+"""Request coalescing for endpoints that accept many ids per call."""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, Iterable, Iterator, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+T = TypeVar("T")
+
+# Most Helix endpoints that take repeated id params accept up to 100 per call
+MAX_IDS_PER_REQUEST = 100
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Yield successive lists of at most ``size`` items."""
+    chunk: list[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def gather_limited(
+    aws: Iterable[Awaitable[T]],
+    limit: int,
+    return_exceptions: bool = False,
+) -> list[T]:
+    """Like ``asyncio.gather`` but with at most ``limit`` awaitables running."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw: Awaitable[T]) -> T:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(
+        *(run(aw) for aw in aws), return_exceptions=return_exceptions
+    )
+
+
+class BatchLoader(Generic[K, V]):
+    """Coalesce concurrent single-key lookups into batched fetches.
+
+    Keys requested within ``delay`` seconds of each other are sent in one
+    call to ``fetch`` (up to ``max_batch_size`` keys per call). Concurrent
+    requests for a key that is already pending or in flight share its result.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[list[K]], Awaitable[dict[K, V]]],
+        max_batch_size: int = MAX_IDS_PER_REQUEST,
+        delay: float = 0.0,
+    ):
+        """Initialize the loader.
+
+        Args:
+            fetch: Coroutine returning values for the given keys. Keys missing
+                from the result resolve to None.
+            max_batch_size: Maximum keys per fetch call.
+            delay: Seconds to wait for more keys before dispatching a batch.
+        """
+        self._fetch = fetch
+        self.max_batch_size = max_batch_size
+        self.delay = delay
+        self._pending: dict[K, asyncio.Future] = {}
+        self._inflight: dict[K, asyncio.Future] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V | None:
+        """Load a single key, batched with other concurrent loads.
+
+        Cancelling a load only cancels that caller's wait; others waiting
+        on the same key still get the value.
+        """
+        return await asyncio.shield(self._future_for(key))
+
+    async def load_many(self, keys: Iterable[K]) -> dict[K, V]:
+        """Load several keys, omitting keys that resolved to None."""
+        keys = list(dict.fromkeys(keys))
+        futures = [asyncio.shield(self._future_for(key)) for key in keys]
+        values = await asyncio.gather(*futures)
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def _future_for(self, key: K) -> asyncio.Future:
+        future = self._pending.get(key) or self._inflight.get(key)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[key] = future
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.delay, self._dispatch)
+        return future
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = dict(list(self._pending.items())[:self.max_batch_size])
+            for key in batch:
+                del self._pending[key]
+            self._inflight.update(batch)
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[K, asyncio.Future]) -> None:
+        try:
+            results = await self._fetch(list(batch))
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(results.get(key))
+        finally:
+            for key, future in batch.items():
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
@@ -0,0 +1,197 @@
+"""Compact in-memory structures for large numbers of Twitch ids."""
+
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator
+
+_EMPTY = 0
+_DELETED = 0xFFFFFFFFFFFFFFFF
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+
+class IdSet:
+    """Set of Twitch ids stored in an open-addressing ``array('Q')``.
+
+    Numeric ids (all user and broadcaster ids) cost 8 bytes per slot at a
+    load factor of at most 2/3, versus ~70 bytes per entry for a ``set`` of
+    ``str``. Non-numeric ids fall back to a regular set. Membership, add and
+    discard are O(1) expected.
+    """
+
+    __slots__ = ("_table", "_used", "_filled", "_other")
+
+    def __init__(self, ids: Iterable[str] = ()):
+        self._table = array("Q", bytes(8 * 8))
+        self._used = 0  # Live entries in the table
+        self._filled = 0  # Live plus deleted slots
+        self._other: set[str] | None = None
+        for user_id in ids:
+            self.add(user_id)
+
+    def __len__(self) -> int:
+        return self._used + (len(self._other) if self._other else 0)
+
+    def __iter__(self) -> Iterator[str]:
+        for value in self._table:
+            if value != _EMPTY and value != _DELETED:
+                yield str(value - 1)
+        if self._other:
+            yield from self._other
+
+    def __contains__(self, user_id: str) -> bool:
+        key = _key(user_id)
+        if key is None:
+            return self._other is not None and user_id in self._other
+        return self._find(key)[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the table."""
+        return self._table.itemsize * len(self._table)
+
+    def _find(self, key: int) -> tuple[bool, int]:
+        """Locate ``key``: (found, slot to use)."""
+        table = self._table
+        mask = len(table) - 1
+        slot = ((key * _GOLDEN) & _MASK64) >> 32 & mask
+        first_deleted = -1
+        while True:
+            value = table[slot]
+            if value == key:
+                return True, slot
+            if value == _EMPTY:
+                return False, first_deleted if first_deleted >= 0 else slot
+            if value == _DELETED and first_deleted < 0:
+                first_deleted = slot
+            slot = (slot + 1) & mask
+
+    def add(self, user_id: str) -> bool:
+        """Add an id. Returns True if it was not already present."""
+        key = _key(user_id)
+        if key is None:
+            if self._other is None:
+                self._other = set()
+            if user_id in self._other:
+                return False
+            self._other.add(user_id)
+            return True
+
+        found, slot = self._find(key)
+        if found:
+            return False
+        if self._table[slot] == _EMPTY:
+            self._filled += 1
+        self._table[slot] = key
+        self._used += 1
+        if self._filled * 3 >= len(self._table) * 2:
+            self._resize()
+        return True
+
+    def discard(self, user_id: str) -> bool:
+        """Remove an id. Returns True if it was present."""
+        key = _key(user_id)
+        if key is None:
+            if self._other and user_id in self._other:
+                self._other.discard(user_id)
+                return True
+            return False
+
+        found, slot = self._find(key)
+        if not found:
+            return False
+        self._table[slot] = _DELETED
+        self._used -= 1
+        return True
+
+    def _resize(self) -> None:
+        size = len(self._table)
+        # Grow when mostly live entries, otherwise just purge deleted slots
+        while self._used * 2 >= size:
+            size *= 2
+        old = self._table
+        self._table = array("Q", bytes(8 * size))
+        self._used = self._filled = 0
+        mask = size - 1
+        table = self._table
+        for value in old:
+            if value == _EMPTY or value == _DELETED:
+                continue
+            slot = ((value * _GOLDEN) & _MASK64) >> 32 & mask
+            while table[slot] != _EMPTY:
+                slot = (slot + 1) & mask
+            table[slot] = value
+            self._used += 1
+        self._filled = self._used
+
+
+def _key(user_id: str) -> int | None:
+    """Table key for a numeric id (value + 1, so 0 can mean empty)."""
+    if (
+        user_id.isascii()
+        and user_id.isdigit()
+        and len(user_id) < 19
+        and (user_id[0] != "0" or user_id == "0")
+    ):
+        return int(user_id) + 1
+    return None
+
+
+class Interner:
+    """Map string ids to dense integers and back."""
+
+    __slots__ = ("_index", "_ids")
+
+    def __init__(self, ids: Iterable[str] = ()):
+        self._index: dict[str, int] = {}
+        self._ids: list[str] = []
+        for value in ids:
+            self.intern(value)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def intern(self, value: str) -> int:
+        """Get the integer for an id, assigning the next one if new."""
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self._ids)
+            self._ids.append(value)
+        return index
+
+    def lookup(self, value: str) -> int | None:
+        """Get the integer for an id without assigning one."""
+        return self._index.get(value)
+
+    def value(self, index: int) -> str:
+        """Get the id for an integer."""
+        return self._ids[index]
+
+    @property
+    def ids(self) -> list[str]:
+        """All interned ids, indexed by their integer."""
+        return self._ids
+
+
+def sorted_insert(values: array, value: int) -> bool:
+    """Insert into a sorted array. Returns False if already present."""
+    index = bisect_left(values, value)
+    if index < len(values) and values[index] == value:
+        return False
+    values.insert(index, value)
+    return True
+
+
+def sorted_remove(values: array, value: int) -> bool:
+    """Remove from a sorted array. Returns False if absent."""
+    index = bisect_left(values, value)
+    if index < len(values) and values[index] == value:
+        del values[index]
+        return True
+    return False
+
+
+def sorted_contains(values: array, value: int) -> bool:
+    """Binary-search a sorted array."""
+    index = bisect_left(values, value)
+    return index < len(values) and values[index] == value
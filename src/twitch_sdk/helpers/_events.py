@@ -0,0 +1,26 @@
+"""Accessors for EventSub notification payloads.
+
+Payloads are the dicts yielded by ``EventSubWebSocket.events()``:
+``{"subscription": {"type": ..., ...}, "event": {...}}``.
+"""
+
+from datetime import datetime
+
+from pydantic import TypeAdapter
+
+_datetime = TypeAdapter(datetime)
+
+
+def event_type(payload: dict) -> str | None:
+    """Get the subscription type of a notification payload."""
+    return payload.get("subscription", {}).get("type")
+
+
+def event_data(payload: dict) -> dict:
+    """Get the event body of a notification payload."""
+    return payload.get("event") or {}
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an RFC3339 timestamp from an event (may carry nanoseconds)."""
+    return _datetime.validate_python(value)
@@ -0,0 +1,57 @@
+"""Lightweight metrics for helper pipelines."""
+
+from array import array
+
+
+class LatencyTracker:
+    """Latency samples kept in a fixed-size ring buffer.
+
+    Recording never allocates; percentiles are computed over the most
+    recent ``window`` samples, while count, mean and max cover all samples.
+    """
+
+    __slots__ = ("_samples", "_next", "_filled", "count", "total", "max")
+
+    def __init__(self, window: int = 4096):
+        """Initialize the tracker.
+
+        Args:
+            window: Number of recent samples kept for percentiles.
+        """
+        self._samples = array("d", bytes(8 * window))
+        self._next = 0
+        self._filled = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record one latency sample."""
+        self._samples[self._next] = seconds
+        self._next = (self._next + 1) % len(self._samples)
+        if self._filled < len(self._samples):
+            self._filled += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        """Mean of all samples."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """The ``q``-th percentile (0-100) of recent samples."""
+        if not self._filled:
+            return 0.0
+        recent = sorted(self._samples[:self._filled])
+        index = min(len(recent) - 1, max(0, round(q / 100 * (len(recent) - 1))))
+        return recent[index]
+
+    def __repr__(self) -> str:
+        return (
+            f"LatencyTracker(count={self.count}, mean={self.mean:.3f}s, "
+            f"p50={self.percentile(50):.3f}s, p99={self.percentile(99):.3f}s, "
+            f"max={self.max:.3f}s)"
+        )
@@ -0,0 +1,64 @@
+"""Cursor pagination over Helix list endpoints."""
+
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable
+
+from ._ratelimit import RateBudget
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+# Largest page size accepted by most paginated Helix endpoints
+MAX_PAGE_SIZE = 100
+
+
+def next_cursor(response: Any) -> str | None:
+    """Get the ``after`` cursor from a response, or None on the last page."""
+    pagination = getattr(response, "pagination", None)
+    if pagination is None:
+        return None
+    if isinstance(pagination, dict):
+        return pagination.get("cursor") or None
+    return pagination.cursor or None
+
+
+async def iterate_pages(
+    endpoint: Callable[["TwitchHTTPClient", Any], Awaitable[Any]],
+    client: "TwitchHTTPClient",
+    params: Any,
+    page_size: int | None = MAX_PAGE_SIZE,
+    budget: RateBudget | None = None,
+) -> AsyncIterator[Any]:
+    """Yield every page of a paginated endpoint.
+
+    Args:
+        endpoint: Endpoint function, e.g. ``moderation.get_blocked_terms``.
+        client: TwitchHTTPClient for making API calls.
+        params: Request model with ``first`` and ``after`` fields. An ``after``
+            already set resumes from that cursor.
+        page_size: Value for ``first``; None keeps the request's own value.
+        budget: Rate budget to spend one point from per page.
+    """
+    if page_size is not None:
+        params = params.model_copy(update={"first": page_size})
+    while True:
+        if budget is not None:
+            await budget.acquire()
+        response = await endpoint(client, params)
+        yield response
+        cursor = next_cursor(response)
+        if not cursor or not response.data:
+            return
+        params = params.model_copy(update={"after": cursor})
+
+
+async def iterate_items(
+    endpoint: Callable[["TwitchHTTPClient", Any], Awaitable[Any]],
+    client: "TwitchHTTPClient",
+    params: Any,
+    page_size: int | None = MAX_PAGE_SIZE,
+    budget: RateBudget | None = None,
+) -> AsyncIterator[Any]:
+    """Yield every item across all pages of a paginated endpoint."""
+    async for page in iterate_pages(endpoint, client, params, page_size, budget):
+        for item in page.data:
+            yield item
@@ -0,0 +1,137 @@
+"""Client-side rate budgeting and retries for Helix calls."""
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, TypeVar
+
+import httpx
+from twitch_client import TwitchAPIError, TwitchRateLimitError
+
+T = TypeVar("T")
+
+# Helix grants user access tokens 800 points per minute (1 point per call)
+HELIX_POINTS_PER_MINUTE = 800
+
+
+class RateBudget:
+    """Token bucket mirroring Helix's points-per-minute rate limit.
+
+    Share one budget between every helper that calls Helix with the same
+    token so they cannot jointly exceed the limit.
+    """
+
+    def __init__(
+        self,
+        points: int = HELIX_POINTS_PER_MINUTE,
+        per: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the budget.
+
+        Args:
+            points: Points available per window (also the burst size).
+            per: Window length in seconds.
+            clock: Monotonic time source.
+        """
+        self.points = points
+        self.per = per
+        self._clock = clock
+        self._rate = points / per
+        self._tokens = float(points)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def available(self) -> float:
+        """Points that could be spent right now."""
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.points, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    async def acquire(self, points: int = 1) -> None:
+        """Wait until ``points`` can be spent, then spend them.
+
+        Waiters are served in arrival order.
+        """
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill()
+                if self._tokens >= points:
+                    self._tokens -= points
+                    return
+                await asyncio.sleep((points - self._tokens) / self._rate)
+
+    def block_for(self, seconds: float) -> None:
+        """Stop handing out points for ``seconds`` (e.g. after a 429)."""
+        self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+        self._tokens = 0.0
+        self._updated = self._clock()
+
+
+def rate_limit_delay(exc: TwitchRateLimitError) -> float:
+    """Seconds to wait after a 429, from its Ratelimit-Reset epoch timestamp."""
+    if exc.retry_after:
+        return max(1.0, exc.retry_after - time.time())
+    return 1.0
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Whether a failed Helix call is worth retrying."""
+    if isinstance(exc, TwitchRateLimitError):
+        return True
+    if isinstance(exc, TwitchAPIError):
+        return exc.status_code >= 500
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500  # e.g. a CDN error fetching a report
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError))
+
+
+async def call_with_retry(
+    call: Callable[[], Awaitable[T]],
+    budget: RateBudget | None = None,
+    max_retries: int = 3,
+    backoff: float = 0.5,
+    on_retry: Callable[[BaseException, int], None] | None = None,
+) -> T:
+    """Run a Helix call under a rate budget, retrying transient failures.
+
+    Rate-limit errors pause the shared budget until it resets; other
+    transient errors back off exponentially with jitter.
+
+    Args:
+        call: Zero-argument coroutine function making one Helix call.
+        budget: Budget to spend one point from per attempt.
+        max_retries: Retries after the first attempt.
+        backoff: Base delay in seconds for exponential backoff.
+        on_retry: Called with (error, attempt) before each retry.
+    """
+    attempt = 0
+    while True:
+        if budget is not None:
+            await budget.acquire()
+        try:
+            return await call()
+        except Exception as exc:
+            if attempt >= max_retries or not is_transient(exc):
+                raise
+            attempt += 1
+            if on_retry is not None:
+                on_retry(exc, attempt)
+            if isinstance(exc, TwitchRateLimitError):
+                delay = rate_limit_delay(exc)
+                if budget is not None:
+                    budget.block_for(delay)
+                    continue
+            else:
+                delay = backoff * 2 ** (attempt - 1) * (0.5 + random.random())
+            await asyncio.sleep(delay)
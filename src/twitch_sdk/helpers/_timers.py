@@ -0,0 +1,71 @@
+"""Timer structures for driving many deadlines from one loop."""
+
+import math
+from typing import Hashable
+
+
+class TimerWheel:
+    """Hashed timer wheel keyed by arbitrary hashable keys.
+
+    Scheduling and cancelling are O(1); advancing costs one slot visit per
+    elapsed tick. Each key has at most one deadline; scheduling an existing
+    key moves it. Deadlines further out than one lap stay in their slot and
+    are skipped until their time arrives.
+    """
+
+    def __init__(self, tick: float = 0.1, slots: int = 512, start: float = 0.0):
+        """Initialize the wheel.
+
+        Args:
+            tick: Seconds covered by each slot.
+            slots: Number of slots in one lap of the wheel.
+            start: Current time on the caller's clock.
+        """
+        self.tick = tick
+        self._slots: list[dict[Hashable, float]] = [{} for _ in range(slots)]
+        self._where: dict[Hashable, int] = {}
+        self._current = math.floor(start / tick)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def schedule(self, key: Hashable, when: float) -> None:
+        """Schedule ``key`` to fire at time ``when``."""
+        self.cancel(key)
+        # Never place a deadline behind the cursor; it fires on the next advance
+        index = max(math.floor(when / self.tick), self._current) % len(self._slots)
+        self._slots[index][key] = when
+        self._where[key] = index
+
+    def cancel(self, key: Hashable) -> bool:
+        """Remove a key's deadline. Returns True if it was scheduled."""
+        index = self._where.pop(key, None)
+        if index is None:
+            return False
+        del self._slots[index][key]
+        return True
+
+    def deadline(self, key: Hashable) -> float | None:
+        """Get the scheduled time for a key."""
+        index = self._where.get(key)
+        return None if index is None else self._slots[index][key]
+
+    def advance(self, now: float) -> list[Hashable]:
+        """Move the wheel to ``now`` and return keys whose deadline passed."""
+        target = math.floor(now / self.tick)
+        steps = min(target - self._current, len(self._slots) - 1)
+        due: list[Hashable] = []
+        for offset in range(steps + 1):
+            slot = self._slots[(self._current + offset) % len(self._slots)]
+            if not slot:
+                continue
+            expired = [key for key, when in slot.items() if when <= now]
+            for key in expired:
+                del slot[key]
+                del self._where[key]
+            due.extend(expired)
+        self._current = max(self._current, target)
+        return due
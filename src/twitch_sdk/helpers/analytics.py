@@ -0,0 +1,370 @@
+"""Streaming download and parsing of extension and game analytics reports."""
+
+import asyncio
+import codecs
+import csv
+import hashlib
+import io
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator
+
+import httpx
+
+from twitch_sdk.endpoints import analytics
+from twitch_sdk.schemas.analytics import (
+    ExtensionAnalytics,
+    GameAnalytics,
+    GetExtensionAnalyticsRequest,
+    GetGameAnalyticsRequest,
+)
+
+from ._batching import gather_limited
+from ._pagination import iterate_items
+from ._ratelimit import RateBudget, call_with_retry
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+Report = ExtensionAnalytics | GameAnalytics
+Converter = Callable[[str], Any]
+ChunkCallback = Callable[[bytes, int], Awaitable[None]]  # (chunk, offset in the file)
+
+# Chunks a download may run ahead of a slow rows() reader before it waits
+_READ_AHEAD = 16
+
+
+def convert(value: str) -> int | float | str | None:
+    """Default cell conversion: ints and floats as numbers, empty cells as None."""
+    if value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def report_key(report: Report) -> str:
+    """Cache key of a report: what it covers, not its (expiring) signed URL."""
+    owner = report.extension_id if isinstance(report, ExtensionAnalytics) else report.game_id
+    date_range = report.date_range
+    parts = (
+        type(report).__name__,
+        owner,
+        report.type,
+        date_range.started_at.isoformat() if date_range.started_at else "",
+        date_range.ended_at.isoformat() if date_range.ended_at else "",
+    )
+    return hashlib.blake2b("\0".join(parts).encode(), digest_size=16).hexdigest()
+
+
+class CsvStream:
+    """Incremental CSV parser fed with arbitrary text chunks.
+
+    Only complete records are parsed: text is held back up to the last
+    newline outside quotes, so quoted fields may span chunks and lines.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._quoted = False  # Whether the buffer ends inside a quoted field
+
+    def feed(self, text: str) -> list[list[str]]:
+        """Add text and return the records it completed."""
+        start = len(self._buffer)
+        self._buffer = buffer = self._buffer + text
+        # Quote parity says whether a position is inside a quoted field (an
+        # escaped "" flips it twice). Walk back from the end to the last
+        # newline outside quotes, counting quotes per segment in C.
+        self._quoted ^= bool(text.count('"') & 1)
+        quoted, end = self._quoted, len(buffer)
+        while True:
+            cut = buffer.rfind("\n", start, end)
+            if cut < 0:
+                return []
+            quoted ^= bool(buffer.count('"', cut, end) & 1)
+            if not quoted:
+                break
+            end = cut
+        complete, self._buffer = buffer[: cut + 1], buffer[cut + 1:]
+        return list(csv.reader(io.StringIO(complete)))
+
+    def close(self) -> list[list[str]]:
+        """Parse whatever is left (a last record without a newline)."""
+        rest, self._buffer = self._buffer, ""
+        return list(csv.reader(io.StringIO(rest))) if rest.strip() else []
+
+
+class _Rows:
+    """Turns raw records into dicts, using the first record as the header."""
+
+    def __init__(self, converters: dict[str, Converter] | None, default: Converter | None):
+        self.header: list[str] | None = None
+        self._converters = converters or {}
+        self._default = default
+
+    def __call__(self, records: list[list[str]]) -> Iterator[dict[str, Any]]:
+        for record in records:
+            if self.header is None:
+                self.header = [name.strip() for name in record]
+                continue
+            if not record:
+                continue
+            row = {}
+            for name, value in zip(self.header, record):
+                converter = self._converters.get(name, self._default)
+                row[name] = converter(value) if converter is not None else value
+            yield row
+
+
+class AnalyticsReports:
+    """Download analytics reports and parse them without holding them in memory.
+
+    Report CSVs are streamed over one pooled ``httpx.AsyncClient`` straight
+    into a cache directory and parsed chunk by chunk as they arrive. The
+    cache is keyed by what a report covers (owner, type and date range)
+    rather than by its signed URL, which changes on every Helix call, so a
+    report downloaded once is read from disk afterwards. Concurrent
+    requests for the same report share one download.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        cache_dir: str | Path,
+        budget: RateBudget | None = None,
+        concurrency: int = 4,
+        chunk_size: int = 64 * 1024,
+        http: httpx.AsyncClient | None = None,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+    ):
+        """Initialize the downloader.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            cache_dir: Directory downloaded reports are kept in.
+            budget: Shared rate budget for the Helix calls listing reports.
+            concurrency: Reports downloaded at once by :meth:`download_many`.
+            chunk_size: Bytes read from the network or disk at a time.
+            http: Client for fetching report URLs. Defaults to one owned
+                (and closed by :meth:`aclose`) by this object.
+            max_retries: Retries per download for transient failures, such
+                as connection errors and 5xx responses.
+            backoff: Base delay in seconds between retries.
+        """
+        self.client = client
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.budget = budget
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._owns_http = http is None
+        self.http = http or httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            timeout=httpx.Timeout(30.0, read=120.0),
+            follow_redirects=True,
+        )
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def aclose(self) -> None:
+        """Close the HTTP client if this object created it."""
+        if self._owns_http:
+            await self.http.aclose()
+
+    async def __aenter__(self) -> "AnalyticsReports":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    # Listing
+
+    async def extension_reports(
+        self, params: GetExtensionAnalyticsRequest | None = None
+    ) -> list[ExtensionAnalytics]:
+        """Every extension report Helix offers for ``params``."""
+        return [
+            report
+            async for report in iterate_items(
+                analytics.get_extension_analytics,
+                self.client,
+                params or GetExtensionAnalyticsRequest(),
+                budget=self.budget,
+            )
+        ]
+
+    async def game_reports(self, params: GetGameAnalyticsRequest | None = None) -> list[GameAnalytics]:
+        """Every game report Helix offers for ``params``."""
+        return [
+            report
+            async for report in iterate_items(
+                analytics.get_game_analytics,
+                self.client,
+                params or GetGameAnalyticsRequest(),
+                budget=self.budget,
+            )
+        ]
+
+    # Downloading
+
+    def path(self, report: Report) -> Path:
+        """Where a report is (or will be) cached."""
+        return self.cache_dir / f"{report_key(report)}.csv"
+
+    def is_cached(self, report: Report) -> bool:
+        """Whether a report was already downloaded."""
+        return self.path(report).exists()
+
+    async def _stream(self, report: Report, on_chunk: ChunkCallback | None) -> Path:
+        path = self.path(report)
+        tmp = path.with_name(path.name + ".part")
+        try:
+            async with self.http.stream("GET", report.URL) as response:
+                response.raise_for_status()
+                with tmp.open("wb") as file:
+                    async for chunk in response.aiter_bytes(self.chunk_size):
+                        if on_chunk is not None:
+                            await on_chunk(chunk, file.tell())
+                        file.write(chunk)
+            tmp.replace(path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return path
+
+    def _fetch_once(self, report: Report, on_chunk: ChunkCallback | None) -> asyncio.Task:
+        """Start (or join) a download, retrying transient failures within it."""
+        key = report_key(report)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call_with_retry(
+                lambda: self._stream(report, on_chunk),
+                max_retries=self.max_retries,
+                backoff=self.backoff,
+            ))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def download(self, report: Report) -> Path:
+        """Download a report into the cache unless it is there already."""
+        path = self.path(report)
+        if path.exists():
+            return path
+        return await asyncio.shield(self._fetch_once(report, None))
+
+    async def download_many(self, reports: Iterable[Report]) -> dict[str, Exception]:
+        """Download reports concurrently, skipping cached ones.
+
+        Returns:
+            Errors keyed by report URL for reports that failed to download.
+        """
+        reports = list(reports)
+        results = await gather_limited(
+            (self.download(report) for report in reports),
+            self.concurrency,
+            return_exceptions=True,
+        )
+        return {
+            report.URL: result
+            for report, result in zip(reports, results)
+            if isinstance(result, Exception)
+        }
+
+    # Parsing
+
+    async def rows(
+        self,
+        report: Report,
+        converters: dict[str, Converter] | None = None,
+        default: Converter | None = convert,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield a report's rows as dicts keyed by column name.
+
+        An uncached report is parsed while it downloads, so the first rows
+        are available before the last byte arrives. The download runs at
+        most a few chunks ahead of the reader, so a slow consumer holds
+        back the download rather than buffering the report in memory.
+
+        Args:
+            report: Report from :meth:`extension_reports` or :meth:`game_reports`.
+            converters: Per-column conversion functions.
+            default: Conversion for other columns; None keeps strings.
+        """
+        make_rows = _Rows(converters, default)
+        parser = CsvStream()
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        path = self.path(report)
+
+        if not path.exists() and report_key(report) not in self._inflight:
+            chunks: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=_READ_AHEAD)
+            received = 0
+            reading = True
+
+            async def on_chunk(chunk: bytes, offset: int) -> None:
+                # A retried download starts over; pass on only the new bytes
+                nonlocal received
+                if reading and offset + len(chunk) > received:
+                    await chunks.put(chunk[max(0, received - offset):])
+                    received = offset + len(chunk)
+
+            async def pump() -> None:
+                try:
+                    await asyncio.wait({task})  # Neither raises nor cancels the download
+                finally:
+                    if reading:
+                        await chunks.put(None)
+
+            task = self._fetch_once(report, on_chunk)
+            pumping = asyncio.ensure_future(pump())
+            try:
+                while (chunk := await chunks.get()) is not None:
+                    for row in make_rows(parser.feed(decoder.decode(chunk))):
+                        yield row
+                await task  # Raise download errors
+            finally:
+                # A reader that stops early lets the download finish unhindered
+                reading = False
+                pumping.cancel()
+                while not chunks.empty():
+                    chunks.get_nowait()
+        else:
+            path = await self.download(report)
+            with path.open("rb") as file:
+                while chunk := file.read(self.chunk_size):
+                    for row in make_rows(parser.feed(decoder.decode(chunk))):
+                        yield row
+                    await asyncio.sleep(0)  # Stay fair to other tasks on big files
+
+        for row in make_rows(parser.feed(decoder.decode(b"", final=True)) + parser.close()):
+            yield row
+
+    async def columns(
+        self,
+        report: Report,
+        names: Iterable[str] | None = None,
+        converters: dict[str, Converter] | None = None,
+        default: Converter | None = convert,
+    ) -> dict[str, list]:
+        """Read a report into one list per column.
+
+        Args:
+            report: Report to read.
+            names: Columns to keep. Defaults to all of them.
+            converters: Per-column conversion functions.
+            default: Conversion for other columns; None keeps strings.
+        """
+        wanted = list(names) if names is not None else None
+        columns: dict[str, list] = {name: [] for name in wanted or ()}
+        async for row in self.rows(report, converters, default):
+            if wanted is None:
+                wanted = list(row)
+                columns = {name: [] for name in wanted}
+            for name in wanted:
+                columns[name].append(row.get(name))
+        return columns
@@ -0,0 +1,244 @@
+"""Automatic processing of messages held by AutoMod."""
+
+import asyncio
+import inspect
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable, NamedTuple
+
+from twitch_sdk.endpoints import moderation
+from twitch_sdk.schemas.moderation import ManageHeldAutoModMessageRequest
+
+from ._events import event_data, event_type, parse_timestamp
+from ._metrics import LatencyTracker
+from ._ratelimit import RateBudget, call_with_retry
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+ALLOW = "ALLOW"
+DENY = "DENY"
+
+
+class HeldMessage(NamedTuple):
+    """A chat message held by AutoMod, from an ``automod.message.hold`` event."""
+
+    broadcaster_id: str
+    user_id: str
+    user_login: str
+    message_id: str
+    text: str
+    category: str | None
+    level: int | None
+    held_at: datetime | None
+    received_at: float  # time.monotonic() when the event was ingested
+
+
+HeldMessageClassifier = Callable[[HeldMessage], str | None | Awaitable[str | None]]
+
+
+class AutoModQueueStats:
+    """Counters and latency for held-message processing."""
+
+    __slots__ = ("received", "allowed", "denied", "undecided", "skipped", "dropped", "failed", "latency")
+
+    def __init__(self):
+        self.received = 0
+        self.allowed = 0
+        self.denied = 0
+        self.undecided = 0  # No classifier decided; left for humans
+        self.skipped = 0  # Resolved elsewhere before a worker reached it
+        self.dropped = 0  # Rejected because the queue was full
+        self.failed = 0
+        # Seconds from AutoMod holding the message to our allow/deny completing
+        self.latency = LatencyTracker()
+
+    def __repr__(self) -> str:
+        return (
+            f"AutoModQueueStats(received={self.received}, allowed={self.allowed}, "
+            f"denied={self.denied}, undecided={self.undecided}, skipped={self.skipped}, "
+            f"dropped={self.dropped}, failed={self.failed}, latency={self.latency!r})"
+        )
+
+
+class AutoModQueue:
+    """Classify held AutoMod messages and allow or deny them automatically.
+
+    Feed ``automod.message.hold`` notifications to :meth:`handle_event`
+    and keep :meth:`run` running. A bounded pool of workers passes each
+    message through the classifiers in order; the first to return
+    ``"ALLOW"`` or ``"DENY"`` decides it, otherwise it is left for human
+    moderators. Calls are paced per moderator with a :class:`RateBudget`,
+    and hold-to-resolution latency is tracked in :attr:`stats`.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        moderator_id: str,
+        classifiers: Iterable[HeldMessageClassifier] = (),
+        moderators: dict[str, str] | None = None,
+        concurrency: int = 20,
+        max_pending: int = 10_000,
+        max_retries: int = 2,
+        budget_factory: Callable[[], RateBudget] = RateBudget,
+    ):
+        """Initialize the processor.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            moderator_id: Moderator acting on held messages by default.
+            classifiers: Classifiers tried in order. May be sync or async.
+            moderators: Per-broadcaster moderator overrides.
+            concurrency: Number of worker tasks.
+            max_pending: Held messages queued before new ones are dropped.
+            max_retries: Retries per action for transient failures.
+            budget_factory: Creates the rate budget for each moderator.
+        """
+        self.client = client
+        self.moderator_id = moderator_id
+        self.classifiers: list[HeldMessageClassifier] = list(classifiers)
+        self.moderators = dict(moderators or {})
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.stats = AutoModQueueStats()
+        self._budget_factory = budget_factory
+        self._budgets: dict[str, RateBudget] = {}
+        self._queue: asyncio.Queue[HeldMessage] = asyncio.Queue(maxsize=max_pending)
+        self._queued: set[str] = set()
+        self._resolved: set[str] = set()
+
+    @property
+    def pending(self) -> int:
+        """Held messages waiting for a worker."""
+        return self._queue.qsize()
+
+    def add_classifier(self, classifier: HeldMessageClassifier) -> None:
+        """Append a classifier."""
+        self.classifiers.append(classifier)
+
+    def budget(self, moderator_id: str) -> RateBudget:
+        """Get the rate budget used for a moderator's calls."""
+        budget = self._budgets.get(moderator_id)
+        if budget is None:
+            budget = self._budgets[moderator_id] = self._budget_factory()
+        return budget
+
+    # Ingestion
+
+    def submit(self, message: HeldMessage) -> bool:
+        """Queue a held message. Returns False if the queue is full."""
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.stats.dropped += 1
+            return False
+        self._queued.add(message.message_id)
+        self.stats.received += 1
+        return True
+
+    def handle_event(self, payload: dict) -> bool:
+        """Apply an ``automod.message.hold`` or ``automod.message.update`` notification.
+
+        Update events mean the message was resolved elsewhere, so a queued
+        copy is skipped.
+
+        Returns:
+            True if the payload was an AutoMod message event.
+        """
+        kind = event_type(payload)
+        if kind == "automod.message.update":
+            message_id = event_data(payload).get("message_id")
+            if message_id in self._queued:
+                self._resolved.add(message_id)
+            return True
+        if kind != "automod.message.hold":
+            return False
+
+        event = event_data(payload)
+        held_at = event.get("held_at")
+        self.submit(HeldMessage(
+            broadcaster_id=event["broadcaster_user_id"],
+            user_id=event["user_id"],
+            user_login=event.get("user_login", ""),
+            message_id=event["message_id"],
+            text=(event.get("message") or {}).get("text", ""),
+            category=event.get("category"),
+            level=event.get("level"),
+            held_at=parse_timestamp(held_at) if held_at else None,
+            received_at=time.monotonic(),
+        ))
+        return True
+
+    # Processing
+
+    async def classify(self, message: HeldMessage) -> str | None:
+        """Run the classifiers against one held message."""
+        for classifier in self.classifiers:
+            action = classifier(message)
+            if inspect.isawaitable(action):
+                action = await action
+            if action is not None:
+                return action.upper()
+        return None
+
+    async def _process(self, message: HeldMessage) -> None:
+        self._queued.discard(message.message_id)
+        if message.message_id in self._resolved:
+            self._resolved.discard(message.message_id)
+            self.stats.skipped += 1
+            return
+
+        action = await self.classify(message)
+        if action is None:
+            self.stats.undecided += 1
+            return
+
+        moderator_id = self.moderators.get(message.broadcaster_id, self.moderator_id)
+        params = ManageHeldAutoModMessageRequest(
+            user_id=moderator_id,
+            msg_id=message.message_id,
+            action=action,
+        )
+        try:
+            await call_with_retry(
+                lambda: moderation.manage_held_automod_message(self.client, params),
+                budget=self.budget(moderator_id),
+                max_retries=self.max_retries,
+            )
+        except Exception:
+            self.stats.failed += 1
+            return
+
+        if action == ALLOW:
+            self.stats.allowed += 1
+        else:
+            self.stats.denied += 1
+        if message.held_at is not None:
+            self.stats.latency.record(time.time() - message.held_at.timestamp())
+        else:
+            self.stats.latency.record(time.monotonic() - message.received_at)
+
+    async def _worker(self) -> None:
+        while True:
+            message = await self._queue.get()
+            try:
+                await self._process(message)
+            except Exception:
+                # A failing classifier must not take the worker down
+                self.stats.failed += 1
+            finally:
+                self._queue.task_done()
+
+    async def run(self) -> None:
+        """Process held messages with the worker pool, forever."""
+        workers = [asyncio.ensure_future(self._worker()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+
+    async def join(self) -> None:
+        """Wait until every queued message has been processed."""
+        await self._queue.join()
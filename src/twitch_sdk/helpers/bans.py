@@ -0,0 +1,238 @@
+"""In-memory mirror of banned users per channel."""
+
+import asyncio
+import heapq
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterable
+
+from twitch_sdk.endpoints import moderation
+from twitch_sdk.schemas.moderation import BannedUser, GetBannedUsersRequest
+
+from ._batching import gather_limited
+from ._compact import IdSet
+from ._events import event_data, event_type, parse_timestamp
+from ._pagination import iterate_items
+from ._ratelimit import RateBudget
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+
+class BannedUsersMirror:
+    """Banned and timed-out users for many channels, queried in O(1).
+
+    Each channel is loaded with a full crawl of Get Banned Users and then
+    kept current from ``channel.ban``/``channel.unban`` EventSub events.
+    Timeouts are removed when their ``expires_at`` passes, driven by a
+    single timer heap shared by all channels. Ids are held in a compact
+    :class:`~twitch_sdk.helpers._compact.IdSet` per channel.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        budget: RateBudget | None = None,
+        concurrency: int = 10,
+    ):
+        """Initialize the mirror.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            budget: Shared rate budget for crawls.
+            concurrency: Maximum channels crawled at once by :meth:`load`.
+        """
+        self.client = client
+        self.budget = budget
+        self.concurrency = concurrency
+        self._banned: dict[str, IdSet] = {}
+        # broadcaster_id -> user_id -> expiry (epoch seconds), timeouts only
+        self._timeouts: dict[str, dict[str, float]] = {}
+        self._heap: list[tuple[float, str, str]] = []
+        self._syncing: dict[str, list[dict]] = {}
+        self._wakeup: asyncio.Event | None = None
+
+    def __contains__(self, broadcaster_id: str) -> bool:
+        return broadcaster_id in self._banned
+
+    def is_banned(self, broadcaster_id: str, user_id: str) -> bool:
+        """Whether a user is currently banned or timed out in a channel."""
+        banned = self._banned.get(broadcaster_id)
+        if banned is None or user_id not in banned:
+            return False
+        expires_at = self._timeouts.get(broadcaster_id, {}).get(user_id)
+        return expires_at is None or expires_at > time.time()
+
+    def is_timed_out(self, broadcaster_id: str, user_id: str) -> bool:
+        """Whether a user is serving a (not yet expired) timeout in a channel."""
+        expires_at = self._timeouts.get(broadcaster_id, {}).get(user_id)
+        return expires_at is not None and expires_at > time.time()
+
+    def banned_count(self, broadcaster_id: str) -> int:
+        """Number of banned or timed-out users in a channel."""
+        banned = self._banned.get(broadcaster_id)
+        return len(banned) if banned is not None else 0
+
+    def banned_users(self, broadcaster_id: str) -> list[str]:
+        """Ids of every banned or timed-out user in a channel."""
+        return list(self._banned.get(broadcaster_id, ()))
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the id tables."""
+        return sum(banned.nbytes for banned in self._banned.values())
+
+    # Loading
+
+    async def sync(self, broadcaster_id: str) -> int:
+        """Crawl every page of a channel's bans, replacing local state.
+
+        Events for the channel that arrive during the crawl are replayed
+        on top of the crawled state.
+
+        Returns:
+            Number of banned users loaded.
+        """
+        self._syncing.setdefault(broadcaster_id, [])
+        try:
+            banned = IdSet()
+            timeouts: list[tuple[str, float]] = []
+            params = GetBannedUsersRequest(broadcaster_id=broadcaster_id)
+            async for user in iterate_items(
+                moderation.get_banned_users, self.client, params, budget=self.budget
+            ):
+                banned.add(user.user_id)
+                if user.expires_at is not None:
+                    timeouts.append((user.user_id, user.expires_at.timestamp()))
+        except BaseException:
+            self._syncing.pop(broadcaster_id, None)
+            raise
+
+        self._timeouts.pop(broadcaster_id, None)
+        self._banned[broadcaster_id] = banned
+        for user_id, expires_at in timeouts:
+            self._set_timeout(broadcaster_id, user_id, expires_at)
+        for payload in self._syncing.pop(broadcaster_id):
+            self._apply(payload)
+        return len(banned)
+
+    async def load(self, broadcaster_ids: Iterable[str]) -> dict[str, Exception]:
+        """Crawl many channels with bounded concurrency.
+
+        Returns:
+            Errors keyed by broadcaster id for channels that failed to load.
+        """
+        broadcaster_ids = list(dict.fromkeys(broadcaster_ids))
+        results = await gather_limited(
+            (self.sync(broadcaster_id) for broadcaster_id in broadcaster_ids),
+            self.concurrency,
+            return_exceptions=True,
+        )
+        return {
+            broadcaster_id: result
+            for broadcaster_id, result in zip(broadcaster_ids, results)
+            if isinstance(result, Exception)
+        }
+
+    def forget(self, broadcaster_id: str) -> None:
+        """Stop mirroring a channel."""
+        self._banned.pop(broadcaster_id, None)
+        self._timeouts.pop(broadcaster_id, None)
+
+    # Updates
+
+    def _set_timeout(self, broadcaster_id: str, user_id: str, expires_at: float) -> None:
+        self._timeouts.setdefault(broadcaster_id, {})[user_id] = expires_at
+        heapq.heappush(self._heap, (expires_at, broadcaster_id, user_id))
+        if self._wakeup is not None and self._heap[0][0] == expires_at:
+            self._wakeup.set()
+
+    def add_ban(
+        self,
+        broadcaster_id: str,
+        user_id: str,
+        expires_at: datetime | None = None,
+    ) -> None:
+        """Record a ban or timeout, e.g. after calling ban_user."""
+        banned = self._banned.get(broadcaster_id)
+        if banned is None:
+            return
+        banned.add(user_id)
+        if expires_at is None:
+            self._timeouts.get(broadcaster_id, {}).pop(user_id, None)
+        else:
+            self._set_timeout(broadcaster_id, user_id, expires_at.timestamp())
+
+    def add_banned_user(self, broadcaster_id: str, user: BannedUser) -> None:
+        """Record a ban from a BannedUser entry."""
+        self.add_ban(broadcaster_id, user.user_id, user.expires_at)
+
+    def remove_ban(self, broadcaster_id: str, user_id: str) -> None:
+        """Record an unban or an expired timeout."""
+        banned = self._banned.get(broadcaster_id)
+        if banned is not None:
+            banned.discard(user_id)
+        self._timeouts.get(broadcaster_id, {}).pop(user_id, None)
+
+    def _apply(self, payload: dict) -> None:
+        kind = event_type(payload)
+        event = event_data(payload)
+        broadcaster_id = event.get("broadcaster_user_id")
+        user_id = event.get("user_id")
+        if not broadcaster_id or not user_id:
+            return
+        if kind == "channel.ban":
+            ends_at = None if event.get("is_permanent") else event.get("ends_at")
+            self.add_ban(broadcaster_id, user_id, parse_timestamp(ends_at) if ends_at else None)
+        else:
+            self.remove_ban(broadcaster_id, user_id)
+
+    def handle_event(self, payload: dict) -> bool:
+        """Apply a ``channel.ban`` or ``channel.unban`` EventSub notification.
+
+        Returns:
+            True if the payload was a ban or unban event.
+        """
+        if event_type(payload) not in ("channel.ban", "channel.unban"):
+            return False
+        broadcaster_id = event_data(payload).get("broadcaster_user_id")
+        pending = self._syncing.get(broadcaster_id)
+        if pending is not None:
+            pending.append(payload)
+        self._apply(payload)
+        return True
+
+    # Timeouts
+
+    def expire(self, now: float | None = None) -> int:
+        """Remove timeouts that have ended.
+
+        Returns:
+            Number of users whose timeout expired.
+        """
+        now = time.time() if now is None else now
+        expired = 0
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expires_at, broadcaster_id, user_id = heapq.heappop(heap)
+            timeouts = self._timeouts.get(broadcaster_id)
+            if timeouts is None or timeouts.get(user_id) != expires_at:
+                continue  # Superseded by a newer ban, unban or resync
+            del timeouts[user_id]
+            banned = self._banned.get(broadcaster_id)
+            if banned is not None:
+                banned.discard(user_id)
+            expired += 1
+        return expired
+
+    async def run(self) -> None:
+        """Expire timeouts as they end, forever."""
+        self._wakeup = asyncio.Event()
+        while True:
+            self._wakeup.clear()
+            self.expire()
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
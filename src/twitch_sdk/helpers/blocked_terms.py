@@ -0,0 +1,385 @@
+"""Local blocked-term matching compiled from each channel's blocked terms."""
+
+import re
+from collections import deque
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+from twitch_sdk.endpoints import moderation
+from twitch_sdk.schemas.moderation import (
+    AddBlockedTermRequest,
+    BlockedTerm,
+    GetBlockedTermsRequest,
+    RemoveBlockedTermRequest,
+)
+
+from ._batching import gather_limited
+from ._events import event_data, event_type
+from ._pagination import iterate_items
+from ._ratelimit import RateBudget
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+_SPACE_RE = re.compile(r"\s+")
+_UNNORMALIZED_SPACE_RE = re.compile(r"[^\S ]|  ")  # Whitespace normalize_term would change
+
+
+def normalize_term(text: str) -> str:
+    """Normalize a blocked term the way it is matched: lowercase, single spaces."""
+    return _SPACE_RE.sub(" ", text.strip()).lower()
+
+
+def _collapse_spaces(text: str) -> tuple[str, list[int] | None]:
+    """Collapse whitespace runs to single spaces, as :func:`normalize_term` does.
+
+    Returns:
+        The collapsed text and, if it differs from ``text``, the index in
+        ``text`` of each of its characters.
+    """
+    if not _UNNORMALIZED_SPACE_RE.search(text):
+        return text, None
+    pieces: list[str] = []
+    offsets: list[int] = []
+    position = 0
+    for run in _SPACE_RE.finditer(text):
+        pieces.append(text[position:run.start()])
+        offsets.extend(range(position, run.start()))
+        pieces.append(" ")
+        offsets.append(run.start())
+        position = run.end()
+    pieces.append(text[position:])
+    offsets.extend(range(position, len(text)))
+    return "".join(pieces), offsets
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class BlockedTermMatch(NamedTuple):
+    """A blocked term found in a message.
+
+    ``start`` and ``end`` index into the message as given, even where
+    whitespace runs in it were collapsed for matching.
+    """
+
+    term: str  # Normalized term text
+    term_id: str | None  # None for terms learned from EventSub
+    start: int
+    end: int
+
+
+class _Pattern:
+    """A compiled blocked term.
+
+    Terms are matched case-insensitively on word boundaries. ``*`` matches
+    any run of non-space characters, so ``dog*`` also matches ``doggo``.
+    The longest literal piece of the term is the anchor fed to the
+    automaton; wildcard terms are confirmed with a regex around the anchor.
+    """
+
+    __slots__ = (
+        "term", "term_id", "anchor", "spaces_before", "spaces_after",
+        "regex", "bound_start", "bound_end",
+    )
+
+    def __init__(self, term: str, term_id: str | None):
+        self.term = term
+        self.term_id = term_id
+        pieces = term.split("*")
+        anchor_index = max(range(len(pieces)), key=lambda i: len(pieces[i]))
+        self.anchor = pieces[anchor_index]
+        self.spaces_before = sum(piece.count(" ") for piece in pieces[:anchor_index])
+        self.spaces_after = sum(piece.count(" ") for piece in pieces[anchor_index + 1:])
+        if len(pieces) == 1:
+            self.regex = None
+        else:
+            body = r"\S*".join(re.escape(piece) for piece in pieces)
+            self.regex = re.compile(rf"(?<!\w){body}(?!\w)")
+        self.bound_start = _is_word(term[0])
+        self.bound_end = _is_word(term[-1])
+
+
+class BlockedTermsAutomaton:
+    """Aho-Corasick automaton over a channel's blocked terms.
+
+    Scanning a message costs O(message length) plus the number of anchor
+    hits, independent of how many terms the channel has.
+    """
+
+    def __init__(self, terms: Iterable[tuple[str, str | None]]):
+        """Compile terms.
+
+        Args:
+            terms: ``(text, term_id)`` pairs. Texts are normalized here.
+        """
+        self._patterns: list[_Pattern] = []
+        for text, term_id in terms:
+            term = normalize_term(text)
+            if term.strip("*"):
+                self._patterns.append(_Pattern(term, term_id))
+
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        for index, pattern in enumerate(self._patterns):
+            self._insert(pattern.anchor, index)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def _insert(self, anchor: str, index: int) -> None:
+        state = 0
+        for char in anchor:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append(index)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                candidate = self._goto[fail].get(char, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def _scan(self, text: str):
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                yield position, out[state]
+
+    def find(self, message: str, first_only: bool = False) -> list[BlockedTermMatch]:
+        """Find blocked terms in a message.
+
+        Args:
+            message: Chat message text.
+            first_only: Stop at the first match.
+
+        Returns:
+            Matches ordered by where their anchor ends; each term at most once.
+        """
+        text, offsets = _collapse_spaces(message.lower())
+        matches: list[BlockedTermMatch] = []
+        seen: set[int] = set()
+        for position, indices in self._scan(text):
+            for index in indices:
+                if index in seen:
+                    continue
+                pattern = self._patterns[index]
+                span = self._confirm(pattern, text, position + 1 - len(pattern.anchor))
+                if span is None:
+                    continue
+                seen.add(index)
+                start, end = span
+                if offsets is not None:
+                    start, end = offsets[start], offsets[end - 1] + 1
+                matches.append(BlockedTermMatch(pattern.term, pattern.term_id, start, end))
+                if first_only:
+                    return matches
+        return matches
+
+    def _confirm(self, pattern: _Pattern, text: str, anchor_start: int) -> tuple[int, int] | None:
+        if pattern.regex is None:
+            start, end = anchor_start, anchor_start + len(pattern.anchor)
+            if pattern.bound_start and start > 0 and _is_word(text[start - 1]):
+                return None
+            if pattern.bound_end and end < len(text) and _is_word(text[end]):
+                return None
+            return start, end
+
+        # Wildcards never cross spaces, so a match spans exactly as many
+        # spaces as the term; only the words around the anchor are searched.
+        window_start = anchor_start
+        for _ in range(pattern.spaces_before + 1):
+            window_start = text.rfind(" ", 0, window_start)
+            if window_start == -1:
+                break
+        window_start += 1
+        anchor_end = anchor_start + len(pattern.anchor)
+        window_end = anchor_end
+        for i in range(pattern.spaces_after + 1):
+            window_end = text.find(" ", window_end + (1 if i else 0))
+            if window_end == -1:
+                window_end = len(text)
+                break
+        for match in pattern.regex.finditer(text, window_start, window_end):
+            if match.start() <= anchor_start and match.end() >= anchor_end:
+                return match.span()
+        return None
+
+
+class BlockedTermsIndex:
+    """Per-channel blocked terms synced from Helix and matched locally.
+
+    :meth:`sync` crawls every page of a channel's blocked terms. Changes
+    made through :meth:`add_term`/:meth:`remove_term` and
+    ``automod.terms.update`` EventSub events are folded in, and the
+    channel's automaton is recompiled lazily on the next match.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        moderator_id: str,
+        budget: RateBudget | None = None,
+        concurrency: int = 10,
+    ):
+        """Initialize the index.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            moderator_id: Moderator whose token reads and edits the terms.
+            budget: Shared rate budget for the crawl.
+            concurrency: Maximum channels synced at once by :meth:`sync_many`.
+        """
+        self.client = client
+        self.moderator_id = moderator_id
+        self.budget = budget
+        self.concurrency = concurrency
+        # broadcaster_id -> normalized text -> term id (None if unknown)
+        self._terms: dict[str, dict[str, str | None]] = {}
+        self._automata: dict[str, BlockedTermsAutomaton] = {}
+
+    def terms(self, broadcaster_id: str) -> dict[str, str | None]:
+        """Normalized blocked terms of a channel mapped to their ids."""
+        return dict(self._terms.get(broadcaster_id, {}))
+
+    def _changed(self, broadcaster_id: str) -> None:
+        self._automata.pop(broadcaster_id, None)
+
+    def automaton(self, broadcaster_id: str) -> BlockedTermsAutomaton:
+        """Get the channel's compiled automaton, rebuilding it if terms changed."""
+        automaton = self._automata.get(broadcaster_id)
+        if automaton is None:
+            terms = self._terms.get(broadcaster_id, {})
+            automaton = self._automata[broadcaster_id] = BlockedTermsAutomaton(terms.items())
+        return automaton
+
+    def find(self, broadcaster_id: str, message: str) -> list[BlockedTermMatch]:
+        """Find every blocked term of a channel in a message."""
+        return self.automaton(broadcaster_id).find(message)
+
+    def is_blocked(self, broadcaster_id: str, message: str) -> bool:
+        """Whether a message contains any of the channel's blocked terms."""
+        return bool(self.automaton(broadcaster_id).find(message, first_only=True))
+
+    # Syncing
+
+    async def sync(self, broadcaster_id: str) -> int:
+        """Load every page of a channel's blocked terms, replacing local state.
+
+        Returns:
+            Number of terms loaded.
+        """
+        params = GetBlockedTermsRequest(
+            broadcaster_id=broadcaster_id,
+            moderator_id=self.moderator_id,
+        )
+        terms: dict[str, str | None] = {}
+        async for term in iterate_items(
+            moderation.get_blocked_terms, self.client, params, budget=self.budget
+        ):
+            terms[normalize_term(term.text)] = term.id
+        self._terms[broadcaster_id] = terms
+        self._changed(broadcaster_id)
+        return len(terms)
+
+    async def sync_many(self, broadcaster_ids: Iterable[str]) -> dict[str, Exception]:
+        """Sync many channels with bounded concurrency.
+
+        Returns:
+            Errors keyed by broadcaster id for channels that failed to sync.
+        """
+        broadcaster_ids = list(dict.fromkeys(broadcaster_ids))
+        results = await gather_limited(
+            (self.sync(broadcaster_id) for broadcaster_id in broadcaster_ids),
+            self.concurrency,
+            return_exceptions=True,
+        )
+        return {
+            broadcaster_id: result
+            for broadcaster_id, result in zip(broadcaster_ids, results)
+            if isinstance(result, Exception)
+        }
+
+    def forget(self, broadcaster_id: str) -> None:
+        """Drop a channel's terms."""
+        self._terms.pop(broadcaster_id, None)
+        self._changed(broadcaster_id)
+
+    # Updates
+
+    def apply_added(self, broadcaster_id: str, term: BlockedTerm) -> None:
+        """Fold in a term added elsewhere."""
+        self._terms.setdefault(broadcaster_id, {})[normalize_term(term.text)] = term.id
+        self._changed(broadcaster_id)
+
+    async def add_term(self, broadcaster_id: str, text: str) -> BlockedTerm | None:
+        """Add a blocked term through Helix and to the local automaton."""
+        params = AddBlockedTermRequest(
+            broadcaster_id=broadcaster_id,
+            moderator_id=self.moderator_id,
+            text=text,
+        )
+        response = await moderation.add_blocked_term(self.client, params)
+        if not response.data:
+            return None
+        self.apply_added(broadcaster_id, response.data[0])
+        return response.data[0]
+
+    async def remove_term(self, broadcaster_id: str, term_id: str) -> None:
+        """Remove a blocked term through Helix and from the local automaton."""
+        params = RemoveBlockedTermRequest(
+            broadcaster_id=broadcaster_id,
+            moderator_id=self.moderator_id,
+            id=term_id,
+        )
+        await moderation.remove_blocked_term(self.client, params)
+        terms = self._terms.get(broadcaster_id, {})
+        for text in [text for text, known_id in terms.items() if known_id == term_id]:
+            del terms[text]
+        self._changed(broadcaster_id)
+
+    def handle_event(self, payload: dict) -> bool:
+        """Apply an ``automod.terms.update`` EventSub notification.
+
+        Only blocked-term actions change the automaton; permitted-term
+        actions are ignored.
+
+        Returns:
+            True if the payload was an AutoMod terms event.
+        """
+        if event_type(payload) != "automod.terms.update":
+            return False
+        event = event_data(payload)
+        broadcaster_id = event.get("broadcaster_user_id")
+        action = event.get("action")
+        if not broadcaster_id or action not in ("add_blocked", "remove_blocked"):
+            return True
+
+        terms = self._terms.setdefault(broadcaster_id, {})
+        for text in event.get("terms") or []:
+            term = normalize_term(text)
+            if action == "add_blocked":
+                terms.setdefault(term, None)
+            else:
+                terms.pop(term, None)
+        self._changed(broadcaster_id)
+        return True
@@ -0,0 +1,158 @@
+"""Bulk channel information refresh with change detection."""
+
+import time
+from array import array
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from twitch_sdk.endpoints import channels
+from twitch_sdk.schemas.channels import Channel, GetChannelInfoRequest
+
+from ._batching import MAX_IDS_PER_REQUEST, chunked, gather_limited
+from ._compact import Interner
+from ._ratelimit import RateBudget, call_with_retry
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+ChannelChangeListener = Callable[[list[Channel]], None]
+
+_UNKNOWN = 0
+
+
+def channel_hash(channel: Channel) -> int:
+    """Hash of the fields of a channel that matter for change detection.
+
+    Process-local (built on ``hash``); never persist it.
+    """
+    value = hash((
+        channel.broadcaster_login,
+        channel.broadcaster_name,
+        channel.broadcaster_language,
+        channel.game_id,
+        channel.title,
+        channel.delay,
+        tuple(channel.tags),
+        tuple(channel.content_classification_labels),
+        channel.is_branded_content,
+    ))
+    return value if value != _UNKNOWN else 1
+
+
+class ChannelRefresh:
+    """Outcome of one refresh pass."""
+
+    __slots__ = ("checked", "changed", "missing", "errors", "requests", "duration")
+
+    def __init__(self):
+        self.checked = 0
+        self.changed: list[Channel] = []
+        self.missing: list[str] = []  # Ids Twitch returned nothing for
+        self.errors: dict[str, Exception] = {}
+        self.requests = 0
+        self.duration = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"ChannelRefresh(checked={self.checked}, changed={len(self.changed)}, "
+            f"missing={len(self.missing)}, errors={len(self.errors)}, "
+            f"requests={self.requests}, duration={self.duration:.1f}s)"
+        )
+
+
+class ChannelInfoWatcher:
+    """Refresh channel information in bulk and report only what changed.
+
+    Ids are fetched 100 per Get Channel Information call with bounded
+    concurrency. Each channel's previous state is kept as nothing but a
+    64-bit hash in a flat array indexed by an interned id, so an unchanged
+    channel costs one hash and one compare, and memory stays small for
+    millions of channels.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        budget: RateBudget | None = None,
+        concurrency: int = 20,
+        on_change: ChannelChangeListener | None = None,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            budget: Shared rate budget. Defaults to a fresh Helix budget.
+            concurrency: Maximum simultaneous calls.
+            on_change: Called with the changed channels of each batch as
+                soon as it is processed.
+        """
+        self.client = client
+        self.budget = budget or RateBudget()
+        self.concurrency = concurrency
+        self.on_change = on_change
+        self._ids = Interner()
+        self._hashes = array("q")
+        self._known = 0  # Slots holding a hash rather than _UNKNOWN
+
+    def __len__(self) -> int:
+        return self._known
+
+    def _slot(self, broadcaster_id: str) -> int:
+        index = self._ids.intern(broadcaster_id)
+        if index == len(self._hashes):
+            self._hashes.append(_UNKNOWN)
+        return index
+
+    def forget(self, broadcaster_id: str) -> None:
+        """Drop a channel's snapshot so its next refresh reports it as changed."""
+        index = self._ids.lookup(broadcaster_id)
+        if index is not None and self._hashes[index] != _UNKNOWN:
+            self._hashes[index] = _UNKNOWN
+            self._known -= 1
+
+    async def _refresh_batch(self, batch: list[str], result: ChannelRefresh) -> None:
+        params = GetChannelInfoRequest(broadcaster_id=batch)
+        response = await call_with_retry(
+            lambda: channels.get_channel_information(self.client, params), budget=self.budget
+        )
+        result.requests += 1
+        hashes = self._hashes
+        changed = []
+        returned = set()
+        for channel in response.data:
+            index = self._slot(channel.broadcaster_id)
+            returned.add(channel.broadcaster_id)
+            value = channel_hash(channel)
+            if hashes[index] != value:
+                if hashes[index] == _UNKNOWN:
+                    self._known += 1
+                hashes[index] = value
+                changed.append(channel)
+        if len(returned) < len(batch):
+            result.missing.extend(
+                broadcaster_id for broadcaster_id in batch if broadcaster_id not in returned
+            )
+        result.checked += len(batch)
+        if changed:
+            result.changed.extend(changed)
+            if self.on_change is not None:
+                self.on_change(changed)
+
+    async def refresh(self, broadcaster_ids: Iterable[str]) -> ChannelRefresh:
+        """Fetch channels and report the ones that changed since the last refresh.
+
+        Channels seen for the first time count as changed.
+        """
+        started = time.monotonic()
+        result = ChannelRefresh()
+        batches = list(chunked(dict.fromkeys(broadcaster_ids), MAX_IDS_PER_REQUEST))
+        outcomes = await gather_limited(
+            (self._refresh_batch(batch, result) for batch in batches),
+            self.concurrency,
+            return_exceptions=True,
+        )
+        for batch, outcome in zip(batches, outcomes):
+            if isinstance(outcome, Exception):
+                for broadcaster_id in batch:
+                    result.errors[broadcaster_id] = outcome
+        result.duration = time.monotonic() - started
+        return result
@@ -0,0 +1,120 @@
+"""Batched, cached lookups of users' chat colors."""
+
+from typing import TYPE_CHECKING
+
+from twitch_sdk.endpoints import chat
+from twitch_sdk.schemas.chat import GetUserChatColorRequest, UserChatColor
+
+from ._batching import BatchLoader
+from ._cache import TTLCache
+from ._events import event_data, event_type
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+
+class ChatColorResolver:
+    """Resolve users' chat colors with batching and a shared TTL cache.
+
+    Concurrent lookups for uncached users are coalesced into Get User Chat
+    Color calls of up to 100 ids. Colors carried by ``channel.chat.message``
+    events replace cached entries, so active chatters rarely need a lookup.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        ttl: float = 600.0,
+        max_entries: int | None = 100_000,
+        batch_delay: float = 0.01,
+    ):
+        """Initialize the resolver.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            ttl: Seconds a resolved color stays cached.
+            max_entries: Maximum number of cached users.
+            batch_delay: Seconds to wait for more lookups before sending a batch.
+        """
+        self.client = client
+        self._cache: TTLCache[str, UserChatColor] = TTLCache(ttl, max_entries)
+        self._loader: BatchLoader[str, UserChatColor] = BatchLoader(
+            self._fetch, delay=batch_delay
+        )
+
+    async def _fetch(self, user_ids: list[str]) -> dict[str, UserChatColor]:
+        params = GetUserChatColorRequest(user_id=user_ids)
+        response = await chat.get_user_chat_color(self.client, params)
+        colors = {color.user_id: color for color in response.data}
+        for user_id, color in colors.items():
+            self._cache.set(user_id, color)
+        return colors
+
+    def peek(self, user_id: str) -> UserChatColor | None:
+        """Get a cached color without making any API call."""
+        return self._cache.get(user_id)
+
+    async def get(self, user_id: str) -> UserChatColor | None:
+        """Get a user's chat color entry, or None for unknown users."""
+        cached = self._cache.get(user_id)
+        if cached is not None:
+            return cached
+        return await self._loader.load(user_id)
+
+    async def get_color(self, user_id: str) -> str | None:
+        """Get a user's chat color as a hex string.
+
+        Returns an empty string for users who never set a color and
+        None for unknown users.
+        """
+        entry = await self.get(user_id)
+        return entry.color if entry is not None else None
+
+    async def get_many(self, user_ids: list[str]) -> dict[str, UserChatColor]:
+        """Get chat color entries for several users, omitting unknown users."""
+        result: dict[str, UserChatColor] = {}
+        missing = []
+        for user_id in user_ids:
+            cached = self._cache.get(user_id)
+            if cached is not None:
+                result[user_id] = cached
+            else:
+                missing.append(user_id)
+        if missing:
+            result.update(await self._loader.load_many(missing))
+        return result
+
+    def set(self, color: UserChatColor) -> None:
+        """Store a known color, e.g. after calling update_user_chat_color."""
+        self._cache.set(color.user_id, color)
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's cached color so the next lookup refetches it."""
+        self._cache.pop(user_id)
+
+    def handle_event(self, payload: dict) -> bool:
+        """Apply an EventSub notification.
+
+        ``channel.chat.message`` events carrying a color update the sender's
+        cached color; events without one invalidate it.
+
+        Returns:
+            True if the payload was a chat message event.
+        """
+        if event_type(payload) != "channel.chat.message":
+            return False
+        event = event_data(payload)
+        user_id = event.get("chatter_user_id")
+        if not user_id:
+            return True
+        color = event.get("color")
+        if color:
+            self._cache.set(user_id, UserChatColor(
+                user_id=user_id,
+                user_login=event.get("chatter_user_login", ""),
+                user_name=event.get("chatter_user_name", ""),
+                color=color,
+            ))
+        else:
+            self.invalidate(user_id)
+        return True
@@ -0,0 +1,189 @@
+"""In-memory mirror of chat settings kept fresh by EventSub."""
+
+import asyncio
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from twitch_sdk.endpoints import chat
+from twitch_sdk.schemas.chat import (
+    ChatSettings,
+    GetChatSettingsRequest,
+    UpdateChatSettingsRequest,
+)
+
+from ._batching import gather_limited
+from ._events import event_data, event_type
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+ChatSettingsListener = Callable[[str, ChatSettings | None, ChatSettings], None]
+
+# channel.chat_settings.update event field -> ChatSettings field
+_EVENT_FIELDS = {
+    "emote_mode": "emote_mode",
+    "follower_mode": "follower_mode",
+    "follower_mode_duration_minutes": "follower_mode_duration",
+    "slow_mode": "slow_mode",
+    "slow_mode_wait_time_seconds": "slow_mode_wait_time",
+    "subscriber_mode": "subscriber_mode",
+    "unique_chat_mode": "unique_chat_mode",
+}
+
+# Fields only returned to moderators, which the PATCH response may leave out
+_DELAY_FIELDS = ("non_moderator_chat_delay", "non_moderator_chat_delay_duration")
+
+
+class ChatSettingsMirror:
+    """Chat settings for many broadcasters, served from memory.
+
+    Settings are loaded in bulk with bounded concurrency and then kept
+    current from ``channel.chat_settings.update`` events and from
+    :meth:`update` responses. Listeners are called with
+    ``(broadcaster_id, old, new)`` whenever a channel's settings change.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        moderator_id: str | None = None,
+        concurrency: int = 10,
+    ):
+        """Initialize the mirror.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            moderator_id: Moderator to read settings as. Required to see the
+                non-moderator chat delay fields.
+            concurrency: Maximum simultaneous Get Chat Settings calls.
+        """
+        self.client = client
+        self.moderator_id = moderator_id
+        self.concurrency = concurrency
+        self._settings: dict[str, ChatSettings] = {}
+        self._listeners: list[ChatSettingsListener] = []
+
+    def __len__(self) -> int:
+        return len(self._settings)
+
+    def __contains__(self, broadcaster_id: str) -> bool:
+        return broadcaster_id in self._settings
+
+    def get(self, broadcaster_id: str) -> ChatSettings | None:
+        """Get mirrored settings for a broadcaster without any API call."""
+        return self._settings.get(broadcaster_id)
+
+    def broadcasters(self) -> list[str]:
+        """Ids of all mirrored broadcasters."""
+        return list(self._settings)
+
+    # Listeners
+
+    def add_listener(self, listener: ChatSettingsListener) -> None:
+        """Call ``listener(broadcaster_id, old, new)`` on every change."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: ChatSettingsListener) -> None:
+        """Stop calling a listener."""
+        self._listeners.remove(listener)
+
+    def _store(self, settings: ChatSettings) -> None:
+        old = self._settings.get(settings.broadcaster_id)
+        self._settings[settings.broadcaster_id] = settings
+        if old != settings:
+            for listener in list(self._listeners):
+                listener(settings.broadcaster_id, old, settings)
+
+    # Loading
+
+    async def refresh(self, broadcaster_id: str) -> ChatSettings | None:
+        """Fetch one broadcaster's settings from Helix into the mirror."""
+        params = GetChatSettingsRequest(
+            broadcaster_id=broadcaster_id,
+            moderator_id=self.moderator_id,
+        )
+        response = await chat.get_chat_settings(self.client, params)
+        if not response.data:
+            return None
+        self._store(response.data[0])
+        return response.data[0]
+
+    async def load(self, broadcaster_ids: Iterable[str]) -> dict[str, Exception]:
+        """Fetch settings for many broadcasters with bounded concurrency.
+
+        Returns:
+            Errors keyed by broadcaster id for channels that failed to load.
+        """
+        broadcaster_ids = list(dict.fromkeys(broadcaster_ids))
+        results = await gather_limited(
+            (self.refresh(broadcaster_id) for broadcaster_id in broadcaster_ids),
+            self.concurrency,
+            return_exceptions=True,
+        )
+        return {
+            broadcaster_id: result
+            for broadcaster_id, result in zip(broadcaster_ids, results)
+            if isinstance(result, Exception)
+        }
+
+    async def refresh_all(self) -> dict[str, Exception]:
+        """Re-fetch every mirrored broadcaster, e.g. after an EventSub gap."""
+        return await self.load(self.broadcasters())
+
+    def forget(self, broadcaster_id: str) -> None:
+        """Stop mirroring a broadcaster."""
+        self._settings.pop(broadcaster_id, None)
+
+    # Writes
+
+    async def update(self, params: UpdateChatSettingsRequest) -> ChatSettings | None:
+        """Update settings through Helix and apply the response to the mirror."""
+        response = await chat.update_chat_settings(self.client, params)
+        if not response.data:
+            return None
+        settings = response.data[0]
+        # The response is authoritative (a disabled mode comes back with its
+        # duration cleared), except that it may omit the moderator-only
+        # delay fields; keep the known ones then
+        old = self._settings.get(settings.broadcaster_id)
+        if old is not None and settings.non_moderator_chat_delay is None:
+            settings = settings.model_copy(
+                update={field: getattr(old, field) for field in _DELAY_FIELDS}
+            )
+        self._store(settings)
+        return settings
+
+    def handle_event(self, payload: dict) -> bool:
+        """Apply a ``channel.chat_settings.update`` EventSub notification.
+
+        Returns:
+            True if the payload was a chat settings event.
+        """
+        if event_type(payload) != "channel.chat_settings.update":
+            return False
+        event = event_data(payload)
+        broadcaster_id = event.get("broadcaster_user_id")
+        if not broadcaster_id:
+            return True
+
+        update = {field: event[key] for key, field in _EVENT_FIELDS.items() if key in event}
+        old = self._settings.get(broadcaster_id)
+        if old is not None:
+            settings = old.model_copy(update=update)
+        else:
+            settings = ChatSettings(broadcaster_id=broadcaster_id, **update)
+        self._store(settings)
+        return True
+
+    async def wait_for_change(self, broadcaster_id: str) -> ChatSettings:
+        """Wait until a broadcaster's settings next change."""
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+        def listener(changed_id: str, old, new: ChatSettings) -> None:
+            if changed_id == broadcaster_id and not future.done():
+                future.set_result(new)
+
+        self.add_listener(listener)
+        try:
+            return await future
+        finally:
+            self.remove_listener(listener)
@@ -0,0 +1,181 @@
+"""Parallel, time-sliced crawling of clips."""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, AsyncIterator
+
+from twitch_sdk.endpoints import clips
+from twitch_sdk.schemas.clips import Clip, GetClipsRequest
+
+from ._pagination import MAX_PAGE_SIZE, next_cursor
+from ._ratelimit import RateBudget, call_with_retry
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+_DONE = object()
+
+
+class ClipCrawlStats:
+    """Counters for one clip crawl."""
+
+    __slots__ = ("windows", "splits", "pages", "clips", "duplicates", "truncated", "failed")
+
+    def __init__(self):
+        self.windows = 0
+        self.splits = 0
+        self.pages = 0
+        self.clips = 0  # Unique clips emitted
+        self.duplicates = 0
+        self.truncated = 0  # Minimum-size windows that still hit the page limit
+        self.failed: list[tuple[datetime, datetime, Exception]] = []
+
+    def __repr__(self) -> str:
+        return (
+            f"ClipCrawlStats(windows={self.windows}, splits={self.splits}, "
+            f"pages={self.pages}, clips={self.clips}, duplicates={self.duplicates}, "
+            f"truncated={self.truncated}, failed={len(self.failed)})"
+        )
+
+
+class ClipCrawler:
+    """Crawl every clip of a channel or category in a time range.
+
+    Get Clips only paginates so deep for one query, so the range is cut
+    into windows crawled in parallel. A window whose results are still
+    going after ``max_pages`` is split in half and both halves are queued,
+    recursively, until windows fit or reach ``min_window``. Clips are
+    deduplicated by id and yielded as soon as they arrive.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        budget: RateBudget | None = None,
+        concurrency: int = 20,
+        initial_windows: int = 20,
+        max_pages: int = 10,
+        min_window: timedelta = timedelta(minutes=1),
+        buffer: int = 1000,
+    ):
+        """Initialize the crawler.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            budget: Shared rate budget. Defaults to a fresh Helix budget.
+            concurrency: Windows crawled at once.
+            initial_windows: Equal windows the range starts out cut into.
+            max_pages: Pages read from a window before it counts as full.
+            min_window: Windows this short are never split further.
+            buffer: Clips buffered ahead of the consumer.
+        """
+        self.client = client
+        self.budget = budget or RateBudget()
+        self.concurrency = concurrency
+        self.initial_windows = initial_windows
+        self.max_pages = max_pages
+        self.min_window = min_window
+        self.buffer = buffer
+        self.stats = ClipCrawlStats()
+
+    async def _crawl_window(
+        self,
+        params: GetClipsRequest,
+        windows: asyncio.Queue,
+        out: asyncio.Queue,
+        seen: set[str],
+    ) -> None:
+        stats = self.stats
+        stats.windows += 1
+        pages = 0
+        while True:
+            response = await call_with_retry(
+                lambda: clips.get_clips(self.client, params), budget=self.budget
+            )
+            pages += 1
+            stats.pages += 1
+            for clip in response.data:
+                if clip.id in seen:
+                    stats.duplicates += 1
+                    continue
+                seen.add(clip.id)
+                stats.clips += 1
+                await out.put(clip)
+            cursor = next_cursor(response)
+            if not cursor or not response.data:
+                return
+            if pages >= self.max_pages:
+                break
+            params = params.model_copy(update={"after": cursor})
+
+        # Still more results: split the window and crawl both halves
+        started_at, ended_at = params.started_at, params.ended_at
+        if ended_at - started_at <= self.min_window:
+            stats.truncated += 1
+            return
+        middle = started_at + (ended_at - started_at) / 2
+        stats.splits += 1
+        for start, end in ((started_at, middle), (middle, ended_at)):
+            windows.put_nowait(
+                params.model_copy(update={"started_at": start, "ended_at": end, "after": None})
+            )
+
+    async def crawl(
+        self,
+        started_at: datetime,
+        ended_at: datetime,
+        broadcaster_id: str | None = None,
+        game_id: str | None = None,
+    ) -> AsyncIterator[Clip]:
+        """Yield every clip created in ``[started_at, ended_at]``.
+
+        Exactly one of ``broadcaster_id`` and ``game_id`` must be given.
+        Per-crawl counters are in :attr:`stats`.
+        """
+        if (broadcaster_id is None) == (game_id is None):
+            raise ValueError("Pass exactly one of broadcaster_id and game_id")
+
+        self.stats = ClipCrawlStats()
+        windows: asyncio.Queue[GetClipsRequest] = asyncio.Queue()
+        out: asyncio.Queue = asyncio.Queue(maxsize=self.buffer)
+        seen: set[str] = set()
+
+        step = (ended_at - started_at) / self.initial_windows
+        for index in range(self.initial_windows):
+            end = ended_at if index == self.initial_windows - 1 else started_at + step * (index + 1)
+            windows.put_nowait(GetClipsRequest(
+                broadcaster_id=broadcaster_id,
+                game_id=game_id,
+                started_at=started_at + step * index,
+                ended_at=end,
+                first=MAX_PAGE_SIZE,
+            ))
+
+        async def worker() -> None:
+            while True:
+                params = await windows.get()
+                try:
+                    await self._crawl_window(params, windows, out, seen)
+                except Exception as exc:
+                    self.stats.failed.append((params.started_at, params.ended_at, exc))
+                finally:
+                    windows.task_done()
+
+        async def produce() -> None:
+            workers = [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+            try:
+                await windows.join()
+            finally:
+                for task in workers:
+                    task.cancel()
+            await out.put(_DONE)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                clip = await out.get()
+                if clip is _DONE:
+                    break
+                yield clip
+        finally:
+            producer.cancel()
@@ -0,0 +1,322 @@
+"""Emote and badge index with cached tables and message tokenization."""
+
+import asyncio
+import re
+import time
+from typing import TYPE_CHECKING, NamedTuple
+
+from twitch_sdk.endpoints import chat
+from twitch_sdk.schemas.chat import (
+    Badge,
+    Emote,
+    GetBadgesRequest,
+    GetEmoteSetsRequest,
+    GetEmotesRequest,
+)
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+
+# Get Emote Sets accepts at most 25 emote_set_id values per call
+EMOTE_SETS_PER_REQUEST = 25
+
+# Emote codes are whitespace-delimited words in chat messages
+_WORD_RE = re.compile(r"\S+")
+
+
+class MessageFragment(NamedTuple):
+    """A piece of a chat message: plain text or a single emote."""
+
+    type: str  # "text" or "emote"
+    text: str
+    emote: Emote | None = None
+
+
+class EmoteMatcher:
+    """Compiled emote lookup for one channel.
+
+    Built once per emote table change and reused for every message,
+    so tokenizing a message never compiles anything.
+    """
+
+    def __init__(self, emotes: dict[str, Emote]):
+        """Initialize the matcher.
+
+        Args:
+            emotes: Mapping of emote code (name) to emote.
+        """
+        self._emotes = emotes
+
+    def __len__(self) -> int:
+        return len(self._emotes)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._emotes
+
+    def get(self, name: str) -> Emote | None:
+        """Get the emote for an exact emote code."""
+        return self._emotes.get(name)
+
+    def tokenize(self, message: str) -> list[MessageFragment]:
+        """Split a message into text and emote fragments in one pass.
+
+        Consecutive non-emote words (and the whitespace between them) are
+        merged into a single text fragment.
+        """
+        emotes = self._emotes
+        fragments: list[MessageFragment] = []
+        text_start = 0
+        for match in _WORD_RE.finditer(message):
+            emote = emotes.get(match.group())
+            if emote is None:
+                continue
+            start, end = match.span()
+            if start > text_start:
+                fragments.append(MessageFragment("text", message[text_start:start]))
+            fragments.append(MessageFragment("emote", match.group(), emote))
+            text_start = end
+        if text_start < len(message):
+            fragments.append(MessageFragment("text", message[text_start:]))
+        return fragments
+
+
+class _Table:
+    """A cached table of items with the time it was fetched."""
+
+    __slots__ = ("items", "fetched_at")
+
+    def __init__(self, items: list, fetched_at: float):
+        self.items = items
+        self.fetched_at = fetched_at
+
+
+class EmoteIndex:
+    """Cached global and per-channel emote and badge tables.
+
+    Tables are fetched on demand, shared between callers, and refreshed
+    once older than ``ttl``. Each channel's emotes are compiled into an
+    :class:`EmoteMatcher` that is rebuilt only when a table changes.
+    """
+
+    def __init__(self, client: "TwitchHTTPClient", ttl: float = 3600.0):
+        """Initialize the index.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            ttl: Seconds before a cached table is considered stale.
+        """
+        self.client = client
+        self.ttl = ttl
+        self._global_emotes: _Table | None = None
+        self._global_badges: _Table | None = None
+        self._channel_emotes: dict[str, _Table] = {}
+        self._channel_badges: dict[str, _Table] = {}
+        self._set_emotes: dict[str, list[Emote]] = {}
+        self._matchers: dict[str, EmoteMatcher] = {}
+        self._global_matcher: EmoteMatcher | None = None
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+        self.last_errors: dict[str, Exception] = {}
+
+    def _is_fresh(self, table: _Table | None) -> bool:
+        return table is not None and time.monotonic() - table.fetched_at < self.ttl
+
+    async def _fetch_once(self, key: tuple[str, str], coro) -> None:
+        """Run a fetch, sharing it with concurrent callers for the same key."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro)
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            coro.close()
+        await asyncio.shield(task)
+
+    def _invalidate(self, broadcaster_id: str | None = None) -> None:
+        if broadcaster_id is None:
+            self._matchers.clear()
+            self._global_matcher = None
+        else:
+            self._matchers.pop(broadcaster_id, None)
+
+    # Loading
+
+    async def _load_global_emotes(self) -> None:
+        response = await chat.get_global_emotes(self.client)
+        self._global_emotes = _Table(response.data, time.monotonic())
+        self._invalidate()
+
+    async def _load_channel_emotes(self, broadcaster_id: str) -> None:
+        params = GetEmotesRequest(broadcaster_id=broadcaster_id)
+        response = await chat.get_channel_emotes(self.client, params)
+        self._channel_emotes[broadcaster_id] = _Table(response.data, time.monotonic())
+        self._invalidate(broadcaster_id)
+
+    async def _load_global_badges(self) -> None:
+        response = await chat.get_global_chat_badges(self.client)
+        self._global_badges = _Table(_index_badges(response.data), time.monotonic())
+
+    async def _load_channel_badges(self, broadcaster_id: str) -> None:
+        params = GetBadgesRequest(broadcaster_id=broadcaster_id)
+        response = await chat.get_channel_chat_badges(self.client, params)
+        self._channel_badges[broadcaster_id] = _Table(
+            _index_badges(response.data), time.monotonic()
+        )
+
+    async def load_global(self, force: bool = False) -> None:
+        """Load global emotes and badges if missing or stale."""
+        jobs = []
+        if force or not self._is_fresh(self._global_emotes):
+            jobs.append(self._fetch_once(("emotes", ""), self._load_global_emotes()))
+        if force or not self._is_fresh(self._global_badges):
+            jobs.append(self._fetch_once(("badges", ""), self._load_global_badges()))
+        await asyncio.gather(*jobs)
+
+    async def load_channel(self, broadcaster_id: str, force: bool = False) -> None:
+        """Load a channel's emotes and badges if missing or stale."""
+        jobs = []
+        if force or not self._is_fresh(self._channel_emotes.get(broadcaster_id)):
+            jobs.append(self._fetch_once(
+                ("emotes", broadcaster_id), self._load_channel_emotes(broadcaster_id)
+            ))
+        if force or not self._is_fresh(self._channel_badges.get(broadcaster_id)):
+            jobs.append(self._fetch_once(
+                ("badges", broadcaster_id), self._load_channel_badges(broadcaster_id)
+            ))
+        await asyncio.gather(*jobs)
+
+    async def load_emote_sets(self, emote_set_ids: list[str]) -> None:
+        """Load emote sets usable in every channel (e.g. a bot's sub emotes).
+
+        Sets that are already loaded are skipped.
+        """
+        missing = [s for s in dict.fromkeys(emote_set_ids) if s not in self._set_emotes]
+        if not missing:
+            return
+        for i in range(0, len(missing), EMOTE_SETS_PER_REQUEST):
+            chunk = missing[i:i + EMOTE_SETS_PER_REQUEST]
+            params = GetEmoteSetsRequest(emote_set_id=chunk)
+            response = await chat.get_emote_sets(self.client, params)
+            for set_id in chunk:
+                self._set_emotes.setdefault(set_id, [])
+            for emote in response.data:
+                self._set_emotes.setdefault(emote.emote_set_id or "", []).append(emote)
+        self._invalidate()
+
+    async def refresh(self) -> dict[str, Exception]:
+        """Reload every stale table that has been loaded before.
+
+        A failing channel keeps its old tables and does not stop the others.
+
+        Returns:
+            Errors keyed by broadcaster ID, with ``""`` for the global tables.
+        """
+        jobs = {}
+        if self._global_emotes or self._global_badges:
+            jobs[""] = self.load_global()
+        for broadcaster_id in set(self._channel_emotes) | set(self._channel_badges):
+            jobs[broadcaster_id] = self.load_channel(broadcaster_id)
+        results = await asyncio.gather(*jobs.values(), return_exceptions=True)
+        return {
+            key: result for key, result in zip(jobs, results) if isinstance(result, Exception)
+        }
+
+    async def run(self, interval: float | None = None) -> None:
+        """Refresh stale tables forever.
+
+        Errors of the latest pass are kept in :attr:`last_errors`; failed
+        tables are retried on the next pass.
+
+        Args:
+            interval: Seconds between refresh passes. Defaults to ``ttl / 4``.
+        """
+        interval = interval if interval is not None else self.ttl / 4
+        while True:
+            try:
+                self.last_errors = await self.refresh()
+            except Exception as exc:
+                self.last_errors = {"": exc}
+            await asyncio.sleep(interval)
+
+    def forget_channel(self, broadcaster_id: str) -> None:
+        """Drop a channel's tables so it is no longer refreshed."""
+        self._channel_emotes.pop(broadcaster_id, None)
+        self._channel_badges.pop(broadcaster_id, None)
+        self._invalidate(broadcaster_id)
+
+    # Lookups
+
+    def _global_table(self) -> dict[str, Emote]:
+        emotes: dict[str, Emote] = {}
+        if self._global_emotes:
+            emotes.update((e.name, e) for e in self._global_emotes.items)
+        for set_emotes in self._set_emotes.values():
+            emotes.update((e.name, e) for e in set_emotes)
+        return emotes
+
+    def matcher(self, broadcaster_id: str | None = None) -> EmoteMatcher:
+        """Get the compiled matcher for a channel (or global emotes only).
+
+        Channel emotes take precedence over global emotes with the same code.
+        Uses whatever tables are currently loaded; call :meth:`load_channel`
+        first to include the channel's own emotes.
+        """
+        if broadcaster_id is None:
+            if self._global_matcher is None:
+                self._global_matcher = EmoteMatcher(self._global_table())
+            return self._global_matcher
+
+        matcher = self._matchers.get(broadcaster_id)
+        if matcher is None:
+            emotes = self._global_table()
+            table = self._channel_emotes.get(broadcaster_id)
+            if table:
+                emotes.update((e.name, e) for e in table.items)
+            matcher = self._matchers[broadcaster_id] = EmoteMatcher(emotes)
+        return matcher
+
+    def tokenize(self, broadcaster_id: str | None, message: str) -> list[MessageFragment]:
+        """Split a chat message into text and emote fragments."""
+        return self.matcher(broadcaster_id).tokenize(message)
+
+    def badge(
+        self,
+        broadcaster_id: str | None,
+        set_id: str,
+        version_id: str,
+    ) -> dict | None:
+        """Get a badge version (id, image URLs, title, ...).
+
+        Channel badges (e.g. subscriber badges) take precedence over global ones.
+        """
+        tables = []
+        if broadcaster_id is not None and broadcaster_id in self._channel_badges:
+            tables.append(self._channel_badges[broadcaster_id])
+        if self._global_badges:
+            tables.append(self._global_badges)
+        for table in tables:
+            version = table.items.get(set_id, {}).get(version_id)
+            if version is not None:
+                return version
+        return None
+
+    def badge_image_url(
+        self,
+        broadcaster_id: str | None,
+        set_id: str,
+        version_id: str,
+        scale: str = "1x",
+    ) -> str | None:
+        """Get the image URL for a badge version at the given scale (1x, 2x, 4x)."""
+        version = self.badge(broadcaster_id, set_id, version_id)
+        if version is None:
+            return None
+        return version.get(f"image_url_{scale}")
+
+
+def _index_badges(badges: list[Badge]) -> dict[str, dict[str, dict]]:
+    """Index badges as set_id -> version id -> version."""
+    return {
+        badge.set_id: {version["id"]: version for version in badge.versions}
+        for badge in badges
+    }
@@ -0,0 +1,236 @@
+"""Resumable, streaming crawl of a channel's followers to disk."""
+
+import abc
+import csv
+import io
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, NamedTuple, Protocol
+
+from twitch_sdk.endpoints import channels
+from twitch_sdk.schemas.channels import Follower, GetChannelFollowersRequest
+
+from ._events import parse_timestamp
+from ._pagination import MAX_PAGE_SIZE, next_cursor
+from ._ratelimit import RateBudget, call_with_retry
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+_STATE_VERSION = 1
+
+FOLLOWER_FIELDS = ("user_id", "user_login", "user_name", "followed_at")
+
+
+class FollowerSink(Protocol):
+    """Append-only destination for crawled followers.
+
+    ``position`` must reflect everything written so far once ``flush``
+    returns, and ``truncate`` must drop anything written after a position,
+    so a resumed crawl can discard a page written after its last checkpoint.
+    """
+
+    def write(self, followers: list[Follower]) -> None: ...
+
+    def flush(self) -> None: ...
+
+    def position(self) -> int: ...
+
+    def truncate(self, position: int) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class _FileSink(abc.ABC):
+    """Append-only text file; positions are byte offsets."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("ab")
+
+    @abc.abstractmethod
+    def _encode(self, followers: list[Follower]) -> bytes:
+        """Serialize followers for appending to the file."""
+
+    def write(self, followers: list[Follower]) -> None:
+        self._file.write(self._encode(followers))
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def position(self) -> int:
+        return self._file.tell()
+
+    def truncate(self, position: int) -> None:
+        self._file.flush()
+        self._file.truncate(position)
+        self._file.seek(position)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class JsonlFollowerSink(_FileSink):
+    """Write followers as JSON lines."""
+
+    def _encode(self, followers: list[Follower]) -> bytes:
+        return b"".join(follower.model_dump_json().encode() + b"\n" for follower in followers)
+
+
+class CsvFollowerSink(_FileSink):
+    """Write followers as CSV rows, with a header at the start of the file."""
+
+    def __init__(self, path: str | Path):
+        super().__init__(path)
+        if self.position() == 0:
+            self._file.write(self._rows([FOLLOWER_FIELDS]))
+
+    @staticmethod
+    def _rows(rows) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue().encode()
+
+    def _encode(self, followers: list[Follower]) -> bytes:
+        return self._rows(
+            (f.user_id, f.user_login, f.user_name, f.followed_at.isoformat()) for f in followers
+        )
+
+
+class FollowerCrawlResult(NamedTuple):
+    """Outcome of one crawl run."""
+
+    written: int  # Followers written by this run
+    pages: int
+    resumed: bool  # Continued an interrupted run
+    incremental: bool  # Stopped at the previous run's high-water mark
+    high_water: datetime | None  # Newest followed_at seen so far
+    total: int | None  # Follower total reported by Twitch
+
+
+class FollowerCrawler:
+    """Crawl a channel's followers page by page straight into a sink.
+
+    Only one page is held in memory at a time. After each page is flushed
+    to the sink, the cursor and sink position are saved to ``state_path``;
+    every crawl first truncates anything the sink received after the last
+    save, and an interrupted crawl resumes from the saved cursor. Once a crawl completes, the newest
+    ``followed_at`` becomes the high-water mark and the next crawl stops as
+    soon as it reaches followers at or before it.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        broadcaster_id: str,
+        sink: FollowerSink,
+        state_path: str | Path,
+        budget: RateBudget | None = None,
+        max_retries: int = 5,
+        on_page: Callable[[int, int], None] | None = None,
+    ):
+        """Initialize the crawler.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            broadcaster_id: Channel whose followers to crawl.
+            sink: Where followers are written.
+            state_path: JSON file holding the cursor and high-water mark.
+            budget: Shared rate budget.
+            max_retries: Retries per page for transient failures.
+            on_page: Called with (pages, written) after each saved page.
+        """
+        self.client = client
+        self.broadcaster_id = broadcaster_id
+        self.sink = sink
+        self.state_path = Path(state_path)
+        self.budget = budget
+        self.max_retries = max_retries
+        self.on_page = on_page
+
+    def _load_state(self) -> dict:
+        if not self.state_path.exists():
+            return {}
+        state = json.loads(self.state_path.read_text())
+        if state.get("version") != _STATE_VERSION:
+            raise ValueError(f"Unsupported follower crawl state version: {state.get('version')}")
+        if state.get("broadcaster_id") != self.broadcaster_id:
+            raise ValueError(f"State file belongs to broadcaster {state.get('broadcaster_id')}")
+        return state
+
+    def _save_state(self, state: dict) -> None:
+        tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+        tmp.write_text(json.dumps(state))
+        tmp.replace(self.state_path)
+
+    async def crawl(self) -> FollowerCrawlResult:
+        """Crawl new followers, resuming an interrupted run if there is one."""
+        state = self._load_state()
+        resumed = bool(state) and not state.get("complete")
+        if state and self.sink.position() > state["position"]:
+            # Drop a page flushed after the last save, whether or not that run completed
+            self.sink.truncate(state["position"])
+        if resumed:
+            cursor = state["cursor"]
+            since = state.get("since")
+            high_water = state.get("high_water")
+        else:
+            cursor = None
+            since = state.get("high_water")  # From the last completed run
+            high_water = since
+        since_at = parse_timestamp(since) if since else None
+        high_water_at = parse_timestamp(high_water) if high_water else None
+
+        params = GetChannelFollowersRequest(
+            broadcaster_id=self.broadcaster_id, first=MAX_PAGE_SIZE, after=cursor
+        )
+        written = pages = 0
+        total = None
+        previous_ids: set[str] = set()
+        incremental = False
+        while True:
+            response = await call_with_retry(
+                lambda: channels.get_channel_followers(self.client, params),
+                budget=self.budget,
+                max_retries=self.max_retries,
+            )
+            total = response.total
+            page = []
+            for follower in response.data:
+                if since_at is not None and follower.followed_at <= since_at:
+                    incremental = True
+                    break
+                if follower.user_id in previous_ids:
+                    continue  # Shifted across the page boundary by new follows
+                page.append(follower)
+            previous_ids = {follower.user_id for follower in page}
+
+            if page:
+                self.sink.write(page)
+                self.sink.flush()
+                newest = max(follower.followed_at for follower in page)
+                if high_water_at is None or newest > high_water_at:
+                    high_water_at = newest
+            written += len(page)
+            pages += 1
+
+            cursor = next_cursor(response)
+            done = incremental or not cursor or not response.data
+            self._save_state({
+                "version": _STATE_VERSION,
+                "broadcaster_id": self.broadcaster_id,
+                "cursor": None if done else cursor,
+                "position": self.sink.position(),
+                "since": since,
+                "high_water": high_water_at.isoformat() if high_water_at else None,
+                "complete": done,
+            })
+            if self.on_page is not None:
+                self.on_page(pages, written)
+            if done:
+                break
+            params = params.model_copy(update={"after": cursor})
+
+        return FollowerCrawlResult(written, pages, resumed, incremental, high_water_at, total)
@@ -0,0 +1,223 @@
+"""In-memory catalog of games/categories."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from twitch_sdk.endpoints import games
+from twitch_sdk.schemas.games import Game, GetGamesRequest, GetTopGamesRequest
+
+from ._batching import BatchLoader
+from ._cache import TTLCache
+from ._pagination import iterate_items
+from ._ratelimit import RateBudget, call_with_retry
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+_SNAPSHOT_VERSION = 1
+
+
+class GameCatalog:
+    """Games by id, name and IGDB id, answered from memory.
+
+    :meth:`crawl` loads every category from Get Top Games; :meth:`run`
+    repeats it on a schedule. The sync accessors (:meth:`get`,
+    :meth:`by_name`, :meth:`by_igdb_id`, :meth:`name_of`) never touch the
+    network, while the ``resolve*`` methods fall back to Get Games for
+    unknown keys, coalescing concurrent misses into calls of up to 100.
+    A failed scheduled crawl keeps the last catalog in service; the error
+    is kept in :attr:`last_error` and passed to ``on_error``. With a
+    ``path`` the catalog is saved after each crawl and loaded on startup.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        path: str | Path | None = None,
+        budget: RateBudget | None = None,
+        refresh_interval: float = 3600.0,
+        missing_ttl: float = 300.0,
+        batch_delay: float = 0.01,
+        on_error: Callable[[Exception], None] | None = None,
+    ):
+        """Initialize the catalog.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            path: JSON file to persist the catalog in.
+            budget: Shared rate budget.
+            refresh_interval: Seconds between crawls in :meth:`run`.
+            missing_ttl: Seconds an unknown key is remembered as such.
+            batch_delay: Seconds to wait for more lookups before sending a batch.
+            on_error: Called with the error of each failed crawl in :meth:`run`.
+        """
+        self.client = client
+        self.path = Path(path) if path is not None else None
+        self.budget = budget
+        self.refresh_interval = refresh_interval
+        self.on_error = on_error
+        self.last_error: Exception | None = None  # Of the latest crawl in run()
+        self._games: dict[str, Game] = {}
+        self._names: dict[str, str] = {}  # lowercase name -> id
+        self._igdb: dict[str, str] = {}  # igdb_id -> id
+        self._missing: TTLCache[tuple[str, str], bool] = TTLCache(missing_ttl)
+        self._by_id: BatchLoader[str, Game] = BatchLoader(
+            lambda keys: self._fetch("id", keys), delay=batch_delay
+        )
+        self._by_name: BatchLoader[str, Game] = BatchLoader(
+            lambda keys: self._fetch("name", keys), delay=batch_delay
+        )
+        self._by_igdb: BatchLoader[str, Game] = BatchLoader(
+            lambda keys: self._fetch("igdb_id", keys), delay=batch_delay
+        )
+        if self.path is not None and self.path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._games
+
+    # Hot path
+
+    def get(self, game_id: str) -> Game | None:
+        """Get a game by id from memory."""
+        return self._games.get(game_id)
+
+    def by_name(self, name: str) -> Game | None:
+        """Get a game by (case-insensitive) name from memory."""
+        game_id = self._names.get(name.lower())
+        return self._games.get(game_id) if game_id is not None else None
+
+    def by_igdb_id(self, igdb_id: str) -> Game | None:
+        """Get a game by IGDB id from memory."""
+        game_id = self._igdb.get(igdb_id)
+        return self._games.get(game_id) if game_id is not None else None
+
+    def name_of(self, game_id: str) -> str | None:
+        """Get a game's name from memory."""
+        game = self._games.get(game_id)
+        return game.name if game is not None else None
+
+    # Updates
+
+    def add(self, game: Game) -> None:
+        """Add or replace a game, keeping the name and IGDB indexes in step."""
+        old = self._games.get(game.id)
+        if old is not None:
+            if self._names.get(old.name.lower()) == old.id:
+                del self._names[old.name.lower()]
+            if old.igdb_id and self._igdb.get(old.igdb_id) == old.id:
+                del self._igdb[old.igdb_id]
+        self._games[game.id] = game
+        self._names[game.name.lower()] = game.id
+        if game.igdb_id:
+            self._igdb[game.igdb_id] = game.id
+
+    async def crawl(self) -> int:
+        """Load every category from Get Top Games.
+
+        Returns:
+            Number of games seen.
+        """
+        seen = 0
+        async for game in iterate_items(
+            games.get_top_games, self.client, GetTopGamesRequest(), budget=self.budget
+        ):
+            self.add(game)
+            seen += 1
+        if self.path is not None:
+            self.save()
+        return seen
+
+    async def run(self) -> None:
+        """Crawl every ``refresh_interval`` seconds, forever."""
+        while True:
+            try:
+                await self.crawl()
+            except Exception as exc:
+                # Keep serving the last catalog; retry next interval
+                self.last_error = exc
+                if self.on_error is not None:
+                    self.on_error(exc)
+            else:
+                self.last_error = None
+            await asyncio.sleep(self.refresh_interval)
+
+    # Resolution
+
+    async def _fetch(self, field: str, keys: list[str]) -> dict[str, Game]:
+        params = GetGamesRequest(**{field: keys})
+        response = await call_with_retry(
+            lambda: games.get_games(self.client, params), budget=self.budget
+        )
+        returned: dict[str, Game] = {}
+        for game in response.data:
+            self.add(game)
+            key = {"id": game.id, "name": game.name.lower(), "igdb_id": game.igdb_id}[field]
+            if key is not None:
+                returned[key] = game
+        found: dict[str, Game] = {}
+        for key in keys:
+            game = returned.get(key.lower() if field == "name" else key)
+            if game is not None:
+                found[key] = game
+            else:
+                self._missing.set((field, key), True)
+        return found
+
+    async def _resolve(self, field: str, keys: Iterable[str]) -> dict[str, Game]:
+        lookup = {"id": self.get, "name": self.by_name, "igdb_id": self.by_igdb_id}[field]
+        loader = {"id": self._by_id, "name": self._by_name, "igdb_id": self._by_igdb}[field]
+        result: dict[str, Game] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            game = lookup(key)
+            if game is not None:
+                result[key] = game
+            elif (field, key) not in self._missing:
+                missing.append(key)
+        if missing:
+            result.update(await loader.load_many(missing))
+        return result
+
+    async def resolve(self, game_id: str) -> Game | None:
+        """Get a game by id, asking Get Games if it is not in memory."""
+        return (await self._resolve("id", [game_id])).get(game_id)
+
+    async def resolve_many(self, game_ids: Iterable[str]) -> dict[str, Game]:
+        """Get several games by id, omitting unknown ids."""
+        return await self._resolve("id", game_ids)
+
+    async def resolve_names(self, names: Iterable[str]) -> dict[str, Game]:
+        """Get games by name (case-insensitive in memory), keyed as given."""
+        return await self._resolve("name", names)
+
+    async def resolve_igdb_ids(self, igdb_ids: Iterable[str]) -> dict[str, Game]:
+        """Get games by IGDB id."""
+        return await self._resolve("igdb_id", igdb_ids)
+
+    # Persistence
+
+    def save(self, path: str | Path | None = None) -> None:
+        """Write the catalog to a JSON file."""
+        path = Path(path) if path is not None else self.path
+        snapshot = {
+            "version": _SNAPSHOT_VERSION,
+            "games": [game.model_dump(mode="json") for game in self._games.values()],
+        }
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(snapshot, separators=(",", ":")))
+        tmp.replace(path)
+
+    def load(self, path: str | Path | None = None) -> None:
+        """Add the games in a JSON file written by :meth:`save`."""
+        path = Path(path) if path is not None else self.path
+        snapshot = json.loads(path.read_text())
+        if snapshot.get("version") != _SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported game catalog version: {snapshot.get('version')}")
+        for data in snapshot["games"]:
+            self.add(Game.model_validate(data))
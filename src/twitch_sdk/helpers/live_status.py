@@ -0,0 +1,326 @@
+"""Live/offline tracking for large channel sets by batched stream polling."""
+
+import asyncio
+import time
+from array import array
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple
+
+from twitch_sdk.endpoints import streams
+from twitch_sdk.schemas.streams import GetStreamsRequest, Stream
+
+from ._batching import MAX_IDS_PER_REQUEST, chunked, gather_limited
+from ._compact import Interner
+from ._events import event_data, event_type
+from ._ratelimit import RateBudget, call_with_retry
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+ONLINE = "online"
+OFFLINE = "offline"
+TITLE_CHANGE = "title"
+GAME_CHANGE = "game"
+
+HOT = "hot"
+COLD = "cold"
+
+
+class StreamChange(NamedTuple):
+    """A change in a channel's live status."""
+
+    kind: str  # "online", "offline", "title" or "game"
+    broadcaster_id: str
+    stream: Stream | None  # Current stream, None when offline or not yet polled
+    previous: str | None = None  # Old title or game id for title/game changes
+    source: str = "poll"  # "poll" or "eventsub"
+
+
+class PollCycle(NamedTuple):
+    """Timing of one full pass over a polling tier."""
+
+    tier: str
+    channels: int
+    requests: int
+    failed: int
+    changes: int
+    duration: float
+
+
+StreamChangeListener = Callable[[StreamChange], None]
+
+
+class LiveStatusTracker:
+    """Live status for hundreds of thousands of channels from Get Streams.
+
+    Channels are polled 100 per call in two tiers: *hot* channels (live,
+    recently offline or marked hot) every ``hot_interval`` seconds and the
+    rest every ``cold_interval`` seconds. Each response is diffed against
+    the previous state into :class:`StreamChange` events for listeners.
+
+    Channel ids are interned to integers; only live channels keep their
+    :class:`Stream`, and per-channel bookkeeping lives in flat arrays.
+    ``stream.online``/``stream.offline`` notifications can be fed to
+    :meth:`handle_event` as well, in which case polling acts as a
+    consistency check and changes it finds first are counted in
+    :attr:`missed_events`. A poll that disagrees with an event received
+    less than ``event_grace`` seconds earlier is taken to predate it and
+    is ignored for that channel.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        hot_interval: float = 30.0,
+        cold_interval: float = 300.0,
+        cooldown: float = 1800.0,
+        budget: RateBudget | None = None,
+        concurrency: int = 20,
+        event_grace: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the tracker.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            hot_interval: Seconds between polls of hot channels.
+            cold_interval: Seconds between polls of everything else.
+            cooldown: Seconds a channel stays hot after going offline.
+            budget: Shared rate budget for Get Streams calls.
+            concurrency: Maximum simultaneous Get Streams calls.
+            event_grace: Seconds after an online/offline event during which
+                polls may not overrule it. Defaults to ``hot_interval``.
+            clock: Monotonic time source.
+        """
+        self.client = client
+        self.intervals = {HOT: hot_interval, COLD: cold_interval}
+        self.cooldown = cooldown
+        self.budget = budget
+        self.concurrency = concurrency
+        self.cycles: dict[str, PollCycle] = {}
+        self.event_grace = hot_interval if event_grace is None else event_grace
+        self.missed_events = 0
+        self._clock = clock
+        self._ids = Interner()
+        self._tracked = array("B")  # 1 if the interned channel is tracked
+        self._offline_at = array("d")  # When a channel last went offline
+        self._pinned = array("B")  # 1 if marked hot by the caller
+        self._event_at = array("d")  # When an event last changed a channel's status
+        self._tiers: dict[str, set[int]] = {HOT: set(), COLD: set()}
+        self._streams: dict[int, Stream | None] = {}  # Live channels only
+        self._listeners: list[StreamChangeListener] = []
+        self._eventsub = False
+
+    def __len__(self) -> int:
+        return len(self._tiers[HOT]) + len(self._tiers[COLD])
+
+    def __contains__(self, broadcaster_id: str) -> bool:
+        index = self._ids.lookup(broadcaster_id)
+        return index is not None and self._tracked[index] == 1
+
+    # Channel set
+
+    def track(self, broadcaster_ids: Iterable[str], hot: bool = False) -> None:
+        """Start tracking channels.
+
+        Args:
+            broadcaster_ids: Channels to add.
+            hot: Poll these channels in the hot tier regardless of status.
+        """
+        for broadcaster_id in broadcaster_ids:
+            index = self._ids.intern(broadcaster_id)
+            if index == len(self._tracked):
+                self._tracked.append(0)
+                self._offline_at.append(float("-inf"))
+                self._pinned.append(0)
+                self._event_at.append(float("-inf"))
+            if hot:
+                self._pinned[index] = 1
+            self._tracked[index] = 1
+            self._place(index)
+
+    def untrack(self, broadcaster_ids: Iterable[str]) -> None:
+        """Stop tracking channels."""
+        for broadcaster_id in broadcaster_ids:
+            index = self._ids.lookup(broadcaster_id)
+            if index is None or not self._tracked[index]:
+                continue
+            self._tracked[index] = 0
+            self._pinned[index] = 0
+            self._streams.pop(index, None)
+            self._tiers[HOT].discard(index)
+            self._tiers[COLD].discard(index)
+
+    def _place(self, index: int) -> None:
+        """Put a tracked channel in the tier its state calls for."""
+        hot = (
+            self._pinned[index]
+            or index in self._streams
+            or self._clock() - self._offline_at[index] < self.cooldown
+        )
+        tier, other = (HOT, COLD) if hot else (COLD, HOT)
+        self._tiers[other].discard(index)
+        self._tiers[tier].add(index)
+
+    def tier_size(self, tier: str) -> int:
+        """Number of channels in a polling tier."""
+        return len(self._tiers[tier])
+
+    # Queries
+
+    def is_live(self, broadcaster_id: str) -> bool:
+        """Whether a channel was live as of the last poll or event."""
+        index = self._ids.lookup(broadcaster_id)
+        return index is not None and index in self._streams
+
+    def get(self, broadcaster_id: str) -> Stream | None:
+        """Last polled stream of a live channel."""
+        index = self._ids.lookup(broadcaster_id)
+        return self._streams.get(index) if index is not None else None
+
+    def live_channels(self) -> list[str]:
+        """Ids of every channel currently live."""
+        return [self._ids.value(index) for index in self._streams]
+
+    # Listeners
+
+    def add_listener(self, listener: StreamChangeListener) -> None:
+        """Call ``listener(change)`` for every detected change."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: StreamChangeListener) -> None:
+        """Stop calling a listener."""
+        self._listeners.remove(listener)
+
+    def _emit(self, change: StreamChange) -> None:
+        for listener in list(self._listeners):
+            listener(change)
+
+    # Diffing
+
+    def _went_offline(self, index: int) -> None:
+        del self._streams[index]
+        self._offline_at[index] = self._clock()
+
+    def _diff(self, index: int, stream: Stream | None) -> int:
+        """Apply one polled result. Returns the number of changes emitted."""
+        broadcaster_id = self._ids.value(index)
+        live = index in self._streams
+        recent_event = self._clock() - self._event_at[index] < self.event_grace
+        if recent_event and live != (stream is not None):
+            return 0  # Response predates the event that changed the status
+        if stream is None:
+            if not live:
+                return 0
+            self._went_offline(index)
+            self._place(index)
+            self._emit_polled(StreamChange(OFFLINE, broadcaster_id, None))
+            return 1
+
+        previous = self._streams.get(index)
+        self._streams[index] = stream
+        if not live or (previous is not None and previous.id != stream.id):
+            self._place(index)
+            self._emit_polled(StreamChange(ONLINE, broadcaster_id, stream))
+            return 1
+        if previous is None:
+            return 0  # Went online via EventSub; this poll only fills in details
+
+        changes = 0
+        if previous.title != stream.title:
+            self._emit(StreamChange(TITLE_CHANGE, broadcaster_id, stream, previous.title))
+            changes += 1
+        if previous.game_id != stream.game_id:
+            self._emit(StreamChange(GAME_CHANGE, broadcaster_id, stream, previous.game_id))
+            changes += 1
+        return changes
+
+    def _emit_polled(self, change: StreamChange) -> None:
+        if self._eventsub:
+            self.missed_events += 1
+        self._emit(change)
+
+    def handle_event(self, payload: dict) -> bool:
+        """Apply a ``stream.online`` or ``stream.offline`` EventSub notification.
+
+        Returns:
+            True if the payload was a stream online/offline event.
+        """
+        kind = event_type(payload)
+        if kind not in ("stream.online", "stream.offline"):
+            return False
+        self._eventsub = True
+        index = self._ids.lookup(event_data(payload).get("broadcaster_user_id", ""))
+        if index is None or not self._tracked[index]:
+            return True
+
+        broadcaster_id = self._ids.value(index)
+        live = index in self._streams
+        if kind == "stream.online" and not live:
+            self._event_at[index] = self._clock()
+            self._streams[index] = None  # Details arrive with the next poll
+            self._place(index)
+            self._emit(StreamChange(ONLINE, broadcaster_id, None, source="eventsub"))
+        elif kind == "stream.offline" and live:
+            self._event_at[index] = self._clock()
+            self._went_offline(index)
+            self._place(index)
+            self._emit(StreamChange(OFFLINE, broadcaster_id, None, source="eventsub"))
+        return True
+
+    # Polling
+
+    async def _poll_batch(self, batch: list[int]) -> int:
+        params = GetStreamsRequest(
+            user_id=[self._ids.value(index) for index in batch],
+            first=MAX_IDS_PER_REQUEST,
+        )
+        response = await call_with_retry(
+            lambda: streams.get_streams(self.client, params), budget=self.budget
+        )
+        found = {stream.user_id: stream for stream in response.data if stream.type == "live"}
+        changes = 0
+        for index in batch:
+            if self._tracked[index]:
+                changes += self._diff(index, found.get(self._ids.value(index)))
+        return changes
+
+    async def poll(self, tier: str) -> PollCycle:
+        """Poll every channel of a tier once.
+
+        Returns:
+            Timing and counts for the cycle, also kept in :attr:`cycles`.
+        """
+        started = time.monotonic()
+        members = sorted(self._tiers[tier])
+        if tier == HOT:
+            # Channels offline for longer than the cooldown drop to the cold tier
+            for index in members:
+                if index not in self._streams:
+                    self._place(index)
+            members = sorted(self._tiers[HOT])
+        batches = list(chunked(members, MAX_IDS_PER_REQUEST))
+        results = await gather_limited(
+            (self._poll_batch(batch) for batch in batches),
+            self.concurrency,
+            return_exceptions=True,
+        )
+        cycle = PollCycle(
+            tier=tier,
+            channels=len(members),
+            requests=len(batches),
+            failed=sum(isinstance(result, Exception) for result in results),
+            changes=sum(result for result in results if not isinstance(result, Exception)),
+            duration=time.monotonic() - started,
+        )
+        self.cycles[tier] = cycle
+        return cycle
+
+    async def _run_tier(self, tier: str) -> None:
+        interval = self.intervals[tier]
+        while True:
+            cycle = await self.poll(tier)
+            await asyncio.sleep(max(0.0, interval - cycle.duration))
+
+    async def run(self) -> None:
+        """Poll both tiers on their intervals, forever."""
+        await asyncio.gather(self._run_tier(HOT), self._run_tier(COLD))
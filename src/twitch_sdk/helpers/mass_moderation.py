@@ -0,0 +1,293 @@
+"""Concurrent, resumable mass ban/unban for raid and bot-wave response."""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterable, Callable, Iterable, NamedTuple
+
+from twitch_client import TwitchAPIError
+
+from twitch_sdk.endpoints import moderation
+from twitch_sdk.schemas.moderation import BanUserData, BanUserRequest, UnbanUserRequest
+
+from ._ratelimit import RateBudget, call_with_retry
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+
+class BanTarget(NamedTuple):
+    """A user to ban; ``duration`` is seconds, or None for a permanent ban."""
+
+    user_id: str
+    reason: str | None = None
+    duration: int | None = None
+
+
+class MassActionProgress:
+    """Live counters for a mass ban or unban run."""
+
+    __slots__ = (
+        "action",
+        "submitted",
+        "succeeded",
+        "skipped",
+        "failed",
+        "retries",
+        "resumed",
+        "started_at",
+        "finished_at",
+        "errors",
+    )
+
+    def __init__(self, action: str):
+        self.action = action
+        self.submitted = 0
+        self.succeeded = 0
+        self.skipped = 0  # Already (un)banned according to Twitch
+        self.failed = 0
+        self.retries = 0
+        self.resumed = 0  # Done in a previous run according to the checkpoint
+        self.started_at = time.monotonic()
+        self.finished_at: float | None = None
+        self.errors: dict[str, str] = {}
+
+    @property
+    def completed(self) -> int:
+        """Targets that reached a final outcome in this run."""
+        return self.succeeded + self.skipped + self.failed
+
+    @property
+    def in_flight(self) -> int:
+        """Targets submitted but not yet completed."""
+        return self.submitted - self.completed
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the run started."""
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    @property
+    def rate(self) -> float:
+        """Completed actions per second."""
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"MassActionProgress(action={self.action!r}, succeeded={self.succeeded}, "
+            f"skipped={self.skipped}, failed={self.failed}, in_flight={self.in_flight}, "
+            f"rate={self.rate:.1f}/s)"
+        )
+
+
+class _Checkpoint:
+    """Append-only JSON lines log of finished targets."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+
+    def load(self, action: str) -> set[str]:
+        """User ids already finished for an action."""
+        done: set[str] = set()
+        if not self.path.exists():
+            return done
+        with self.path.open() as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted write
+                    continue
+                if record.get("action") == action and record.get("status") != "failed":
+                    done.add(record["user_id"])
+        return done
+
+    def record(self, action: str, user_id: str, status: str) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a")
+        self._file.write(json.dumps({"action": action, "user_id": user_id, "status": status}))
+        self._file.write("\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class MassModeration:
+    """Ban or unban large numbers of users in one channel as fast as allowed.
+
+    Targets are consumed from any (async) iterable by a pool of workers that
+    share a :class:`RateBudget`. Transient failures are retried; users
+    Twitch reports as already banned (or not banned, for unbans) count as
+    skipped. With ``checkpoint_path`` set, every finished user is appended
+    to a log so that an interrupted wave can be resumed by running the
+    same call again.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        broadcaster_id: str,
+        moderator_id: str,
+        budget: RateBudget | None = None,
+        concurrency: int = 50,
+        max_retries: int = 3,
+        checkpoint_path: str | Path | None = None,
+        on_progress: Callable[[MassActionProgress], None] | None = None,
+        progress_interval: float = 1.0,
+    ):
+        """Initialize the engine.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            broadcaster_id: Channel to moderate.
+            moderator_id: Moderator whose token and rate budget are used.
+            budget: Shared rate budget. Defaults to a fresh Helix budget.
+            concurrency: Maximum simultaneous requests.
+            max_retries: Retries per user for transient failures.
+            checkpoint_path: JSON lines file recording finished users.
+            on_progress: Called with live progress at most every ``progress_interval``
+                seconds, and once when the run finishes.
+            progress_interval: Minimum seconds between progress callbacks.
+        """
+        self.client = client
+        self.broadcaster_id = broadcaster_id
+        self.moderator_id = moderator_id
+        self.budget = budget or RateBudget()
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self._last_report = 0.0
+
+    async def ban(
+        self,
+        targets: Iterable[BanTarget | tuple] | AsyncIterable[BanTarget | tuple],
+    ) -> MassActionProgress:
+        """Ban every target.
+
+        Args:
+            targets: ``BanTarget`` or ``(user_id, reason, duration)`` tuples.
+        """
+        async def ban_one(target: BanTarget) -> None:
+            params = BanUserRequest(
+                broadcaster_id=self.broadcaster_id,
+                moderator_id=self.moderator_id,
+                data=BanUserData(
+                    user_id=target.user_id,
+                    reason=target.reason,
+                    duration=target.duration,
+                ),
+            )
+            await moderation.ban_user(self.client, params)
+
+        return await self._run("ban", targets, ban_one, "already banned")
+
+    async def unban(
+        self,
+        user_ids: Iterable[str] | AsyncIterable[str],
+    ) -> MassActionProgress:
+        """Unban every user id."""
+        async def unban_one(target: BanTarget) -> None:
+            params = UnbanUserRequest(
+                broadcaster_id=self.broadcaster_id,
+                moderator_id=self.moderator_id,
+                user_id=target.user_id,
+            )
+            await moderation.unban_user(self.client, params)
+
+        return await self._run("unban", user_ids, unban_one, "not banned")
+
+    def _report(self, progress: MassActionProgress, final: bool = False) -> None:
+        if self.on_progress is None:
+            return
+        now = time.monotonic()
+        if final or now - self._last_report >= self.progress_interval:
+            self._last_report = now
+            self.on_progress(progress)
+
+    async def _run(self, action: str, targets, call, skip_marker: str) -> MassActionProgress:
+        progress = MassActionProgress(action)
+        checkpoint = _Checkpoint(self.checkpoint_path) if self.checkpoint_path else None
+        done = checkpoint.load(action) if checkpoint else set()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        def on_retry(exc: BaseException, attempt: int) -> None:
+            progress.retries += 1
+
+        async def worker() -> None:
+            while True:
+                target = await queue.get()
+                if target is None:
+                    return
+                try:
+                    await call_with_retry(
+                        lambda: call(target),
+                        budget=self.budget,
+                        max_retries=self.max_retries,
+                        on_retry=on_retry,
+                    )
+                    status = "succeeded"
+                except TwitchAPIError as exc:
+                    if exc.status_code == 400 and skip_marker in exc.message.lower():
+                        status = "skipped"
+                    else:
+                        status = "failed"
+                        progress.errors[target.user_id] = str(exc)
+                except Exception as exc:
+                    status = "failed"
+                    progress.errors[target.user_id] = str(exc)
+                setattr(progress, status, getattr(progress, status) + 1)
+                if checkpoint:
+                    checkpoint.record(action, target.user_id, status)
+                self._report(progress)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+        try:
+            seen: set[str] = set()
+            async for target in _iterate(targets):
+                target = _as_target(target)
+                if target.user_id in seen:
+                    continue
+                seen.add(target.user_id)
+                if target.user_id in done:
+                    progress.resumed += 1
+                    continue
+                progress.submitted += 1
+                await queue.put(target)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            if checkpoint:
+                checkpoint.close()
+        progress.finished_at = time.monotonic()
+        self._report(progress, final=True)
+        return progress
+
+
+async def _iterate(items):
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+def _as_target(item) -> BanTarget:
+    if isinstance(item, BanTarget):
+        return item
+    if isinstance(item, str):
+        return BanTarget(item)
+    return BanTarget(*item)
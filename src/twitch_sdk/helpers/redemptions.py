@@ -0,0 +1,394 @@
+"""Batched fulfillment and cancellation of channel points redemptions."""
+
+import asyncio
+import inspect
+from datetime import datetime
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable, NamedTuple
+
+from twitch_client import TwitchAPIError
+
+from twitch_sdk.endpoints import channel_points
+from twitch_sdk.schemas.channel_points import (
+    GetCustomRewardRedemptionRequest,
+    UpdateRedemptionStatusRequest,
+)
+
+from ._events import event_data, event_type, parse_timestamp
+from ._pagination import iterate_items
+from ._ratelimit import RateBudget, call_with_retry
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+FULFILLED = "FULFILLED"
+CANCELED = "CANCELED"
+
+# Update Redemption Status accepts up to 50 redemption ids per call
+MAX_REDEMPTIONS_PER_REQUEST = 50
+
+
+class Redemption(NamedTuple):
+    """An unfulfilled redemption waiting for a decision."""
+
+    broadcaster_id: str
+    reward_id: str
+    redemption_id: str
+    user_id: str
+    user_login: str
+    user_input: str
+    redeemed_at: datetime | None
+
+
+class RedemptionBatch(NamedTuple):
+    """Outcome of one Update Redemption Status call (or failed batch)."""
+
+    broadcaster_id: str
+    reward_id: str
+    status: str
+    updated: list[str]  # Ids Twitch changed
+    skipped: list[str]  # Ids Twitch did not change (unknown or no longer unfulfilled)
+    failed: list[str]
+    error: Exception | None
+
+
+RedemptionDecider = Callable[[Redemption], str | None | Awaitable[str | None]]
+BatchListener = Callable[[RedemptionBatch], None]
+
+
+class RedemptionBatcherStats:
+    """Counters for batched redemption updates."""
+
+    __slots__ = ("queued", "duplicates", "withdrawn", "undecided", "batches", "updated", "skipped", "failed", "splits")
+
+    def __init__(self):
+        self.queued = 0
+        self.duplicates = 0  # Already queued; the first decision stands
+        self.withdrawn = 0  # Resolved elsewhere before its batch was sent
+        self.undecided = 0  # No decider decided; left for the broadcaster
+        self.batches = 0  # Update calls sent
+        self.updated = 0
+        self.skipped = 0
+        self.failed = 0
+        self.splits = 0  # Rejected batches cut in half to isolate bad ids
+
+    def __repr__(self) -> str:
+        return (
+            f"RedemptionBatcherStats(queued={self.queued}, duplicates={self.duplicates}, "
+            f"withdrawn={self.withdrawn}, undecided={self.undecided}, batches={self.batches}, "
+            f"updated={self.updated}, skipped={self.skipped}, failed={self.failed}, "
+            f"splits={self.splits})"
+        )
+
+
+class _Group:
+    __slots__ = ("ids", "timer")
+
+    def __init__(self):
+        self.ids: dict[str, None] = {}  # Insertion-ordered set
+        self.timer: asyncio.TimerHandle | None = None
+
+
+class RedemptionBatcher:
+    """Fulfill or cancel redemptions in as few Helix calls as possible.
+
+    Pending ids are grouped per (broadcaster, reward, target status). A
+    group is sent as one Update Redemption Status call as soon as it holds
+    50 ids, or ``max_delay`` seconds after its first id arrived, whichever
+    comes first. Ids Twitch leaves out of the response (already resolved,
+    refunded, ...) are reported as skipped; a batch rejected with a 400 is
+    split in half until the offending ids are isolated, so one bad id does
+    not fail its neighbours.
+
+    Feed ``channel.channel_points_custom_reward_redemption.add`` and
+    ``.update`` notifications to :meth:`handle_event`, or queue decisions
+    directly with :meth:`fulfill` and :meth:`cancel`, and keep :meth:`run`
+    running.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        deciders: Iterable[RedemptionDecider] = (),
+        budget: RateBudget | None = None,
+        max_batch: int = MAX_REDEMPTIONS_PER_REQUEST,
+        max_delay: float = 0.5,
+        concurrency: int = 10,
+        max_retries: int = 3,
+        on_batch: BatchListener | None = None,
+    ):
+        """Initialize the batcher.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            deciders: Return ``"FULFILLED"``, ``"CANCELED"`` or None for a
+                redemption; tried in order. May be sync or async.
+            budget: Shared rate budget. Defaults to a fresh Helix budget.
+            max_batch: Ids per call, at most 50.
+            max_delay: Seconds a partial batch waits for more ids.
+            concurrency: Calls in flight at once.
+            max_retries: Retries per call for transient failures.
+            on_batch: Called with the outcome of every batch.
+        """
+        if not 1 <= max_batch <= MAX_REDEMPTIONS_PER_REQUEST:
+            raise ValueError(f"max_batch must be between 1 and {MAX_REDEMPTIONS_PER_REQUEST}")
+        self.client = client
+        self.deciders: list[RedemptionDecider] = list(deciders)
+        self.budget = budget or RateBudget()
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.on_batch = on_batch
+        self.stats = RedemptionBatcherStats()
+        self._groups: dict[tuple[str, str, str], _Group] = {}
+        self._pending: dict[str, tuple[str, str, str]] = {}  # Redemption id -> group key
+        self._incoming: asyncio.Queue[Redemption] = asyncio.Queue()
+        self._deciding: set[str] = set()  # Ids of redemptions waiting for the deciders
+        self._resolved: set[str] = set()  # ... of which were resolved elsewhere meanwhile
+        self._ready: asyncio.Queue[tuple[tuple[str, str, str], list[str]]] = asyncio.Queue()
+
+    @property
+    def pending(self) -> int:
+        """Redemptions queued or in flight."""
+        return len(self._pending)
+
+    def add_decider(self, decider: RedemptionDecider) -> None:
+        """Append a decider."""
+        self.deciders.append(decider)
+
+    # Queueing
+
+    def submit(self, broadcaster_id: str, reward_id: str, redemption_id: str, status: str) -> bool:
+        """Queue a status change. Returns False if the id is already queued."""
+        status = status.upper()
+        if status not in (FULFILLED, CANCELED):
+            raise ValueError(f"Unsupported redemption status: {status}")
+        if redemption_id in self._pending:
+            self.stats.duplicates += 1
+            return False
+        key = (broadcaster_id, reward_id, status)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _Group()
+            group.timer = asyncio.get_running_loop().call_later(
+                self.max_delay, self._flush_group, key
+            )
+        group.ids[redemption_id] = None
+        self._pending[redemption_id] = key
+        self.stats.queued += 1
+        if len(group.ids) >= self.max_batch:
+            self._flush_group(key)
+        return True
+
+    def fulfill(self, broadcaster_id: str, reward_id: str, redemption_id: str) -> bool:
+        """Queue a redemption to be fulfilled."""
+        return self.submit(broadcaster_id, reward_id, redemption_id, FULFILLED)
+
+    def cancel(self, broadcaster_id: str, reward_id: str, redemption_id: str) -> bool:
+        """Queue a redemption to be canceled (refunding its points)."""
+        return self.submit(broadcaster_id, reward_id, redemption_id, CANCELED)
+
+    def withdraw(self, redemption_id: str) -> bool:
+        """Drop a queued id whose batch has not been sent yet."""
+        key = self._pending.get(redemption_id)
+        group = self._groups.get(key) if key is not None else None
+        if group is None or redemption_id not in group.ids:
+            return False
+        del group.ids[redemption_id]
+        del self._pending[redemption_id]
+        self.stats.withdrawn += 1
+        if not group.ids:
+            group.timer.cancel()
+            del self._groups[key]
+        return True
+
+    def _flush_group(self, key: tuple[str, str, str]) -> None:
+        group = self._groups.pop(key, None)
+        if group is None:
+            return
+        group.timer.cancel()
+        if group.ids:
+            self._ready.put_nowait((key, list(group.ids)))
+
+    def flush(self) -> None:
+        """Send every partial batch now instead of at its deadline."""
+        for key in list(self._groups):
+            self._flush_group(key)
+
+    # Events
+
+    async def decide(self, redemption: Redemption) -> str | None:
+        """Run the deciders against one redemption."""
+        for decider in self.deciders:
+            status = decider(redemption)
+            if inspect.isawaitable(status):
+                status = await status
+            if status is not None:
+                return status.upper()
+        return None
+
+    async def _decide_and_submit(self, redemption: Redemption) -> bool:
+        status = await self.decide(redemption)
+        if status is None:
+            self.stats.undecided += 1
+            return False
+        return self.submit(
+            redemption.broadcaster_id, redemption.reward_id, redemption.redemption_id, status
+        )
+
+    def handle_event(self, payload: dict) -> bool:
+        """Apply a custom reward redemption ``add`` or ``update`` notification.
+
+        New unfulfilled redemptions are queued for the deciders; update
+        events mean the redemption was resolved elsewhere, so a queued id
+        is withdrawn.
+
+        Returns:
+            True if the payload was a redemption event.
+        """
+        kind = event_type(payload)
+        event = event_data(payload)
+        if kind == "channel.channel_points_custom_reward_redemption.update":
+            redemption_id = event.get("id")
+            if redemption_id in self._deciding:
+                self._resolved.add(redemption_id)
+                self.stats.withdrawn += 1
+            else:
+                self.withdraw(redemption_id)
+            return True
+        if kind != "channel.channel_points_custom_reward_redemption.add":
+            return False
+        if event.get("status", "unfulfilled").upper() != "UNFULFILLED":
+            return True  # Rewards that skip the request queue are fulfilled already
+
+        redemption_id = event["id"]
+        if redemption_id in self._deciding or redemption_id in self._pending:
+            self.stats.duplicates += 1  # Redelivered notification
+            return True
+        redeemed_at = event.get("redeemed_at")
+        self._deciding.add(redemption_id)
+        self._incoming.put_nowait(Redemption(
+            broadcaster_id=event["broadcaster_user_id"],
+            reward_id=event["reward"]["id"],
+            redemption_id=redemption_id,
+            user_id=event.get("user_id", ""),
+            user_login=event.get("user_login", ""),
+            user_input=event.get("user_input", ""),
+            redeemed_at=parse_timestamp(redeemed_at) if redeemed_at else None,
+        ))
+        return True
+
+    async def load_backlog(self, broadcaster_id: str, reward_id: str) -> int:
+        """Run the deciders over a reward's existing unfulfilled redemptions.
+
+        Returns:
+            Number of redemptions queued.
+        """
+        params = GetCustomRewardRedemptionRequest(
+            broadcaster_id=broadcaster_id, reward_id=reward_id, status="UNFULFILLED", sort="OLDEST"
+        )
+        queued = 0
+        async for item in iterate_items(
+            channel_points.get_custom_reward_redemption,
+            self.client,
+            params,
+            page_size=MAX_REDEMPTIONS_PER_REQUEST,
+            budget=self.budget,
+        ):
+            if await self._decide_and_submit(Redemption(
+                broadcaster_id=item.broadcaster_id,
+                reward_id=reward_id,
+                redemption_id=item.id,
+                user_id=item.user_id,
+                user_login=item.user_login,
+                user_input=item.user_input,
+                redeemed_at=item.redeemed_at,
+            )):
+                queued += 1
+        return queued
+
+    # Sending
+
+    async def _update(self, key: tuple[str, str, str], ids: list[str]) -> list[RedemptionBatch]:
+        broadcaster_id, reward_id, status = key
+        params = UpdateRedemptionStatusRequest(
+            broadcaster_id=broadcaster_id, reward_id=reward_id, id=ids, status=status
+        )
+        self.stats.batches += 1
+        try:
+            response = await call_with_retry(
+                lambda: channel_points.update_redemption_status(self.client, params),
+                budget=self.budget,
+                max_retries=self.max_retries,
+            )
+        except TwitchAPIError as exc:
+            if exc.status_code == 404:
+                return [RedemptionBatch(broadcaster_id, reward_id, status, [], ids, [], None)]
+            if exc.status_code == 400 and len(ids) > 1:
+                self.stats.splits += 1
+                middle = len(ids) // 2
+                return await self._update(key, ids[:middle]) + await self._update(key, ids[middle:])
+            return [RedemptionBatch(broadcaster_id, reward_id, status, [], [], ids, exc)]
+        except Exception as exc:
+            return [RedemptionBatch(broadcaster_id, reward_id, status, [], [], ids, exc)]
+
+        returned = {redemption.id for redemption in response.data}
+        updated = [redemption_id for redemption_id in ids if redemption_id in returned]
+        skipped = [redemption_id for redemption_id in ids if redemption_id not in returned]
+        return [RedemptionBatch(broadcaster_id, reward_id, status, updated, skipped, [], None)]
+
+    async def _send(self, key: tuple[str, str, str], ids: list[str]) -> None:
+        try:
+            outcomes = await self._update(key, ids)
+        finally:
+            for redemption_id in ids:
+                self._pending.pop(redemption_id, None)
+        for outcome in outcomes:
+            self.stats.updated += len(outcome.updated)
+            self.stats.skipped += len(outcome.skipped)
+            self.stats.failed += len(outcome.failed)
+            if self.on_batch is not None:
+                self.on_batch(outcome)
+
+    async def _decider(self) -> None:
+        while True:
+            redemption = await self._incoming.get()
+            redemption_id = redemption.redemption_id
+            try:
+                self._deciding.discard(redemption_id)
+                if redemption_id in self._resolved:
+                    self._resolved.discard(redemption_id)
+                else:
+                    await self._decide_and_submit(redemption)
+            except Exception:
+                # A failing decider leaves the redemption for the broadcaster
+                self.stats.undecided += 1
+            finally:
+                self._incoming.task_done()
+
+    async def _worker(self) -> None:
+        while True:
+            key, ids = await self._ready.get()
+            try:
+                await self._send(key, ids)
+            except Exception:
+                # A failing listener must not take the worker down
+                pass
+            finally:
+                self._ready.task_done()
+
+    async def run(self) -> None:
+        """Decide incoming redemptions and send batches with the worker pool, forever."""
+        workers = [asyncio.ensure_future(self._worker()) for _ in range(self.concurrency)]
+        workers.append(asyncio.ensure_future(self._decider()))
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+
+    async def join(self) -> None:
+        """Flush partial batches and wait until every queued id was sent."""
+        await self._incoming.join()
+        self.flush()
+        await self._ready.join()
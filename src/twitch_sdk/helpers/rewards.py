@@ -0,0 +1,304 @@
+"""In-memory custom reward state kept fresh by EventSub and write responses."""
+
+import asyncio
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from twitch_sdk.endpoints import channel_points
+from twitch_sdk.schemas.channel_points import (
+    CreateCustomRewardRequest,
+    CustomReward,
+    DeleteCustomRewardRequest,
+    GetCustomRewardsRequest,
+    UpdateCustomRewardRequest,
+)
+
+from ._batching import gather_limited
+from ._events import event_data, event_type
+from ._ratelimit import RateBudget, call_with_retry
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+RewardListener = Callable[[str, CustomReward | None, CustomReward | None], None]
+
+# Update request field -> CustomReward field
+_DIRECT_FIELDS = (
+    "title",
+    "cost",
+    "prompt",
+    "is_enabled",
+    "background_color",
+    "is_user_input_required",
+    "should_redemptions_skip_request_queue",
+    "is_paused",
+)
+
+# CustomReward setting -> (request "enabled" field, request value field, setting value field)
+_SETTING_FIELDS = {
+    "max_per_stream_setting": ("is_max_per_stream_enabled", "max_per_stream", "max_per_stream"),
+    "max_per_user_per_stream_setting": (
+        "is_max_per_user_per_stream_enabled",
+        "max_per_user_per_stream",
+        "max_per_user_per_stream",
+    ),
+    "global_cooldown_setting": (
+        "is_global_cooldown_enabled",
+        "global_cooldown_seconds",
+        "global_cooldown_seconds",
+    ),
+}
+
+# Event setting object -> (CustomReward setting, event value field, setting value field)
+_EVENT_SETTINGS = {
+    "max_per_stream": ("max_per_stream_setting", "value", "max_per_stream"),
+    "max_per_user_per_stream": ("max_per_user_per_stream_setting", "value", "max_per_user_per_stream"),
+    "global_cooldown": ("global_cooldown_setting", "seconds", "global_cooldown_seconds"),
+}
+
+
+def apply_update(reward: CustomReward, params: UpdateCustomRewardRequest) -> CustomReward:
+    """The reward as it will look once ``params`` is applied by Helix."""
+    update = {
+        field: getattr(params, field)
+        for field in _DIRECT_FIELDS
+        if getattr(params, field) is not None
+    }
+    for setting, (enabled_field, value_field, setting_field) in _SETTING_FIELDS.items():
+        changes = {}
+        if getattr(params, enabled_field) is not None:
+            changes["is_enabled"] = getattr(params, enabled_field)
+        if getattr(params, value_field) is not None:
+            changes[setting_field] = getattr(params, value_field)
+        if changes:
+            update[setting] = getattr(reward, setting).model_copy(update=changes)
+    return reward.model_copy(update=update)
+
+
+def reward_from_event(event: dict) -> CustomReward:
+    """Build a reward from a ``channel.channel_points_custom_reward.*`` event."""
+    data = {
+        key: value
+        for key, value in event.items()
+        if key not in _EVENT_SETTINGS and not key.startswith("broadcaster_user_")
+    }
+    data["broadcaster_id"] = event["broadcaster_user_id"]
+    data["broadcaster_login"] = event.get("broadcaster_user_login", "")
+    data["broadcaster_name"] = event.get("broadcaster_user_name", "")
+    for key, (setting, value_field, setting_field) in _EVENT_SETTINGS.items():
+        value = event.get(key) or {}
+        data[setting] = {
+            "is_enabled": value.get("is_enabled", False),
+            setting_field: value.get(value_field) or 0,
+        }
+    return CustomReward.model_validate(data)
+
+
+class CustomRewardCache:
+    """Custom rewards of many broadcasters, served from memory.
+
+    Rewards are loaded with one Get Custom Reward call per broadcaster and
+    then kept current from ``channel.channel_points_custom_reward.*``
+    events, from redemption events (which bump
+    ``redemptions_redeemed_current_stream``) and from the responses of
+    writes made through :meth:`create`, :meth:`update` and :meth:`delete`.
+    Updates are applied optimistically before the call is sent and rolled
+    back if it fails. :meth:`run` re-fetches everything on a slow
+    reconciliation interval to repair anything the events missed.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        budget: RateBudget | None = None,
+        concurrency: int = 10,
+        reconcile_interval: float = 900.0,
+    ):
+        """Initialize the cache.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            budget: Shared rate budget. Defaults to a fresh Helix budget.
+            concurrency: Maximum simultaneous Get Custom Reward calls.
+            reconcile_interval: Seconds between full refreshes in :meth:`run`.
+        """
+        self.client = client
+        self.budget = budget or RateBudget()
+        self.concurrency = concurrency
+        self.reconcile_interval = reconcile_interval
+        self._rewards: dict[str, dict[str, CustomReward]] = {}
+        self._listeners: list[RewardListener] = []
+
+    def __len__(self) -> int:
+        return sum(len(rewards) for rewards in self._rewards.values())
+
+    def __contains__(self, broadcaster_id: str) -> bool:
+        return broadcaster_id in self._rewards
+
+    def get(self, broadcaster_id: str, reward_id: str) -> CustomReward | None:
+        """Get a cached reward without any API call."""
+        return self._rewards.get(broadcaster_id, {}).get(reward_id)
+
+    def rewards(self, broadcaster_id: str) -> list[CustomReward]:
+        """Cached rewards of a broadcaster."""
+        return list(self._rewards.get(broadcaster_id, {}).values())
+
+    def broadcasters(self) -> list[str]:
+        """Ids of all cached broadcasters."""
+        return list(self._rewards)
+
+    # Listeners
+
+    def add_listener(self, listener: RewardListener) -> None:
+        """Call ``listener(broadcaster_id, old, new)`` on every change.
+
+        ``old`` is None for new rewards and ``new`` is None for removed ones.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: RewardListener) -> None:
+        """Stop calling a listener."""
+        self._listeners.remove(listener)
+
+    def _notify(self, broadcaster_id: str, old: CustomReward | None, new: CustomReward | None) -> None:
+        if old != new:
+            for listener in list(self._listeners):
+                listener(broadcaster_id, old, new)
+
+    def _store(self, reward: CustomReward) -> None:
+        rewards = self._rewards.setdefault(reward.broadcaster_id, {})
+        old = rewards.get(reward.id)
+        rewards[reward.id] = reward
+        self._notify(reward.broadcaster_id, old, reward)
+
+    def _remove(self, broadcaster_id: str, reward_id: str) -> None:
+        old = self._rewards.get(broadcaster_id, {}).pop(reward_id, None)
+        if old is not None:
+            self._notify(broadcaster_id, old, None)
+
+    # Loading
+
+    async def refresh(self, broadcaster_id: str) -> list[CustomReward]:
+        """Re-fetch every reward of one broadcaster, dropping deleted ones."""
+        params = GetCustomRewardsRequest(broadcaster_id=broadcaster_id)
+        response = await call_with_retry(
+            lambda: channel_points.get_custom_rewards(self.client, params), budget=self.budget
+        )
+        returned = {reward.id for reward in response.data}
+        for reward_id in [r for r in self._rewards.get(broadcaster_id, {}) if r not in returned]:
+            self._remove(broadcaster_id, reward_id)
+        self._rewards.setdefault(broadcaster_id, {})
+        for reward in response.data:
+            self._store(reward)
+        return response.data
+
+    async def load(self, broadcaster_ids: Iterable[str]) -> dict[str, Exception]:
+        """Fetch rewards for many broadcasters with bounded concurrency.
+
+        Returns:
+            Errors keyed by broadcaster id for channels that failed to load.
+        """
+        broadcaster_ids = list(dict.fromkeys(broadcaster_ids))
+        results = await gather_limited(
+            (self.refresh(broadcaster_id) for broadcaster_id in broadcaster_ids),
+            self.concurrency,
+            return_exceptions=True,
+        )
+        return {
+            broadcaster_id: result
+            for broadcaster_id, result in zip(broadcaster_ids, results)
+            if isinstance(result, Exception)
+        }
+
+    async def refresh_all(self) -> dict[str, Exception]:
+        """Re-fetch every cached broadcaster, e.g. after an EventSub gap."""
+        return await self.load(self.broadcasters())
+
+    async def run(self) -> None:
+        """Reconcile every ``reconcile_interval`` seconds, forever."""
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            await self.refresh_all()  # Failed channels keep their state until next time
+
+    def forget(self, broadcaster_id: str) -> None:
+        """Stop caching a broadcaster."""
+        self._rewards.pop(broadcaster_id, None)
+
+    # Writes
+
+    async def create(self, params: CreateCustomRewardRequest) -> CustomReward | None:
+        """Create a reward through Helix and cache the response."""
+        response = await call_with_retry(
+            lambda: channel_points.create_custom_reward(self.client, params), budget=self.budget
+        )
+        for reward in response.data:
+            self._store(reward)
+        return response.data[0] if response.data else None
+
+    async def update(self, params: UpdateCustomRewardRequest) -> CustomReward | None:
+        """Update a reward, applying the change to the cache before Helix answers.
+
+        The response replaces the optimistic state. If the call fails, the
+        previous state is restored (unless something newer arrived
+        meanwhile) and the error is raised.
+        """
+        old = self.get(params.broadcaster_id, params.id)
+        optimistic = None
+        if old is not None:
+            optimistic = apply_update(old, params)
+            self._store(optimistic)
+        try:
+            response = await call_with_retry(
+                lambda: channel_points.update_custom_reward(self.client, params), budget=self.budget
+            )
+        except Exception:
+            if optimistic is not None and self.get(params.broadcaster_id, params.id) is optimistic:
+                self._store(old)
+            raise
+        for reward in response.data:
+            self._store(reward)
+        return response.data[0] if response.data else None
+
+    async def set_paused(self, broadcaster_id: str, reward_id: str, paused: bool) -> CustomReward | None:
+        """Pause or resume a reward."""
+        return await self.update(
+            UpdateCustomRewardRequest(broadcaster_id=broadcaster_id, id=reward_id, is_paused=paused)
+        )
+
+    async def delete(self, params: DeleteCustomRewardRequest) -> None:
+        """Delete a reward through Helix and drop it from the cache."""
+        await call_with_retry(
+            lambda: channel_points.delete_custom_reward(self.client, params), budget=self.budget
+        )
+        self._remove(params.broadcaster_id, params.id)
+
+    # Events
+
+    def handle_event(self, payload: dict) -> bool:
+        """Apply a custom reward or redemption ``add`` EventSub notification.
+
+        Returns:
+            True if the payload was a custom reward event.
+        """
+        kind = event_type(payload)
+        event = event_data(payload)
+        if kind in (
+            "channel.channel_points_custom_reward.add",
+            "channel.channel_points_custom_reward.update",
+        ):
+            self._store(reward_from_event(event))
+            return True
+        if kind == "channel.channel_points_custom_reward.remove":
+            self._remove(event.get("broadcaster_user_id"), event.get("id"))
+            return True
+        if kind == "channel.channel_points_custom_reward_redemption.add":
+            reward = self.get(event.get("broadcaster_user_id"), (event.get("reward") or {}).get("id"))
+            if reward is not None and reward.redemptions_redeemed_current_stream is not None:
+                count = reward.redemptions_redeemed_current_stream + 1
+                limit = reward.max_per_stream_setting
+                self._store(reward.model_copy(update={
+                    "redemptions_redeemed_current_stream": count,
+                    "is_in_stock": reward.is_in_stock
+                    and not (limit.is_enabled and count >= limit.max_per_stream),
+                }))
+            return True
+        return False
@@ -0,0 +1,254 @@
+"""Cross-channel index of moderator and VIP roles."""
+
+import json
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+
+from twitch_sdk.endpoints import channels, moderation
+from twitch_sdk.schemas.channels import GetVIPsRequest
+from twitch_sdk.schemas.moderation import GetModeratorsRequest
+
+from ._batching import gather_limited
+from ._compact import Interner, sorted_contains, sorted_insert, sorted_remove
+from ._events import event_data, event_type
+from ._pagination import iterate_items
+from ._ratelimit import RateBudget
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+MODERATOR = "moderator"
+VIP = "vip"
+ROLES = (MODERATOR, VIP)
+
+_SNAPSHOT_VERSION = 1
+
+# EventSub type -> (role, added)
+_ROLE_EVENTS = {
+    "channel.moderator.add": (MODERATOR, True),
+    "channel.moderator.remove": (MODERATOR, False),
+    "channel.vip.add": (VIP, True),
+    "channel.vip.remove": (VIP, False),
+}
+
+
+class RoleIndex:
+    """Forward and reverse maps of moderator and VIP roles across channels.
+
+    Answers both "who are the mods/VIPs of channel C" and "which channels
+    is user U a mod/VIP in" from memory. User and channel ids are interned
+    to integers and each map entry is a sorted ``array('I')``. Channels are
+    crawled in bulk, updated from the moderator/VIP add/remove EventSub
+    types, and the whole index can be saved to and restored from a
+    snapshot file.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        budget: RateBudget | None = None,
+        concurrency: int = 10,
+    ):
+        """Initialize the index.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            budget: Shared rate budget for crawls.
+            concurrency: Maximum channels crawled at once by :meth:`build`.
+        """
+        self.client = client
+        self.budget = budget
+        self.concurrency = concurrency
+        self._ids = Interner()
+        self._logins: dict[int, str] = {}
+        # role -> channel -> sorted users, and role -> user -> sorted channels
+        self._members: dict[str, dict[int, array]] = {role: {} for role in ROLES}
+        self._channels: dict[str, dict[int, array]] = {role: {} for role in ROLES}
+
+    # Queries
+
+    def members(self, broadcaster_id: str, role: str = MODERATOR) -> list[str]:
+        """User ids holding a role in a channel."""
+        channel = self._ids.lookup(broadcaster_id)
+        users = self._members[role].get(channel) if channel is not None else None
+        return [self._ids.value(user) for user in users] if users else []
+
+    def channels_for(self, user_id: str, role: str = MODERATOR) -> list[str]:
+        """Broadcaster ids of channels where a user holds a role."""
+        user = self._ids.lookup(user_id)
+        found = self._channels[role].get(user) if user is not None else None
+        return [self._ids.value(channel) for channel in found] if found else []
+
+    def has_role(self, broadcaster_id: str, user_id: str, role: str = MODERATOR) -> bool:
+        """Whether a user holds a role in a channel."""
+        channel = self._ids.lookup(broadcaster_id)
+        user = self._ids.lookup(user_id)
+        if channel is None or user is None:
+            return False
+        users = self._members[role].get(channel)
+        return users is not None and sorted_contains(users, user)
+
+    def login(self, user_id: str) -> str | None:
+        """Last known login of an indexed user."""
+        user = self._ids.lookup(user_id)
+        return self._logins.get(user) if user is not None else None
+
+    def indexed_channels(self) -> list[str]:
+        """Broadcaster ids of every crawled channel."""
+        found = set(self._members[MODERATOR]) | set(self._members[VIP])
+        return [self._ids.value(channel) for channel in found]
+
+    # Updates
+
+    def add(self, broadcaster_id: str, user_id: str, role: str, login: str | None = None) -> None:
+        """Record that a user holds a role in a channel."""
+        channel = self._ids.intern(broadcaster_id)
+        user = self._ids.intern(user_id)
+        if login:
+            self._logins[user] = login
+        sorted_insert(self._members[role].setdefault(channel, array("I")), user)
+        sorted_insert(self._channels[role].setdefault(user, array("I")), channel)
+
+    def remove(self, broadcaster_id: str, user_id: str, role: str) -> None:
+        """Record that a user no longer holds a role in a channel."""
+        channel = self._ids.lookup(broadcaster_id)
+        user = self._ids.lookup(user_id)
+        if channel is None or user is None:
+            return
+        users = self._members[role].get(channel)
+        if users is not None:
+            sorted_remove(users, user)
+        found = self._channels[role].get(user)
+        if found is not None:
+            sorted_remove(found, channel)
+            if not found:
+                del self._channels[role][user]
+
+    def _replace(self, role: str, broadcaster_id: str, users: dict[str, str]) -> None:
+        """Set a channel's full member list for a role, fixing the reverse map."""
+        channel = self._ids.intern(broadcaster_id)
+        new = array("I", sorted(self._ids.intern(user_id) for user_id in users))
+        for user_id, login in users.items():
+            self._logins[self._ids.lookup(user_id)] = login
+        old = self._members[role].get(channel, array("I"))
+        reverse = self._channels[role]
+        for user in set(old).difference(new):
+            found = reverse.get(user)
+            if found is not None:
+                sorted_remove(found, channel)
+                if not found:
+                    del reverse[user]
+        for user in set(new).difference(old):
+            sorted_insert(reverse.setdefault(user, array("I")), channel)
+        self._members[role][channel] = new
+
+    def handle_event(self, payload: dict) -> bool:
+        """Apply a moderator or VIP add/remove EventSub notification.
+
+        Returns:
+            True if the payload was a role event.
+        """
+        change = _ROLE_EVENTS.get(event_type(payload))
+        if change is None:
+            return False
+        role, added = change
+        event = event_data(payload)
+        broadcaster_id = event.get("broadcaster_user_id")
+        user_id = event.get("user_id")
+        if broadcaster_id and user_id:
+            if added:
+                self.add(broadcaster_id, user_id, role, event.get("user_login"))
+            else:
+                self.remove(broadcaster_id, user_id, role)
+        return True
+
+    # Crawling
+
+    async def crawl(self, broadcaster_id: str) -> tuple[int, int]:
+        """Load every moderator and VIP of a channel.
+
+        Returns:
+            Number of moderators and VIPs loaded.
+        """
+        moderators = {
+            user.user_id: user.user_login
+            async for user in iterate_items(
+                moderation.get_moderators,
+                self.client,
+                GetModeratorsRequest(broadcaster_id=broadcaster_id),
+                budget=self.budget,
+            )
+        }
+        vips = {
+            user.user_id: user.user_login
+            async for user in iterate_items(
+                channels.get_vips,
+                self.client,
+                GetVIPsRequest(broadcaster_id=broadcaster_id),
+                budget=self.budget,
+            )
+        }
+        self._replace(MODERATOR, broadcaster_id, moderators)
+        self._replace(VIP, broadcaster_id, vips)
+        return len(moderators), len(vips)
+
+    async def build(self, broadcaster_ids: Iterable[str]) -> dict[str, Exception]:
+        """Crawl many channels with bounded concurrency.
+
+        Returns:
+            Errors keyed by broadcaster id for channels that failed to crawl.
+        """
+        broadcaster_ids = list(dict.fromkeys(broadcaster_ids))
+        results = await gather_limited(
+            (self.crawl(broadcaster_id) for broadcaster_id in broadcaster_ids),
+            self.concurrency,
+            return_exceptions=True,
+        )
+        return {
+            broadcaster_id: result
+            for broadcaster_id, result in zip(broadcaster_ids, results)
+            if isinstance(result, Exception)
+        }
+
+    # Snapshots
+
+    def save(self, path: str | Path) -> None:
+        """Write the index to a snapshot file.
+
+        The reverse maps are derived data and are rebuilt on load.
+        """
+        snapshot = {
+            "version": _SNAPSHOT_VERSION,
+            "ids": self._ids.ids,
+            "logins": {str(user): login for user, login in self._logins.items()},
+            "members": {
+                role: {str(channel): users.tolist() for channel, users in members.items()}
+                for role, members in self._members.items()
+            },
+        }
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(snapshot, separators=(",", ":")))
+        tmp.replace(path)
+
+    def restore(self, path: str | Path) -> None:
+        """Replace the index with the contents of a snapshot file."""
+        snapshot = json.loads(Path(path).read_text())
+        if snapshot.get("version") != _SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported role snapshot version: {snapshot.get('version')}")
+
+        self._ids = Interner(snapshot["ids"])
+        self._logins = {int(user): login for user, login in snapshot["logins"].items()}
+        self._members = {role: {} for role in ROLES}
+        self._channels = {role: {} for role in ROLES}
+        for role, members in snapshot["members"].items():
+            reverse: dict[int, list[int]] = {}
+            for channel, users in members.items():
+                channel = int(channel)
+                self._members[role][channel] = array("I", users)
+                for user in users:
+                    reverse.setdefault(user, []).append(channel)
+            self._channels[role] = {
+                user: array("I", sorted(found)) for user, found in reverse.items()
+            }
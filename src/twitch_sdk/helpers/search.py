@@ -0,0 +1,265 @@
+"""Typeahead search over categories and channels with a local prefix index."""
+
+import asyncio
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING, Callable, Generic, Hashable, Iterable, TypeVar
+
+from twitch_sdk.endpoints import search
+from twitch_sdk.schemas.search import (
+    SearchCategoriesRequest,
+    SearchCategory,
+    SearchChannel,
+    SearchChannelsRequest,
+)
+
+from ._cache import TTLCache
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+T = TypeVar("T")
+
+CATEGORIES = "categories"
+CHANNELS = "channels"
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def word_keys(text: str) -> list[str]:
+    """Index keys for ``text``: the whole string and every word-suffix of it.
+
+    ``"Grand Theft Auto V"`` is found by ``"gra"``, ``"theft a"`` or ``"auto"``.
+    """
+    words = _normalize(text).split(" ")
+    return [" ".join(words[start:]) for start in range(len(words)) if words[start]]
+
+
+class PrefixIndex(Generic[T]):
+    """Items searchable by key prefix, kept in a sorted array of keys.
+
+    Lookups are a binary search plus a scan over the matching run.
+    """
+
+    def __init__(self):
+        self._entries: list[tuple[str, str]] = []  # Sorted (key, item id)
+        self._items: dict[str, T] = {}
+        self._keys: dict[str, tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._items
+
+    def get(self, item_id: str) -> T | None:
+        """Get an item by id."""
+        return self._items.get(item_id)
+
+    def add(self, item_id: str, keys: Iterable[str], item: T) -> None:
+        """Add or replace an item under the given keys."""
+        new = tuple(sorted(set(keys)))
+        old = self._keys.get(item_id)
+        if old != new:
+            if old:
+                self._remove_entries(item_id, old)
+            for key in new:
+                insort(self._entries, (key, item_id))
+            self._keys[item_id] = new
+        self._items[item_id] = item
+
+    def remove(self, item_id: str) -> None:
+        """Remove an item."""
+        keys = self._keys.pop(item_id, None)
+        if keys:
+            self._remove_entries(item_id, keys)
+        self._items.pop(item_id, None)
+
+    def _remove_entries(self, item_id: str, keys: tuple[str, ...]) -> None:
+        for key in keys:
+            index = bisect_left(self._entries, (key, item_id))
+            if index < len(self._entries) and self._entries[index] == (key, item_id):
+                del self._entries[index]
+
+    def search(
+        self,
+        prefix: str,
+        limit: int = 10,
+        predicate: Callable[[T], bool] | None = None,
+    ) -> list[T]:
+        """Items with a key starting with ``prefix``, in key order."""
+        prefix = _normalize(prefix)
+        entries = self._entries
+        index = bisect_left(entries, (prefix,))
+        found: list[T] = []
+        seen: set[str] = set()
+        while index < len(entries) and len(found) < limit:
+            key, item_id = entries[index]
+            if not key.startswith(prefix):
+                break
+            index += 1
+            if item_id in seen:
+                continue
+            seen.add(item_id)
+            item = self._items[item_id]
+            if predicate is None or predicate(item):
+                found.append(item)
+        return found
+
+
+class TypeaheadStats:
+    """Where typeahead answers came from."""
+
+    __slots__ = ("local", "cached", "fetched", "shared", "superseded")
+
+    def __init__(self):
+        self.local = 0  # Answered from the prefix index
+        self.cached = 0  # Answered from the result cache
+        self.fetched = 0  # Sent to Helix
+        self.shared = 0  # Joined an identical in-flight request
+        self.superseded = 0  # Dropped by debouncing in favor of a newer keystroke
+
+    def __repr__(self) -> str:
+        return (
+            f"TypeaheadStats(local={self.local}, cached={self.cached}, "
+            f"fetched={self.fetched}, shared={self.shared}, superseded={self.superseded})"
+        )
+
+
+class TypeaheadSearch:
+    """Category and channel search for typeahead UIs, mostly answered locally.
+
+    Every result Helix returns is added to a local :class:`PrefixIndex`.
+    A query is answered, in order, from the result cache, from the prefix
+    index when it has at least ``limit`` matches, and only then from
+    Helix. Network queries that carry a ``session`` (e.g. one input box)
+    are debounced, so a keystroke superseded within ``debounce`` seconds
+    gets the local matches instead of a request, and identical in-flight
+    queries share one request.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        ttl: float = 300.0,
+        max_entries: int | None = 10_000,
+        debounce: float = 0.15,
+        page_size: int = 20,
+    ):
+        """Initialize the search layer.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            ttl: Seconds a query's Helix results stay cached.
+            max_entries: Maximum cached queries.
+            debounce: Seconds a session's query waits for a newer keystroke.
+            page_size: Results requested from Helix per query.
+        """
+        self.client = client
+        self.debounce = debounce
+        self.page_size = page_size
+        self.categories: PrefixIndex[SearchCategory] = PrefixIndex()
+        self.channels: PrefixIndex[SearchChannel] = PrefixIndex()
+        self.stats = TypeaheadStats()
+        self._cache: TTLCache[tuple, list] = TTLCache(ttl, max_entries)
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self._sessions: dict[Hashable, object] = {}
+
+    # Index
+
+    def add_categories(self, categories: Iterable[SearchCategory]) -> None:
+        """Make categories searchable locally."""
+        for category in categories:
+            self.categories.add(category.id, word_keys(category.name), category)
+
+    def add_channels(self, channels: Iterable[SearchChannel]) -> None:
+        """Make channels searchable locally."""
+        for channel in channels:
+            keys = word_keys(channel.display_name)
+            keys.append(channel.broadcaster_login)
+            self.channels.add(channel.id, keys, channel)
+
+    # Queries
+
+    async def search_categories(
+        self,
+        query: str,
+        limit: int = 10,
+        session: Hashable | None = None,
+    ) -> list[SearchCategory]:
+        """Find categories for a (partial) query."""
+        return await self._search(CATEGORIES, query, limit, session, live_only=False)
+
+    async def search_channels(
+        self,
+        query: str,
+        limit: int = 10,
+        live_only: bool = False,
+        session: Hashable | None = None,
+    ) -> list[SearchChannel]:
+        """Find channels for a (partial) query."""
+        return await self._search(CHANNELS, query, limit, session, live_only)
+
+    async def _search(
+        self,
+        kind: str,
+        query: str,
+        limit: int,
+        session: Hashable | None,
+        live_only: bool,
+    ) -> list:
+        query = _normalize(query)
+        if not query:
+            return []
+        key = (kind, query, live_only)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.stats.cached += 1
+            return cached[:limit]
+
+        index = self.categories if kind == CATEGORIES else self.channels
+        predicate = (lambda channel: channel.is_live) if live_only else None
+        local = index.search(query, limit, predicate)
+        if len(local) >= limit:
+            self.stats.local += 1
+            return local
+
+        if session is not None and not await self._debounced(session):
+            self.stats.superseded += 1
+            return local
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(kind, query, live_only))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats.shared += 1
+        return (await asyncio.shield(task))[:limit]
+
+    async def _debounced(self, session: Hashable) -> bool:
+        """Wait out the debounce delay. False if a newer query replaced this one."""
+        token = object()
+        self._sessions[session] = token
+        await asyncio.sleep(self.debounce)
+        if self._sessions.get(session) is not token:
+            return False
+        del self._sessions[session]
+        return True
+
+    async def _fetch(self, kind: str, query: str, live_only: bool) -> list:
+        self.stats.fetched += 1
+        if kind == CATEGORIES:
+            response = await search.search_categories(
+                self.client, SearchCategoriesRequest(query=query, first=self.page_size)
+            )
+            self.add_categories(response.data)
+        else:
+            response = await search.search_channels(
+                self.client,
+                SearchChannelsRequest(query=query, live_only=live_only, first=self.page_size),
+            )
+            self.add_channels(response.data)
+        self._cache.set((kind, query, live_only), response.data)
+        return response.data
@@ -0,0 +1,414 @@
+"""Chat-rate anomaly detection that drives Shield Mode."""
+
+import asyncio
+import time
+from array import array
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple
+
+from twitch_sdk.endpoints import moderation
+from twitch_sdk.schemas.moderation import (
+    GetShieldModeStatusRequest,
+    UpdateShieldModeStatusRequest,
+)
+
+from ._batching import gather_limited
+from ._compact import IdSet
+from ._events import event_data, event_type
+from ._ratelimit import RateBudget, call_with_retry
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+
+class ChatRateSnapshot(NamedTuple):
+    """Features of a channel's recent chat activity."""
+
+    rate: float  # Messages per second over the window
+    baseline: float  # Long-run messages per second
+    burstiness: float  # Variance-to-mean ratio of per-second counts
+    new_chatter_ratio: float  # Share of window messages from new chatters
+    pressure: float  # >= 1 triggers Shield Mode
+    active: bool
+
+
+ShieldModeListener = Callable[[str, bool, ChatRateSnapshot], None]
+ShieldModeErrorHandler = Callable[[str, bool, Exception], None]
+NewChatterCheck = Callable[[str, str], bool]
+
+
+class _ChannelWindow:
+    """Per-second message counts for one channel in fixed ring buffers."""
+
+    __slots__ = (
+        "counts", "new", "second", "total", "total_sq", "new_total", "baseline",
+        "observed", "seen", "seen_before", "active", "owned", "changed_at", "calm_since", "pending",
+    )
+
+    def __init__(self, size: int, second: int):
+        self.counts = array("I", bytes(4 * size))
+        self.new = array("I", bytes(4 * size))
+        self.second = second
+        self.total = 0
+        self.total_sq = 0
+        self.new_total = 0
+        self.baseline = 0.0
+        self.observed = 0  # Seconds of history seen, for warmup
+        self.seen: IdSet | None = None
+        self.seen_before: IdSet | None = None  # Previous generation of ``seen``
+        self.active = False
+        self.owned = False  # Whether this detector turned Shield Mode on
+        self.changed_at = float("-inf")
+        self.calm_since: float | None = None
+        self.pending = False
+
+    def advance(self, second: int, alpha: float, learn: bool) -> None:
+        """Move the window forward to ``second``, clearing stale buckets."""
+        gap = second - self.second
+        if gap <= 0:
+            return
+        size = len(self.counts)
+        if learn:
+            # Fold the completed second, then any silent seconds, into the baseline
+            self.baseline += alpha * (self.counts[self.second % size] - self.baseline)
+            if gap > 1:
+                self.baseline *= (1 - alpha) ** (gap - 1)
+        for step in range(1, min(gap, size) + 1):
+            slot = (self.second + step) % size
+            count = self.counts[slot]
+            if count:
+                self.total -= count
+                self.total_sq -= count * count
+                self.new_total -= self.new[slot]
+                self.counts[slot] = 0
+                self.new[slot] = 0
+        self.observed += gap
+        self.second = second
+
+    def record(self, new: bool) -> None:
+        slot = self.second % len(self.counts)
+        count = self.counts[slot]
+        self.counts[slot] = count + 1
+        self.total += 1
+        self.total_sq += 2 * count + 1
+        if new:
+            self.new[slot] += 1
+            self.new_total += 1
+
+
+class ShieldModeDetector:
+    """Turn Shield Mode on and off from per-channel chat-rate anomalies.
+
+    Feed ``channel.chat.message`` notifications to :meth:`handle_event`
+    and keep :meth:`run` running. Each channel keeps per-second message
+    counts in fixed ring buffers covering the last ``window`` seconds, so
+    recording a message is O(1) and allocation-free. From those come the
+    message rate, its burstiness and the share of messages from first-time
+    chatters, compared with a slowly learned baseline rate.
+
+    A channel's *pressure* is how far past the nearest trigger it is, gated
+    by ``min_rate``. Shield Mode is activated when pressure reaches 1 and
+    deactivated only after it stays below ``release`` for ``hold`` seconds,
+    so a channel does not flap around the threshold. Shield Mode turned on
+    by someone else (``channel.shield_mode.begin``) is never turned off
+    automatically.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        moderator_id: str,
+        window: int = 30,
+        min_rate: float = 2.0,
+        surge_factor: float = 5.0,
+        max_new_chatter_ratio: float = 0.7,
+        max_burstiness: float = 20.0,
+        release: float = 0.5,
+        hold: float = 120.0,
+        warmup: float = 300.0,
+        baseline_seconds: float = 900.0,
+        min_baseline: float = 0.2,
+        is_new_chatter: NewChatterCheck | None = None,
+        max_chatters: int = 100_000,
+        budget: RateBudget | None = None,
+        concurrency: int = 10,
+        on_error: ShieldModeErrorHandler | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the detector.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            moderator_id: Moderator toggling Shield Mode.
+            window: Seconds of history used for the rate features.
+            min_rate: Messages per second below which nothing triggers.
+            surge_factor: Rate, as a multiple of the baseline, that triggers.
+            max_new_chatter_ratio: New-chatter share of messages that triggers.
+            max_burstiness: Variance-to-mean ratio of per-second counts that
+                triggers.
+            release: Pressure below which a channel counts as calm again.
+            hold: Seconds a channel must stay calm, and the minimum time
+                Shield Mode stays on, before it is turned off.
+            warmup: Seconds of history needed before a channel can trigger.
+            baseline_seconds: Time constant of the baseline rate.
+            min_baseline: Floor for the baseline rate, for quiet channels.
+            is_new_chatter: ``(broadcaster_id, user_id) -> bool``, e.g. an
+                account-age check. Defaults to "first message seen in this
+                channel", since chat events carry no account age.
+            max_chatters: Chatters remembered per channel by the default
+                new-chatter check. Past this the oldest half is forgotten,
+                so long-gone chatters count as new again.
+            budget: Shared rate budget for Shield Mode calls.
+            concurrency: Maximum simultaneous Shield Mode calls.
+            on_error: Called with ``(broadcaster_id, active, error)`` when
+                :meth:`run` fails to toggle Shield Mode.
+            clock: Monotonic time source.
+        """
+        self.client = client
+        self.moderator_id = moderator_id
+        self.window = window
+        self.min_rate = min_rate
+        self.surge_factor = surge_factor
+        self.max_new_chatter_ratio = max_new_chatter_ratio
+        self.max_burstiness = max_burstiness
+        self.release = release
+        self.hold = hold
+        self.warmup = warmup
+        self.min_baseline = min_baseline
+        self.is_new_chatter = is_new_chatter
+        self.max_chatters = max_chatters
+        self.budget = budget
+        self.concurrency = concurrency
+        self.on_error = on_error
+        self._alpha = 1 / baseline_seconds
+        self._clock = clock
+        self._channels: dict[str, _ChannelWindow] = {}
+        self._listeners: list[ShieldModeListener] = []
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def __contains__(self, broadcaster_id: str) -> bool:
+        return broadcaster_id in self._channels
+
+    def is_active(self, broadcaster_id: str) -> bool:
+        """Whether Shield Mode is known to be on in a channel."""
+        channel = self._channels.get(broadcaster_id)
+        return channel is not None and channel.active
+
+    def add_listener(self, listener: ShieldModeListener) -> None:
+        """Call ``listener(broadcaster_id, active, snapshot)`` on every toggle."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: ShieldModeListener) -> None:
+        """Stop calling a listener."""
+        self._listeners.remove(listener)
+
+    def forget(self, broadcaster_id: str) -> None:
+        """Stop tracking a channel."""
+        self._channels.pop(broadcaster_id, None)
+
+    # Ingestion
+
+    def _channel(self, broadcaster_id: str, second: int) -> _ChannelWindow:
+        channel = self._channels.get(broadcaster_id)
+        if channel is None:
+            channel = self._channels[broadcaster_id] = _ChannelWindow(self.window, second)
+        else:
+            channel.advance(second, self._alpha, learn=not channel.active)
+        return channel
+
+    def observe(self, broadcaster_id: str, user_id: str, now: float | None = None) -> None:
+        """Record one chat message."""
+        now = self._clock() if now is None else now
+        channel = self._channel(broadcaster_id, int(now))
+        if self.is_new_chatter is not None:
+            new = self.is_new_chatter(broadcaster_id, user_id)
+        else:
+            seen = channel.seen
+            if seen is None:
+                seen = channel.seen = IdSet()
+            # Two generations bound memory while keeping recent chatters known
+            new = seen.add(user_id) and (
+                channel.seen_before is None or user_id not in channel.seen_before
+            )
+            if len(seen) * 2 >= self.max_chatters:
+                channel.seen_before, channel.seen = seen, IdSet()
+        channel.record(new)
+
+    def handle_event(self, payload: dict) -> bool:
+        """Apply a chat message or Shield Mode begin/end notification.
+
+        Returns:
+            True if the payload was one of those events.
+        """
+        kind = event_type(payload)
+        event = event_data(payload)
+        broadcaster_id = event.get("broadcaster_user_id")
+        if kind == "channel.chat.message":
+            if broadcaster_id and event.get("chatter_user_id"):
+                self.observe(broadcaster_id, event["chatter_user_id"])
+            return True
+        if kind in ("channel.shield_mode.begin", "channel.shield_mode.end"):
+            if broadcaster_id:
+                self._set_active(
+                    broadcaster_id,
+                    kind == "channel.shield_mode.begin",
+                    owned=event.get("moderator_user_id") == self.moderator_id,
+                )
+            return True
+        return False
+
+    # Features
+
+    def snapshot(self, broadcaster_id: str, now: float | None = None) -> ChatRateSnapshot | None:
+        """Current features of a channel, or None if it is not tracked."""
+        channel = self._channels.get(broadcaster_id)
+        if channel is None:
+            return None
+        now = self._clock() if now is None else now
+        channel.advance(int(now), self._alpha, learn=not channel.active)
+        return self._snapshot(channel)
+
+    def _snapshot(self, channel: _ChannelWindow) -> ChatRateSnapshot:
+        size = self.window
+        rate = channel.total / size
+        variance = channel.total_sq / size - rate * rate
+        burstiness = variance / rate if rate > 0 else 0.0
+        new_ratio = channel.new_total / channel.total if channel.total else 0.0
+
+        if channel.observed < self.warmup:
+            pressure = 0.0
+        else:
+            baseline = max(channel.baseline, self.min_baseline)
+            pressure = min(
+                rate / self.min_rate,
+                max(
+                    rate / (self.surge_factor * baseline),
+                    new_ratio / self.max_new_chatter_ratio,
+                    burstiness / self.max_burstiness,
+                ),
+            )
+        return ChatRateSnapshot(rate, channel.baseline, burstiness, new_ratio, pressure, channel.active)
+
+    def evaluate(self, now: float | None = None) -> list[tuple[str, bool]]:
+        """Decide which channels should change Shield Mode state.
+
+        Returns:
+            ``(broadcaster_id, activate)`` pairs for channels to toggle.
+        """
+        now = self._clock() if now is None else now
+        second = int(now)
+        changes = []
+        for broadcaster_id, channel in self._channels.items():
+            if channel.pending:
+                continue
+            channel.advance(second, self._alpha, learn=not channel.active)
+            pressure = self._snapshot(channel).pressure
+            if not channel.active:
+                if pressure >= 1:
+                    changes.append((broadcaster_id, True))
+                continue
+            if not channel.owned:
+                continue
+            if pressure >= self.release:
+                channel.calm_since = None
+                continue
+            if channel.calm_since is None:
+                channel.calm_since = now
+            if now - channel.calm_since >= self.hold and now - channel.changed_at >= self.hold:
+                changes.append((broadcaster_id, False))
+        return changes
+
+    # Shield Mode
+
+    def _set_active(self, broadcaster_id: str, active: bool, owned: bool) -> None:
+        channel = self._channel(broadcaster_id, int(self._clock()))
+        if channel.active == active:
+            return
+        channel.active = active
+        channel.owned = active and owned
+        channel.changed_at = self._clock()
+        channel.calm_since = None
+        snapshot = self._snapshot(channel)
+        for listener in list(self._listeners):
+            listener(broadcaster_id, active, snapshot)
+
+    async def set_shield_mode(self, broadcaster_id: str, active: bool) -> None:
+        """Turn Shield Mode on or off in a channel."""
+        channel = self._channel(broadcaster_id, int(self._clock()))
+        channel.pending = True
+        try:
+            params = UpdateShieldModeStatusRequest(
+                broadcaster_id=broadcaster_id,
+                moderator_id=self.moderator_id,
+                is_active=active,
+            )
+            await call_with_retry(
+                lambda: moderation.update_shield_mode_status(self.client, params),
+                budget=self.budget,
+            )
+        finally:
+            channel.pending = False
+        self._set_active(broadcaster_id, active, owned=True)
+
+    async def sync(self, broadcaster_ids: Iterable[str]) -> dict[str, Exception]:
+        """Seed channels' Shield Mode state with Get Shield Mode Status.
+
+        Returns:
+            Errors keyed by broadcaster id for channels that failed to load.
+        """
+        broadcaster_ids = list(dict.fromkeys(broadcaster_ids))
+
+        async def fetch(broadcaster_id: str) -> None:
+            params = GetShieldModeStatusRequest(
+                broadcaster_id=broadcaster_id, moderator_id=self.moderator_id
+            )
+            response = await call_with_retry(
+                lambda: moderation.get_shield_mode_status(self.client, params),
+                budget=self.budget,
+            )
+            if response.data:
+                status = response.data[0]
+                self._set_active(
+                    broadcaster_id,
+                    status.is_active,
+                    owned=status.moderator_id == self.moderator_id,
+                )
+
+        results = await gather_limited(
+            (fetch(broadcaster_id) for broadcaster_id in broadcaster_ids),
+            self.concurrency,
+            return_exceptions=True,
+        )
+        return {
+            broadcaster_id: result
+            for broadcaster_id, result in zip(broadcaster_ids, results)
+            if isinstance(result, Exception)
+        }
+
+    async def act(self, now: float | None = None) -> dict[str, Exception]:
+        """Evaluate every channel once and toggle Shield Mode where needed.
+
+        Returns:
+            Errors keyed by broadcaster id for toggles that failed. Those
+            channels are evaluated again on the next call.
+        """
+        changes = self.evaluate(now)
+        results = await gather_limited(
+            (self.set_shield_mode(broadcaster_id, active) for broadcaster_id, active in changes),
+            self.concurrency,
+            return_exceptions=True,
+        )
+        errors = {}
+        for (broadcaster_id, active), result in zip(changes, results):
+            if isinstance(result, Exception):
+                errors[broadcaster_id] = result
+                if self.on_error is not None:
+                    self.on_error(broadcaster_id, active, result)
+        return errors
+
+    async def run(self, interval: float = 1.0) -> None:
+        """Call :meth:`act` every ``interval`` seconds, forever."""
+        while True:
+            await self.act()
+            await asyncio.sleep(interval)
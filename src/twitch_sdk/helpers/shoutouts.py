@@ -0,0 +1,405 @@
+"""Cooldown-aware scheduling of shoutouts and announcements."""
+
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable
+
+from twitch_client import TwitchRateLimitError
+
+from twitch_sdk.endpoints import chat
+from twitch_sdk.schemas.chat import SendAnnouncementRequest, ShoutoutRequest
+
+from ._events import event_data, event_type, parse_timestamp
+from ._timers import TimerWheel
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+
+class _Pending:
+    """A queued shoutout or announcement."""
+
+    __slots__ = ("key", "params", "future", "held")
+
+    def __init__(self, key: tuple, params, future: asyncio.Future):
+        self.key = key
+        self.params = params
+        self.future = future
+        # (cooldown before, cooldown set, target cooldown before, target cooldown set)
+        # while a send is in flight, so a failed send can give the cooldowns back
+        self.held: tuple | None = None
+
+
+class _Channel:
+    """Per-broadcaster queues and cooldown state."""
+
+    __slots__ = (
+        "shoutouts", "announcements", "shoutout_ready", "announcement_ready", "targets", "sending",
+    )
+
+    def __init__(self):
+        self.shoutouts: deque[_Pending] = deque()
+        self.announcements: deque[_Pending] = deque()
+        self.shoutout_ready = 0.0
+        self.announcement_ready = 0.0
+        self.targets: dict[str, float] = {}  # to_broadcaster_id -> ready time
+        self.sending = 0  # Sends in flight, which may still give cooldowns back
+
+    def sent(self, task: asyncio.Task) -> None:
+        """Done callback of a send task."""
+        self.sending -= 1
+
+    def idle(self, now: float) -> bool:
+        """Whether the channel holds no state worth keeping."""
+        return (
+            not self.shoutouts
+            and not self.announcements
+            and not self.targets
+            and not self.sending
+            and self.shoutout_ready <= now
+            and self.announcement_ready <= now
+        )
+
+
+class ShoutoutScheduler:
+    """Queue shoutouts and announcements and send each at its earliest legal time.
+
+    Twitch allows a broadcaster one shoutout every 2 minutes and one
+    shoutout to the same target every 60 minutes. The scheduler tracks both
+    cooldowns per broadcaster, drops duplicate pending requests, and drives
+    every channel from a single timer wheel in :meth:`run` rather than one
+    sleeping task per channel.
+    """
+
+    SHOUTOUT_COOLDOWN = 120.0
+    SHOUTOUT_TARGET_COOLDOWN = 3600.0
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        moderator_id: str | None = None,
+        announcement_cooldown: float = 1.0,
+        tick: float = 0.25,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            moderator_id: Default moderator sending shoutouts and announcements.
+            announcement_cooldown: Minimum seconds between announcements in a channel.
+            tick: Timer wheel resolution in seconds.
+            clock: Monotonic time source.
+        """
+        self.client = client
+        self.moderator_id = moderator_id
+        self.announcement_cooldown = announcement_cooldown
+        self._clock = clock
+        self._wheel = TimerWheel(tick=tick, start=clock())
+        self._channels: dict[str, _Channel] = {}
+        self._pending: dict[tuple, _Pending] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+
+    @property
+    def pending(self) -> int:
+        """Number of queued shoutouts and announcements."""
+        return len(self._pending)
+
+    def _channel(self, broadcaster_id: str) -> _Channel:
+        channel = self._channels.get(broadcaster_id)
+        if channel is None:
+            channel = self._channels[broadcaster_id] = _Channel()
+        return channel
+
+    def _moderator(self, moderator_id: str | None) -> str:
+        moderator_id = moderator_id or self.moderator_id
+        if not moderator_id:
+            raise ValueError("moderator_id is required")
+        return moderator_id
+
+    # Queueing
+
+    def shoutout(
+        self,
+        from_broadcaster_id: str,
+        to_broadcaster_id: str,
+        moderator_id: str | None = None,
+    ) -> asyncio.Future:
+        """Queue a shoutout.
+
+        Returns:
+            Future resolved once the shoutout is sent. A shoutout already
+            pending for the same pair returns the existing future.
+        """
+        key = ("shoutout", from_broadcaster_id, to_broadcaster_id)
+        existing = self._pending.get(key)
+        if existing is not None:
+            return existing.future
+
+        params = ShoutoutRequest(
+            from_broadcaster_id=from_broadcaster_id,
+            to_broadcaster_id=to_broadcaster_id,
+            moderator_id=self._moderator(moderator_id),
+        )
+        item = _Pending(key, params, asyncio.get_running_loop().create_future())
+        self._pending[key] = item
+        self._channel(from_broadcaster_id).shoutouts.append(item)
+        self._reschedule(from_broadcaster_id)
+        return item.future
+
+    def announce(
+        self,
+        broadcaster_id: str,
+        message: str,
+        color: str | None = None,
+        moderator_id: str | None = None,
+    ) -> asyncio.Future:
+        """Queue an announcement.
+
+        Returns:
+            Future resolved once the announcement is sent. An identical
+            pending announcement returns the existing future.
+        """
+        key = ("announcement", broadcaster_id, message, color)
+        existing = self._pending.get(key)
+        if existing is not None:
+            return existing.future
+
+        params = SendAnnouncementRequest(
+            broadcaster_id=broadcaster_id,
+            moderator_id=self._moderator(moderator_id),
+            message=message,
+            color=color,
+        )
+        item = _Pending(key, params, asyncio.get_running_loop().create_future())
+        self._pending[key] = item
+        self._channel(broadcaster_id).announcements.append(item)
+        self._reschedule(broadcaster_id)
+        return item.future
+
+    def cancel(self, broadcaster_id: str) -> int:
+        """Cancel everything queued for a broadcaster. Returns the number cancelled."""
+        channel = self._channels.get(broadcaster_id)
+        if channel is None:
+            return 0
+        items = list(channel.shoutouts) + list(channel.announcements)
+        channel.shoutouts.clear()
+        channel.announcements.clear()
+        for item in items:
+            self._pending.pop(item.key, None)
+            item.future.cancel()
+        self._wheel.cancel(broadcaster_id)
+        return len(items)
+
+    # Cooldowns
+
+    def next_shoutout_time(self, from_broadcaster_id: str, to_broadcaster_id: str) -> float:
+        """Earliest time (on the scheduler's clock) a shoutout to a target is legal."""
+        channel = self._channels.get(from_broadcaster_id)
+        if channel is None:
+            return self._clock()
+        return max(
+            self._clock(),
+            channel.shoutout_ready,
+            channel.targets.get(to_broadcaster_id, 0.0),
+        )
+
+    def record_shoutout(
+        self,
+        from_broadcaster_id: str,
+        to_broadcaster_id: str,
+        cooldown_ends_in: float | None = None,
+        target_cooldown_ends_in: float | None = None,
+    ) -> None:
+        """Record a shoutout sent outside the scheduler.
+
+        Args:
+            from_broadcaster_id: Broadcaster that gave the shoutout.
+            to_broadcaster_id: Broadcaster that received it.
+            cooldown_ends_in: Seconds until the broadcaster's cooldown ends.
+            target_cooldown_ends_in: Seconds until the target cooldown ends.
+        """
+        now = self._clock()
+        channel = self._channel(from_broadcaster_id)
+        if cooldown_ends_in is None:
+            cooldown_ends_in = self.SHOUTOUT_COOLDOWN
+        if target_cooldown_ends_in is None:
+            target_cooldown_ends_in = self.SHOUTOUT_TARGET_COOLDOWN
+        channel.shoutout_ready = max(channel.shoutout_ready, now + cooldown_ends_in)
+        channel.targets[to_broadcaster_id] = max(
+            channel.targets.get(to_broadcaster_id, 0.0), now + target_cooldown_ends_in
+        )
+        self._prune_targets(channel, now)
+        self._reschedule(from_broadcaster_id)
+
+    def handle_event(self, payload: dict) -> bool:
+        """Apply a ``channel.shoutout.create`` EventSub notification.
+
+        Returns:
+            True if the payload was a shoutout event.
+        """
+        if event_type(payload) != "channel.shoutout.create":
+            return False
+        event = event_data(payload)
+        now = datetime.now(timezone.utc)
+        self.record_shoutout(
+            event["broadcaster_user_id"],
+            event["to_broadcaster_user_id"],
+            cooldown_ends_in=_seconds_until(event.get("cooldown_ends_at"), now),
+            target_cooldown_ends_in=_seconds_until(event.get("target_cooldown_ends_at"), now),
+        )
+        return True
+
+    def _prune_targets(self, channel: _Channel, now: float) -> None:
+        expired = [target for target, ready in channel.targets.items() if ready <= now]
+        for target in expired:
+            del channel.targets[target]
+
+    # Scheduling
+
+    def _next_due(self, channel: _Channel) -> float | None:
+        times = []
+        if channel.announcements:
+            times.append(channel.announcement_ready)
+        if channel.shoutouts:
+            earliest_target = min(
+                channel.targets.get(item.params.to_broadcaster_id, 0.0)
+                for item in channel.shoutouts
+            )
+            times.append(max(channel.shoutout_ready, earliest_target))
+        return min(times) if times else None
+
+    def _reschedule(self, broadcaster_id: str) -> None:
+        channel = self._channels.get(broadcaster_id)
+        due = self._next_due(channel) if channel else None
+        if due is None:
+            self._wheel.cancel(broadcaster_id)
+            return
+        self._wheel.schedule(broadcaster_id, due)
+        if due <= self._clock():
+            self._wakeup.set()
+
+    def _service(self, broadcaster_id: str, now: float) -> None:
+        channel = self._channels.get(broadcaster_id)
+        if channel is None:
+            return
+
+        if channel.announcements and channel.announcement_ready <= now:
+            item = channel.announcements.popleft()
+            ready = now + self.announcement_cooldown
+            item.held = (channel.announcement_ready, ready, None, None)
+            channel.announcement_ready = ready
+            self._send(broadcaster_id, item, chat.send_chat_announcement)
+
+        if channel.shoutouts and channel.shoutout_ready <= now:
+            for item in channel.shoutouts:
+                target = item.params.to_broadcaster_id
+                if channel.targets.get(target, 0.0) <= now:
+                    channel.shoutouts.remove(item)
+                    # Hold both cooldowns while the send is in flight; they
+                    # are given back if it fails (see _release)
+                    ready = now + self.SHOUTOUT_COOLDOWN
+                    target_ready = now + self.SHOUTOUT_TARGET_COOLDOWN
+                    item.held = (channel.shoutout_ready, ready, channel.targets.get(target), target_ready)
+                    channel.shoutout_ready = ready
+                    channel.targets[target] = target_ready
+                    self._send(broadcaster_id, item, chat.send_shoutout)
+                    break
+
+        if not channel.shoutouts and not channel.announcements:
+            self._prune_targets(channel, now)
+            if channel.idle(now):
+                del self._channels[broadcaster_id]
+                return
+        self._reschedule(broadcaster_id)
+
+    def _send(self, broadcaster_id: str, item: _Pending, endpoint) -> None:
+        channel = self._channels[broadcaster_id]
+        channel.sending += 1
+        task = asyncio.ensure_future(self._deliver(broadcaster_id, item, endpoint))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        task.add_done_callback(channel.sent)
+
+    def _release(self, channel: _Channel, item: _Pending) -> None:
+        """Give back the cooldowns held for a send that did not go through.
+
+        A cooldown moved since (e.g. by a shoutout event) is left alone.
+        """
+        held, item.held = item.held, None
+        if held is None:
+            return
+        before, ready, target_before, target_ready = held
+        if item.key[0] == "announcement":
+            if channel.announcement_ready == ready:
+                channel.announcement_ready = before
+            return
+        if channel.shoutout_ready == ready:
+            channel.shoutout_ready = before
+        target = item.params.to_broadcaster_id
+        if channel.targets.get(target) == target_ready:
+            if target_before is None:
+                del channel.targets[target]
+            else:
+                channel.targets[target] = target_before
+
+    async def _deliver(self, broadcaster_id: str, item: _Pending, endpoint) -> None:
+        try:
+            await endpoint(self.client, item.params)
+        except TwitchRateLimitError as exc:
+            # Out of rate budget: put the item back and retry once it resets
+            delay = max(1.0, exc.retry_after - time.time()) if exc.retry_after else 1.0
+            channel = self._channel(broadcaster_id)
+            self._release(channel, item)
+            retry_at = self._clock() + delay
+            if item.key[0] == "shoutout":
+                channel.shoutouts.appendleft(item)
+                channel.shoutout_ready = max(channel.shoutout_ready, retry_at)
+            else:
+                channel.announcements.appendleft(item)
+                channel.announcement_ready = max(channel.announcement_ready, retry_at)
+            self._reschedule(broadcaster_id)
+            return
+        except Exception as exc:
+            self._release(self._channels[broadcaster_id], item)
+            self._reschedule(broadcaster_id)
+            self._pending.pop(item.key, None)
+            if not item.future.done():
+                item.future.set_exception(exc)
+            return
+        item.held = None
+        self._pending.pop(item.key, None)
+        if not item.future.done():
+            item.future.set_result(None)
+
+    def process(self) -> int:
+        """Send every queued item whose cooldown has expired.
+
+        Returns:
+            Number of channels serviced.
+        """
+        now = self._clock()
+        due = self._wheel.advance(now)
+        for broadcaster_id in due:
+            self._service(broadcaster_id, now)
+        return len(due)
+
+    async def run(self) -> None:
+        """Send queued items as their cooldowns expire, forever."""
+        while True:
+            self._wakeup.clear()
+            self.process()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._wheel.tick)
+            except asyncio.TimeoutError:
+                pass
+
+
+def _seconds_until(value: str | None, now: datetime) -> float | None:
+    """Seconds from ``now`` until an RFC3339 timestamp, or None if absent."""
+    if not value:
+        return None
+    return max(0.0, (parse_timestamp(value) - now).total_seconds())
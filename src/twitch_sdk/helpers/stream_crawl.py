@@ -0,0 +1,230 @@
+"""Partitioned parallel crawl of every live stream."""
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, NamedTuple
+
+from twitch_sdk.endpoints import games, streams
+from twitch_sdk.schemas.games import GetTopGamesRequest
+from twitch_sdk.schemas.streams import GetStreamsRequest, Stream
+
+from ._batching import MAX_IDS_PER_REQUEST, chunked
+from ._pagination import MAX_PAGE_SIZE, next_cursor
+from ._ratelimit import RateBudget, call_with_retry
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+# Broadcaster languages Twitch lets streams be tagged with
+LANGUAGES = (
+    "en", "es", "ja", "pt", "ru", "de", "fr", "ko", "zh", "it", "pl", "tr",
+    "ar", "th", "zh-hk", "cs", "sv", "nl", "uk", "hu", "fi", "id", "vi", "el",
+    "da", "no", "ro", "bg", "sk", "hi", "ms", "tl", "ca", "asl", "other",
+)
+
+
+class Partition(NamedTuple):
+    """A slice of the live-stream space with its own pagination cursor."""
+
+    game_ids: tuple[str, ...] = ()
+    languages: tuple[str, ...] = ()
+
+    def request(self) -> GetStreamsRequest:
+        return GetStreamsRequest(
+            game_id=list(self.game_ids) or None,
+            language=list(self.languages) or None,
+            type="live",
+            first=MAX_PAGE_SIZE,
+        )
+
+
+class PartitionStats(NamedTuple):
+    """Result of crawling one partition."""
+
+    partition: Partition
+    pages: int
+    streams: int
+    duration: float
+    error: Exception | None = None
+
+
+class StreamSnapshot:
+    """Every live stream seen by one crawl, deduplicated by channel."""
+
+    def __init__(self):
+        self.streams: dict[str, Stream] = {}  # user_id -> stream
+        self.partitions: list[PartitionStats] = []
+        self.pages = 0
+        self.duplicates = 0
+        self.started_at = time.time()
+        self.finished_at: float | None = None
+
+    def __len__(self) -> int:
+        return len(self.streams)
+
+    @property
+    def duration(self) -> float:
+        """Wall-clock seconds the crawl took."""
+        end = self.finished_at if self.finished_at is not None else time.time()
+        return end - self.started_at
+
+    @property
+    def failed(self) -> list[PartitionStats]:
+        """Partitions that could not be crawled to the end."""
+        return [stats for stats in self.partitions if stats.error is not None]
+
+    @property
+    def slowest(self) -> PartitionStats | None:
+        """The partition that took longest, which bounds the crawl time."""
+        return max(self.partitions, key=lambda stats: stats.duration, default=None)
+
+    def add(self, stream: Stream) -> None:
+        previous = self.streams.get(stream.user_id)
+        if previous is not None:
+            self.duplicates += 1
+        self.streams[stream.user_id] = stream
+
+    def __repr__(self) -> str:
+        return (
+            f"StreamSnapshot(streams={len(self.streams)}, pages={self.pages}, "
+            f"partitions={len(self.partitions)}, duplicates={self.duplicates}, "
+            f"failed={len(self.failed)}, duration={self.duration:.1f}s)"
+        )
+
+
+class StreamCrawler:
+    """Crawl all live streams by following many Get Streams cursors at once.
+
+    A single unfiltered cursor over Get Streams is strictly serial. This
+    crawler instead reads Get Top Games and, as each page of categories
+    arrives, turns it into partitions that are crawled in parallel: the
+    biggest categories are split further by language, mid-sized ones get a
+    cursor each, and the long tail is grouped up to 100 categories per
+    cursor. Streams are deduplicated by channel, since a stream can change
+    category or shift between pages mid-crawl.
+
+    Streams in categories Get Top Games does not list are only found with
+    ``include_unlisted``, which adds a per-language sweep over all
+    categories at the cost of fetching listed streams a second time.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        budget: RateBudget | None = None,
+        concurrency: int = 50,
+        split_games: int = 10,
+        solo_games: int = 200,
+        max_games: int | None = None,
+        languages: tuple[str, ...] = LANGUAGES,
+        include_unlisted: bool = False,
+    ):
+        """Initialize the crawler.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            budget: Shared rate budget. Defaults to a fresh Helix budget.
+            concurrency: Cursors followed at once.
+            split_games: Top categories crawled as one cursor per language.
+            solo_games: Top categories (including split ones) crawled with a
+                cursor of their own; the rest are grouped.
+            max_games: Stop seeding after this many categories.
+            languages: Language codes used to split the largest categories
+                and for the unlisted sweep.
+            include_unlisted: Also sweep every language across all categories.
+        """
+        self.client = client
+        self.budget = budget or RateBudget()
+        self.concurrency = concurrency
+        self.split_games = split_games
+        self.solo_games = solo_games
+        self.max_games = max_games
+        self.languages = languages
+        self.include_unlisted = include_unlisted
+
+    def partitions_for(self, game_ids: list[str], rank: int) -> list[Partition]:
+        """Partition a page of categories starting at ``rank`` in the top list."""
+        partitions = []
+        grouped = []
+        for offset, game_id in enumerate(game_ids):
+            position = rank + offset
+            if position < self.split_games:
+                partitions.extend(Partition((game_id,), (language,)) for language in self.languages)
+            elif position < self.solo_games:
+                partitions.append(Partition((game_id,)))
+            else:
+                grouped.append(game_id)
+        partitions.extend(
+            Partition(tuple(group)) for group in chunked(grouped, MAX_IDS_PER_REQUEST)
+        )
+        return partitions
+
+    async def _seed(self, queue: asyncio.Queue) -> None:
+        """Feed partitions from Get Top Games as each page arrives."""
+        if self.include_unlisted:
+            for language in self.languages:
+                queue.put_nowait(Partition(languages=(language,)))
+
+        params = GetTopGamesRequest(first=MAX_PAGE_SIZE)
+        rank = 0
+        while self.max_games is None or rank < self.max_games:
+            response = await call_with_retry(
+                lambda: games.get_top_games(self.client, params), budget=self.budget
+            )
+            game_ids = [game.id for game in response.data]
+            if self.max_games is not None:
+                game_ids = game_ids[: self.max_games - rank]
+            for partition in self.partitions_for(game_ids, rank):
+                queue.put_nowait(partition)
+            rank += len(game_ids)
+            cursor = next_cursor(response)
+            if not cursor or not response.data:
+                break
+            params = params.model_copy(update={"after": cursor})
+
+    async def crawl_partition(self, partition: Partition, snapshot: StreamSnapshot) -> PartitionStats:
+        """Follow one partition's cursor to the end, adding to ``snapshot``."""
+        started = time.monotonic()
+        params = partition.request()
+        pages = found = 0
+        try:
+            while True:
+                response = await call_with_retry(
+                    lambda: streams.get_streams(self.client, params), budget=self.budget
+                )
+                pages += 1
+                snapshot.pages += 1
+                for stream in response.data:
+                    snapshot.add(stream)
+                found += len(response.data)
+                cursor = next_cursor(response)
+                if not cursor or not response.data:
+                    break
+                params = params.model_copy(update={"after": cursor})
+        except Exception as exc:
+            return PartitionStats(partition, pages, found, time.monotonic() - started, exc)
+        return PartitionStats(partition, pages, found, time.monotonic() - started)
+
+    async def crawl(self) -> StreamSnapshot:
+        """Take a snapshot of every live stream."""
+        snapshot = StreamSnapshot()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def worker() -> None:
+            while True:
+                partition = await queue.get()
+                if partition is None:
+                    return
+                snapshot.partitions.append(await self.crawl_partition(partition, snapshot))
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+        try:
+            await self._seed(queue)
+            for _ in workers:
+                queue.put_nowait(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        snapshot.finished_at = time.time()
+        return snapshot
@@ -0,0 +1,420 @@
+"""Subscriber snapshots per channel with diffing and tier aggregates."""
+
+import asyncio
+import json
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Iterable, Iterator, NamedTuple
+
+from twitch_sdk.endpoints import subscriptions
+from twitch_sdk.schemas.subscriptions import (
+    GetBroadcasterSubscriptionsRequest,
+    GetBroadcasterSubscriptionsResponse,
+)
+
+from ._batching import gather_limited
+from ._compact import IdSet
+from ._events import event_data, event_type
+from ._pagination import MAX_PAGE_SIZE, next_cursor
+from ._ratelimit import RateBudget, call_with_retry
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+NEW = "new"
+LOST = "lost"
+CHANGED = "changed"
+
+TIERS = ("1000", "2000", "3000")
+
+# Sub points per tier, as counted by Twitch for the subscriber goal
+_TIER_POINTS = (0, 1, 2, 6)
+_TIER_CODES = {tier: code for code, tier in enumerate(TIERS, start=1)}
+_TIER_MASK = 0x3
+_GIFT = 0x4
+
+_SNAPSHOT_VERSION = 1
+
+
+def _pack(tier: str, is_gift: bool) -> int:
+    return _TIER_CODES.get(tier, 1) | (_GIFT if is_gift else 0)
+
+
+def _tier(flags: int) -> str:
+    return TIERS[(flags & _TIER_MASK) - 1]
+
+
+class SubscriberChange(NamedTuple):
+    """A subscriber gained, lost or changed between two snapshots."""
+
+    kind: str  # "new", "lost" or "changed"
+    user_id: str
+    tier: str | None  # None for lost subscribers
+    is_gift: bool | None
+    old_tier: str | None  # None for new subscribers
+    old_is_gift: bool | None
+
+
+SubscriberListener = Callable[[str, list[SubscriberChange]], None]
+
+
+class SubscriberSet:
+    """A channel's subscribers as sorted numeric ids with packed tier/gift flags.
+
+    Costs 9 bytes per subscriber. Tier counts, gifted count and points are
+    maintained on every add and remove, so reading them never scans.
+    """
+
+    __slots__ = ("_ids", "_flags", "tier_counts", "gifted")
+
+    def __init__(self):
+        self._ids = array("Q")
+        self._flags = array("B")
+        self.tier_counts = [0, 0, 0, 0]  # Indexed by tier code; slot 0 unused
+        self.gifted = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, user_id: str) -> bool:
+        return self._index(int(user_id)) >= 0
+
+    def __iter__(self) -> Iterator[tuple[str, str, bool]]:
+        """Yield ``(user_id, tier, is_gift)`` in id order."""
+        for key, flags in zip(self._ids, self._flags):
+            yield str(key), _tier(flags), bool(flags & _GIFT)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the arrays."""
+        return self._ids.itemsize * len(self._ids) + len(self._flags)
+
+    @property
+    def points(self) -> int:
+        """Sub points: 1 per tier 1, 2 per tier 2 and 6 per tier 3 subscriber."""
+        return sum(count * points for count, points in zip(self.tier_counts, _TIER_POINTS))
+
+    @property
+    def gift_ratio(self) -> float:
+        """Share of subscribers whose sub was gifted."""
+        return self.gifted / len(self._ids) if self._ids else 0.0
+
+    def counts(self) -> dict[str, int]:
+        """Subscribers per tier."""
+        return {tier: self.tier_counts[code] for tier, code in _TIER_CODES.items()}
+
+    def get(self, user_id: str) -> tuple[str, bool] | None:
+        """Get a subscriber's ``(tier, is_gift)``."""
+        index = self._index(int(user_id))
+        if index < 0:
+            return None
+        flags = self._flags[index]
+        return _tier(flags), bool(flags & _GIFT)
+
+    def _index(self, key: int) -> int:
+        index = bisect_left(self._ids, key)
+        if index < len(self._ids) and self._ids[index] == key:
+            return index
+        return -1
+
+    def _count(self, flags: int, sign: int) -> None:
+        self.tier_counts[flags & _TIER_MASK] += sign
+        if flags & _GIFT:
+            self.gifted += sign
+
+    def set(self, user_id: str, tier: str, is_gift: bool) -> int | None:
+        """Add or update a subscriber. Returns the previous flags, if any."""
+        key, flags = int(user_id), _pack(tier, is_gift)
+        index = bisect_left(self._ids, key)
+        if index < len(self._ids) and self._ids[index] == key:
+            old = self._flags[index]
+            self._count(old, -1)
+            self._flags[index] = flags
+        else:
+            old = None
+            self._ids.insert(index, key)
+            self._flags.insert(index, flags)
+        self._count(flags, 1)
+        return old
+
+    def remove(self, user_id: str) -> int | None:
+        """Remove a subscriber. Returns its flags, if it was present."""
+        index = self._index(int(user_id))
+        if index < 0:
+            return None
+        flags = self._flags[index]
+        del self._ids[index]
+        del self._flags[index]
+        self._count(flags, -1)
+        return flags
+
+    @classmethod
+    def _from_unsorted(cls, ids: array, flags: array) -> "SubscriberSet":
+        subscribers = cls()
+        order = sorted(range(len(ids)), key=ids.__getitem__)
+        subscribers._ids = array("Q", (ids[i] for i in order))
+        subscribers._flags = array("B", (flags[i] for i in order))
+        for value in subscribers._flags:
+            subscribers._count(value, 1)
+        return subscribers
+
+
+class SubscriberCrawl:
+    """Outcome of crawling one channel."""
+
+    __slots__ = ("broadcaster_id", "initial", "pages", "total", "points", "changes", "duration")
+
+    def __init__(self, broadcaster_id: str):
+        self.broadcaster_id = broadcaster_id
+        self.initial = False  # No previous snapshot: every subscriber is "new"
+        self.pages = 0
+        self.total = 0  # As reported by Helix
+        self.points = 0  # As reported by Helix
+        self.changes: list[SubscriberChange] = []
+        self.duration = 0.0
+
+    def count(self, kind: str) -> int:
+        """Number of changes of one kind."""
+        return sum(1 for change in self.changes if change.kind == kind)
+
+    def __repr__(self) -> str:
+        return (
+            f"SubscriberCrawl(broadcaster_id={self.broadcaster_id!r}, pages={self.pages}, "
+            f"total={self.total}, new={self.count(NEW)}, lost={self.count(LOST)}, "
+            f"changed={self.count(CHANGED)}, duration={self.duration:.1f}s)"
+        )
+
+
+class SubscriberTracker:
+    """Crawl channels' subscribers and report what changed since the last crawl.
+
+    Each channel is held as a :class:`SubscriberSet`. A crawl builds the
+    new set page by page, comparing every subscriber against the previous
+    snapshot as it arrives, and swaps the sets only once the last page was
+    read, so a failed crawl leaves the previous snapshot intact and reports
+    nothing. While a page is diffed, the request for the next one is
+    already in flight. Concurrent crawls of one channel share a single
+    crawl. ``channel.subscribe`` and ``channel.subscription.end`` events
+    keep the sets and their aggregates current between crawls.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        budget: RateBudget | None = None,
+        concurrency: int = 5,
+        on_change: SubscriberListener | None = None,
+    ):
+        """Initialize the tracker.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            budget: Shared rate budget. Defaults to a fresh Helix budget.
+            concurrency: Channels crawled at once by :meth:`crawl_many`.
+            on_change: Called with ``(broadcaster_id, changes)`` once per
+                completed crawl and for every event that changed something.
+        """
+        self.client = client
+        self.budget = budget or RateBudget()
+        self.concurrency = concurrency
+        self.on_change = on_change
+        self._channels: dict[str, SubscriberSet] = {}
+        self._syncing: dict[str, list[dict]] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def __contains__(self, broadcaster_id: str) -> bool:
+        return broadcaster_id in self._channels
+
+    def get(self, broadcaster_id: str) -> SubscriberSet | None:
+        """Get a channel's current subscriber set."""
+        return self._channels.get(broadcaster_id)
+
+    def _emit(self, broadcaster_id: str, changes: list[SubscriberChange]) -> None:
+        if changes and self.on_change is not None:
+            self.on_change(broadcaster_id, changes)
+
+    # Crawling
+
+    async def _pages(
+        self, broadcaster_id: str
+    ) -> AsyncIterator[GetBroadcasterSubscriptionsResponse]:
+        """Yield every page, requesting the next one before yielding the current one."""
+        params = GetBroadcasterSubscriptionsRequest(
+            broadcaster_id=broadcaster_id, first=MAX_PAGE_SIZE
+        )
+
+        def fetch(params: GetBroadcasterSubscriptionsRequest) -> asyncio.Task:
+            return asyncio.ensure_future(call_with_retry(
+                lambda: subscriptions.get_broadcaster_subscriptions(self.client, params),
+                budget=self.budget,
+            ))
+
+        task = fetch(params)
+        try:
+            while task is not None:
+                response = await task
+                cursor = next_cursor(response)
+                task = None
+                if cursor and response.data:
+                    task = fetch(params.model_copy(update={"after": cursor}))
+                    await asyncio.sleep(0)  # Let the request go out before the page is processed
+                yield response
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def crawl(self, broadcaster_id: str) -> SubscriberCrawl:
+        """Crawl one channel and diff it against its previous snapshot.
+
+        A crawl of the channel already running is joined rather than
+        started again.
+        """
+        task = self._inflight.get(broadcaster_id)
+        if task is None:
+            task = asyncio.ensure_future(self._crawl(broadcaster_id))
+            self._inflight[broadcaster_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(broadcaster_id, None))
+        return await asyncio.shield(task)
+
+    async def _crawl(self, broadcaster_id: str) -> SubscriberCrawl:
+        started = time.monotonic()
+        result = SubscriberCrawl(broadcaster_id)
+        old = self._channels.get(broadcaster_id)
+        result.initial = old is None
+        seen = bytearray(len(old)) if old is not None else None
+        crawled = IdSet()
+        ids, flags = array("Q"), array("B")
+        self._syncing[broadcaster_id] = []
+        try:
+            async for page in self._pages(broadcaster_id):
+                if result.pages == 0:
+                    result.total, result.points = page.total, page.points
+                result.pages += 1
+                for sub in page.data:
+                    if not crawled.add(sub.user_id):
+                        continue  # Shifted onto a later page while crawling
+                    key, value = int(sub.user_id), _pack(sub.tier, sub.is_gift)
+                    ids.append(key)
+                    flags.append(value)
+                    index = old._index(key) if old is not None else -1
+                    if index < 0:
+                        result.changes.append(SubscriberChange(
+                            NEW, sub.user_id, sub.tier, sub.is_gift, None, None,
+                        ))
+                        continue
+                    seen[index] = 1
+                    previous = old._flags[index]
+                    if previous != value:
+                        result.changes.append(SubscriberChange(
+                            CHANGED, sub.user_id, sub.tier, sub.is_gift,
+                            _tier(previous), bool(previous & _GIFT),
+                        ))
+        except BaseException:
+            self._syncing.pop(broadcaster_id, None)
+            raise
+
+        if old is not None:
+            result.changes.extend(
+                SubscriberChange(LOST, str(old._ids[index]), None, None,
+                                 _tier(old._flags[index]), bool(old._flags[index] & _GIFT))
+                for index in range(len(old)) if not seen[index]
+            )
+        # Report only once the new snapshot is in place
+        self._channels[broadcaster_id] = SubscriberSet._from_unsorted(ids, flags)
+        self._emit(broadcaster_id, result.changes)
+        held = [self._apply(payload) for payload in self._syncing.pop(broadcaster_id)]
+        self._emit(broadcaster_id, [change for change in held if change is not None])
+        result.duration = time.monotonic() - started
+        return result
+
+    async def crawl_many(
+        self, broadcaster_ids: Iterable[str]
+    ) -> dict[str, SubscriberCrawl | Exception]:
+        """Crawl many channels with bounded concurrency.
+
+        Returns:
+            Each channel's :class:`SubscriberCrawl`, or the error it failed with.
+        """
+        broadcaster_ids = list(dict.fromkeys(broadcaster_ids))
+        results = await gather_limited(
+            (self.crawl(broadcaster_id) for broadcaster_id in broadcaster_ids),
+            self.concurrency,
+            return_exceptions=True,
+        )
+        return dict(zip(broadcaster_ids, results))
+
+    def forget(self, broadcaster_id: str) -> None:
+        """Drop a channel's snapshot."""
+        self._channels.pop(broadcaster_id, None)
+
+    # Events
+
+    def handle_event(self, payload: dict) -> bool:
+        """Apply a ``channel.subscribe`` or ``channel.subscription.end`` notification.
+
+        Events for channels that were never crawled are ignored; events
+        arriving during a crawl are held back and applied to its result.
+
+        Returns:
+            True if the payload was a subscription event.
+        """
+        if event_type(payload) not in ("channel.subscribe", "channel.subscription.end"):
+            return False
+        broadcaster_id = event_data(payload).get("broadcaster_user_id")
+        pending = self._syncing.get(broadcaster_id)
+        if pending is not None:
+            pending.append(payload)  # The crawl is diffing against the current set
+            return True
+        change = self._apply(payload)
+        if change is not None:
+            self._emit(broadcaster_id, [change])
+        return True
+
+    def _apply(self, payload: dict) -> SubscriberChange | None:
+        event = event_data(payload)
+        subscribers = self._channels.get(event.get("broadcaster_user_id"))
+        if subscribers is None:
+            return None
+        user_id = event["user_id"]
+        tier, is_gift = event.get("tier", "1000"), event.get("is_gift", False)
+        if event_type(payload) == "channel.subscribe":
+            old = subscribers.set(user_id, tier, is_gift)
+            if old is None:
+                return SubscriberChange(NEW, user_id, tier, is_gift, None, None)
+            if old != _pack(tier, is_gift):
+                return SubscriberChange(
+                    CHANGED, user_id, tier, is_gift, _tier(old), bool(old & _GIFT)
+                )
+            return None
+        old = subscribers.remove(user_id)
+        if old is None:
+            return None
+        return SubscriberChange(LOST, user_id, None, None, _tier(old), bool(old & _GIFT))
+
+    # Persistence
+
+    def save(self, path: str | Path) -> None:
+        """Write every channel's snapshot to a JSON file."""
+        snapshot = {
+            "version": _SNAPSHOT_VERSION,
+            "channels": {
+                broadcaster_id: [subscribers._ids.tolist(), subscribers._flags.tolist()]
+                for broadcaster_id, subscribers in self._channels.items()
+            },
+        }
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(snapshot, separators=(",", ":")))
+        tmp.replace(path)
+
+    def restore(self, path: str | Path) -> None:
+        """Replace the snapshots with the contents of a file written by :meth:`save`."""
+        snapshot = json.loads(Path(path).read_text())
+        if snapshot.get("version") != _SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported subscriber snapshot version: {snapshot.get('version')}")
+        self._channels = {
+            broadcaster_id: SubscriberSet._from_unsorted(array("Q", ids), array("B", flags))
+            for broadcaster_id, (ids, flags) in snapshot["channels"].items()
+        }
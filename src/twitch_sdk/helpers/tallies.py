@@ -0,0 +1,454 @@
+"""Live poll and prediction tallies kept current by EventSub."""
+
+import asyncio
+import time
+from array import array
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple
+
+from twitch_sdk.endpoints import polls, predictions
+from twitch_sdk.schemas.polls import GetPollsRequest, Poll
+from twitch_sdk.schemas.predictions import GetPredictionsRequest, Prediction
+
+from ._batching import chunked, gather_limited
+from ._events import event_data, event_type
+from ._ratelimit import RateBudget, call_with_retry
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+POLL = "poll"
+PREDICTION = "prediction"
+
+# Statuses after which a tally no longer changes
+_FINAL = {"COMPLETED", "TERMINATED", "ARCHIVED", "MODERATED", "INVALID", "RESOLVED", "CANCELED"}
+
+# Ids accepted per Get Polls / Get Predictions call
+_MAX_POLL_IDS = 20
+_MAX_PREDICTION_IDS = 25
+
+
+class Predictor(NamedTuple):
+    """One of an outcome's top predictors."""
+
+    user_id: str
+    user_login: str
+    channel_points_used: int
+    channel_points_won: int | None
+
+
+class Tally:
+    """Live counts of one poll or prediction.
+
+    Counts live in fixed-length arrays updated in place; the count
+    attributes are read-only ``memoryview``s of them, so reading a tally
+    copies nothing and a view obtained once always shows current values.
+    ``version`` increases with every change, so an overlay can skip
+    redrawing an unchanged tally.
+    """
+
+    __slots__ = (
+        "kind", "id", "broadcaster_id", "title", "status", "choice_ids", "titles",
+        "winning_choice_id", "top_predictors", "version", "updated_at",
+        "_index", "_columns", "_views",
+    )
+
+    def __init__(
+        self,
+        kind: str,
+        contest_id: str,
+        broadcaster_id: str,
+        title: str,
+        choices: list[tuple[str, str]],
+    ):
+        if kind == POLL:
+            columns = ("votes", "channel_points_votes", "bits_votes")
+        else:
+            columns = ("users", "channel_points")
+        self.kind = kind
+        self.id = contest_id
+        self.broadcaster_id = broadcaster_id
+        self.title = title
+        self.status = "ACTIVE"
+        self.choice_ids = tuple(choice_id for choice_id, _ in choices)
+        self.titles = tuple(title for _, title in choices)
+        self.winning_choice_id: str | None = None  # Predictions only
+        self.top_predictors: list[tuple[Predictor, ...]] = [() for _ in choices]  # Predictions only
+        self.version = 0
+        self.updated_at = time.monotonic()  # Last event or poll that touched this tally
+        self._index = {choice_id: index for index, choice_id in enumerate(self.choice_ids)}
+        self._columns = {name: array("q", bytes(8 * len(choices))) for name in columns}
+        self._views = {
+            name: memoryview(values).toreadonly() for name, values in self._columns.items()
+        }
+
+    def counts(self, column: str) -> memoryview:
+        """Read-only view of one count column, indexed like :attr:`choice_ids`."""
+        return self._views[column]
+
+    # Poll columns
+
+    @property
+    def votes(self) -> memoryview:
+        return self._views["votes"]
+
+    @property
+    def channel_points_votes(self) -> memoryview:
+        return self._views["channel_points_votes"]
+
+    @property
+    def bits_votes(self) -> memoryview:
+        return self._views["bits_votes"]
+
+    # Prediction columns
+
+    @property
+    def users(self) -> memoryview:
+        return self._views["users"]
+
+    @property
+    def channel_points(self) -> memoryview:
+        return self._views["channel_points"]
+
+    def __repr__(self) -> str:
+        counts = ", ".join(f"{name}={values.tolist()}" for name, values in self._columns.items())
+        return (
+            f"Tally({self.kind} {self.id!r}, status={self.status}, {counts}, "
+            f"version={self.version})"
+        )
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """Names of the count columns."""
+        return tuple(self._columns)
+
+    @property
+    def is_final(self) -> bool:
+        """Whether the poll or prediction is over."""
+        return self.status in _FINAL
+
+    @property
+    def total(self) -> int:
+        """Total votes (polls) or predictors (predictions)."""
+        return sum(self._columns["votes" if self.kind == POLL else "users"])
+
+    def leader(self) -> str | None:
+        """Id of the choice or outcome with the most votes or points."""
+        values = self._columns["votes" if self.kind == POLL else "channel_points"]
+        if not values:
+            return None
+        return self.choice_ids[max(range(len(values)), key=values.__getitem__)]
+
+    def _set(
+        self,
+        choice_id: str | None,
+        counts: dict,
+        predictors: tuple[Predictor, ...] | None,
+    ) -> bool:
+        """Write one choice's counts. False if the choice is unknown."""
+        index = self._index.get(choice_id)
+        if index is None:
+            return False
+        changed = False
+        for name, values in self._columns.items():
+            value = counts.get(name)
+            if value is not None and values[index] != value:
+                values[index] = value
+                changed = True
+        if predictors is not None and self.top_predictors[index] != predictors:
+            self.top_predictors[index] = predictors
+            changed = True
+        return changed
+
+
+TallyListener = Callable[[Tally], None]
+
+
+def _predictors(items: list | None) -> tuple[Predictor, ...] | None:
+    if items is None:
+        return None
+    return tuple(
+        Predictor(
+            item.get("user_id", ""),
+            item.get("user_login", ""),
+            item.get("channel_points_used") or 0,
+            item.get("channel_points_won"),
+        )
+        for item in items
+    )
+
+
+class TallyAggregator:
+    """Hundreds of live polls and predictions, tallied in place from EventSub.
+
+    Feed ``channel.poll.*`` and ``channel.prediction.*`` notifications to
+    :meth:`handle_event`: begin and progress events carry every choice,
+    so a contest is tracked from whichever arrives first and later events
+    only overwrite its counters. :meth:`seed` loads contests already
+    running with one GET per broadcaster. :meth:`run` polls Helix only for
+    active contests that have had no event for ``stale_after`` seconds; a
+    locked prediction only changes when it ends, so it waits
+    ``locked_stale_after`` instead.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        budget: RateBudget | None = None,
+        stale_after: float = 15.0,
+        locked_stale_after: float = 300.0,
+        check_interval: float = 5.0,
+        keep_finished: float = 300.0,
+        concurrency: int = 10,
+        on_update: TallyListener | None = None,
+    ):
+        """Initialize the aggregator.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            budget: Shared rate budget. Defaults to a fresh Helix budget.
+            stale_after: Seconds without events before a contest is polled.
+            locked_stale_after: Seconds without events before a locked
+                prediction is polled.
+            check_interval: Seconds between staleness checks in :meth:`run`.
+            keep_finished: Seconds a finished contest stays readable.
+            concurrency: Maximum simultaneous fallback calls.
+            on_update: Called with a tally after every change.
+        """
+        self.client = client
+        self.budget = budget or RateBudget()
+        self.stale_after = stale_after
+        self.locked_stale_after = locked_stale_after
+        self.check_interval = check_interval
+        self.keep_finished = keep_finished
+        self.concurrency = concurrency
+        self.on_update = on_update
+        self.polled = 0  # Fallback calls made
+        self._tallies: dict[str, Tally] = {}
+
+    def __len__(self) -> int:
+        return len(self._tallies)
+
+    def __contains__(self, contest_id: str) -> bool:
+        return contest_id in self._tallies
+
+    def get(self, contest_id: str) -> Tally | None:
+        """Get a poll's or prediction's tally by id."""
+        return self._tallies.get(contest_id)
+
+    def active(self, broadcaster_id: str | None = None) -> list[Tally]:
+        """Tallies of contests still running, optionally for one broadcaster."""
+        return [
+            tally for tally in self._tallies.values()
+            if not tally.is_final
+            and (broadcaster_id is None or tally.broadcaster_id == broadcaster_id)
+        ]
+
+    # Applying state
+
+    def _apply(
+        self,
+        kind: str,
+        contest_id: str,
+        broadcaster_id: str,
+        title: str,
+        status: str | None,
+        choices: list[tuple[str | None, str, dict, tuple[Predictor, ...] | None]],
+        winning_choice_id: str | None = None,
+    ) -> Tally:
+        tally = self._tallies.get(contest_id)
+        if tally is not None and tally.is_final and status not in _FINAL:
+            return tally  # Late progress after the end
+        if tally is None or any(choice_id not in tally._index for choice_id, _, _, _ in choices):
+            titles = [(choice_id, choice_title) for choice_id, choice_title, _, _ in choices]
+            tally = Tally(kind, contest_id, broadcaster_id, title, titles)
+            self._tallies[contest_id] = tally
+            changed = True
+        else:
+            changed = False
+        for choice_id, _, counts, predictors in choices:
+            changed = tally._set(choice_id, counts, predictors) or changed
+        if status is not None and status != tally.status:
+            tally.status = status
+            changed = True
+        if winning_choice_id is not None and winning_choice_id != tally.winning_choice_id:
+            tally.winning_choice_id = winning_choice_id
+            changed = True
+        tally.updated_at = time.monotonic()
+        if changed:
+            tally.version += 1
+            if self.on_update is not None:
+                self.on_update(tally)
+        return tally
+
+    def apply_poll(self, poll: Poll) -> Tally:
+        """Apply a poll from Get Polls."""
+        return self._apply(POLL, poll.id, poll.broadcaster_id, poll.title, poll.status, [
+            (choice.id, choice.title, {
+                "votes": choice.votes,
+                "channel_points_votes": choice.channel_points_votes,
+                "bits_votes": choice.bits_votes,
+            }, None)
+            for choice in poll.choices
+        ])
+
+    def apply_prediction(self, prediction: Prediction) -> Tally:
+        """Apply a prediction from Get Predictions."""
+        outcomes = [
+            (
+                outcome.id,
+                outcome.title,
+                {"users": outcome.users, "channel_points": outcome.channel_points},
+                _predictors([p.model_dump() for p in outcome.top_predictors or ()]),
+            )
+            for outcome in prediction.outcomes
+        ]
+        return self._apply(
+            PREDICTION,
+            prediction.id,
+            prediction.broadcaster_id,
+            prediction.title,
+            prediction.status,
+            outcomes,
+            prediction.winning_outcome_id,
+        )
+
+    def handle_event(self, payload: dict) -> bool:
+        """Apply a ``channel.poll.*`` or ``channel.prediction.*`` notification.
+
+        Returns:
+            True if the payload was a poll or prediction event.
+        """
+        kind = event_type(payload) or ""
+        if not kind.startswith(("channel.poll.", "channel.prediction.")):
+            return False
+        event = event_data(payload)
+        phase = kind.rsplit(".", 1)[1]
+        if phase in ("begin", "progress"):
+            status = "ACTIVE"
+        elif phase == "lock":
+            status = "LOCKED"
+        else:
+            status = (event.get("status") or "completed").upper()
+
+        contest_id, broadcaster_id = event["id"], event["broadcaster_user_id"]
+        title = event.get("title", "")
+        if kind.startswith("channel.poll."):
+            choices = [
+                (choice.get("id"), choice.get("title", ""), choice, None)
+                for choice in event.get("choices") or ()
+            ]
+            self._apply(POLL, contest_id, broadcaster_id, title, status, choices)
+        else:
+            outcomes = [
+                (
+                    outcome.get("id"),
+                    outcome.get("title", ""),
+                    outcome,
+                    _predictors(outcome.get("top_predictors")),
+                )
+                for outcome in event.get("outcomes") or ()
+            ]
+            self._apply(
+                PREDICTION, contest_id, broadcaster_id, title, status, outcomes,
+                event.get("winning_outcome_id"),
+            )
+        return True
+
+    # Seeding and fallback polling
+
+    async def seed(self, broadcaster_ids: Iterable[str]) -> dict[str, Exception]:
+        """Load each broadcaster's latest poll and prediction with one GET each.
+
+        Returns:
+            Errors keyed by broadcaster id for channels that failed to load.
+        """
+        broadcaster_ids = list(dict.fromkeys(broadcaster_ids))
+
+        async def seed_one(broadcaster_id: str) -> None:
+            poll_params = GetPollsRequest(broadcaster_id=broadcaster_id, first=1)
+            prediction_params = GetPredictionsRequest(broadcaster_id=broadcaster_id, first=1)
+            poll_response, prediction_response = await asyncio.gather(
+                call_with_retry(
+                    lambda: polls.get_polls(self.client, poll_params), budget=self.budget
+                ),
+                call_with_retry(
+                    lambda: predictions.get_predictions(self.client, prediction_params),
+                    budget=self.budget,
+                ),
+            )
+            for poll in poll_response.data:
+                self.apply_poll(poll)
+            for prediction in prediction_response.data:
+                self.apply_prediction(prediction)
+
+        results = await gather_limited(
+            (seed_one(broadcaster_id) for broadcaster_id in broadcaster_ids),
+            self.concurrency,
+            return_exceptions=True,
+        )
+        return {
+            broadcaster_id: result
+            for broadcaster_id, result in zip(broadcaster_ids, results)
+            if isinstance(result, Exception)
+        }
+
+    async def _poll(self, kind: str, broadcaster_id: str, contest_ids: list[str]) -> None:
+        self.polled += 1
+        if kind == POLL:
+            poll_params = GetPollsRequest(broadcaster_id=broadcaster_id, id=contest_ids)
+            response = await call_with_retry(
+                lambda: polls.get_polls(self.client, poll_params), budget=self.budget
+            )
+            for poll in response.data:
+                self.apply_poll(poll)
+        else:
+            prediction_params = GetPredictionsRequest(broadcaster_id=broadcaster_id, id=contest_ids)
+            response = await call_with_retry(
+                lambda: predictions.get_predictions(self.client, prediction_params),
+                budget=self.budget,
+            )
+            for prediction in response.data:
+                self.apply_prediction(prediction)
+
+    def _stale_after(self, tally: Tally) -> float:
+        # Locked predictions have no progress events, only the final one
+        return self.locked_stale_after if tally.status == "LOCKED" else self.stale_after
+
+    async def refresh_stale(self) -> dict[str, Exception]:
+        """Poll active contests without recent events and drop long-finished ones.
+
+        Returns:
+            Errors keyed by broadcaster id for fallback calls that failed.
+        """
+        now = time.monotonic()
+        stale: dict[tuple[str, str], list[str]] = {}
+        for contest_id, tally in list(self._tallies.items()):
+            if tally.is_final:
+                if now - tally.updated_at > self.keep_finished:
+                    del self._tallies[contest_id]
+            elif now - tally.updated_at > self._stale_after(tally):
+                stale.setdefault((tally.kind, tally.broadcaster_id), []).append(contest_id)
+
+        calls = [
+            (kind, broadcaster_id, batch)
+            for (kind, broadcaster_id), contest_ids in stale.items()
+            for batch in chunked(
+                contest_ids, _MAX_POLL_IDS if kind == POLL else _MAX_PREDICTION_IDS
+            )
+        ]
+        results = await gather_limited(
+            (self._poll(*call) for call in calls),
+            self.concurrency,
+            return_exceptions=True,
+        )
+        return {
+            broadcaster_id: result
+            for (_, broadcaster_id, _), result in zip(calls, results)
+            if isinstance(result, Exception)
+        }
+
+    async def run(self) -> None:
+        """Check for stale contests every ``check_interval`` seconds, forever."""
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.refresh_stale()  # Failed polls are retried next check
@@ -0,0 +1,257 @@
+"""Rule-based triage and bulk resolution of unban requests."""
+
+import asyncio
+import inspect
+import re
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable, NamedTuple
+
+from twitch_sdk.endpoints import moderation
+from twitch_sdk.schemas.moderation import (
+    GetUnbanRequestsRequest,
+    ResolveUnbanRequestRequest,
+    UnbanRequest,
+)
+
+from ._batching import gather_limited
+from ._pagination import iterate_items
+from ._ratelimit import RateBudget, call_with_retry
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+APPROVED = "approved"
+DENIED = "denied"
+
+
+class UnbanDecision(NamedTuple):
+    """Outcome chosen for an unban request."""
+
+    status: str  # "approved" or "denied"
+    resolution_text: str | None = None
+
+
+UnbanRule = Callable[[UnbanRequest], UnbanDecision | None | Awaitable[UnbanDecision | None]]
+
+
+def text_rule(
+    pattern: str,
+    status: str,
+    resolution_text: str | None = None,
+) -> UnbanRule:
+    """Decide requests whose text matches a regex (case-insensitive)."""
+    regex = re.compile(pattern, re.IGNORECASE)
+
+    def rule(request: UnbanRequest) -> UnbanDecision | None:
+        if regex.search(request.text):
+            return UnbanDecision(status, resolution_text)
+        return None
+
+    return rule
+
+
+def user_rule(
+    user_ids: Iterable[str],
+    status: str,
+    resolution_text: str | None = None,
+) -> UnbanRule:
+    """Decide requests from specific users (e.g. an allow or deny list)."""
+    user_ids = frozenset(user_ids)
+
+    def rule(request: UnbanRequest) -> UnbanDecision | None:
+        if request.user_id in user_ids:
+            return UnbanDecision(status, resolution_text)
+        return None
+
+    return rule
+
+
+class ChannelTriageStats:
+    """Per-channel triage counters."""
+
+    __slots__ = ("fetched", "approved", "denied", "undecided", "failed", "started_at", "finished_at")
+
+    def __init__(self):
+        self.fetched = 0
+        self.approved = 0
+        self.denied = 0
+        self.undecided = 0  # Left pending for a human moderator
+        self.failed = 0
+        self.started_at = time.monotonic()  # Reset when the channel's fetch begins
+        self.finished_at: float | None = None
+
+    @property
+    def resolved(self) -> int:
+        """Requests resolved by the pipeline."""
+        return self.approved + self.denied
+
+    @property
+    def throughput(self) -> float:
+        """Resolved requests per second."""
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        elapsed = end - self.started_at
+        return self.resolved / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"ChannelTriageStats(fetched={self.fetched}, approved={self.approved}, "
+            f"denied={self.denied}, undecided={self.undecided}, failed={self.failed}, "
+            f"throughput={self.throughput:.1f}/s)"
+        )
+
+
+class UnbanTriage:
+    """Stream pending unban requests, decide them by rules, resolve in bulk.
+
+    Rules are tried in order for each pending request; the first one that
+    returns an :class:`UnbanDecision` wins, and requests no rule decides are
+    left for human moderators. Each channel's pending list is fully read
+    before any of it is resolved, so resolutions cannot shift the pagination
+    cursor. Resolutions run concurrently under a shared :class:`RateBudget`.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        moderator_id: str,
+        rules: Iterable[UnbanRule] = (),
+        budget: RateBudget | None = None,
+        concurrency: int = 20,
+        fetch_concurrency: int = 5,
+        max_retries: int = 3,
+        dry_run: bool = False,
+    ):
+        """Initialize the pipeline.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            moderator_id: Moderator resolving the requests.
+            rules: Decision rules, tried in order. May be sync or async.
+            budget: Shared rate budget. Defaults to a fresh Helix budget.
+            concurrency: Maximum simultaneous Resolve Unban Request calls.
+            fetch_concurrency: Maximum channels read at once.
+            max_retries: Retries per resolution for transient failures.
+            dry_run: Decide and count without resolving anything.
+        """
+        self.client = client
+        self.moderator_id = moderator_id
+        self.rules: list[UnbanRule] = list(rules)
+        self.budget = budget or RateBudget()
+        self.concurrency = concurrency
+        self.fetch_concurrency = fetch_concurrency
+        self.max_retries = max_retries
+        self.dry_run = dry_run
+        self.decisions: list[tuple[UnbanRequest, UnbanDecision]] = []
+
+    def add_rule(self, rule: UnbanRule) -> None:
+        """Append a decision rule."""
+        self.rules.append(rule)
+
+    async def decide(self, request: UnbanRequest) -> UnbanDecision | None:
+        """Run the rules against one request."""
+        for rule in self.rules:
+            decision = rule(request)
+            if inspect.isawaitable(decision):
+                decision = await decision
+            if decision is not None:
+                return decision
+        return None
+
+    async def pending(self, broadcaster_id: str) -> list[UnbanRequest]:
+        """Read every pending unban request of a channel."""
+        params = GetUnbanRequestsRequest(
+            broadcaster_id=broadcaster_id,
+            moderator_id=self.moderator_id,
+            status="pending",
+        )
+        return [
+            request
+            async for request in iterate_items(
+                moderation.get_unban_requests, self.client, params, budget=self.budget
+            )
+        ]
+
+    async def run(self, broadcaster_ids: Iterable[str]) -> dict[str, ChannelTriageStats]:
+        """Triage every pending request in the given channels.
+
+        Returns:
+            Stats keyed by broadcaster id.
+        """
+        broadcaster_ids = list(dict.fromkeys(broadcaster_ids))
+        stats = {broadcaster_id: ChannelTriageStats() for broadcaster_id in broadcaster_ids}
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        outstanding = {broadcaster_id: 0 for broadcaster_id in broadcaster_ids}
+
+        def finish(broadcaster_id: str) -> None:
+            stats[broadcaster_id].finished_at = time.monotonic()
+
+        async def fetch(broadcaster_id: str) -> None:
+            channel = stats[broadcaster_id]
+            channel.started_at = time.monotonic()
+            try:
+                requests = await self.pending(broadcaster_id)
+            except Exception:
+                channel.failed += 1
+                finish(broadcaster_id)
+                return
+            channel.fetched = len(requests)
+            for request in requests:
+                try:
+                    decision = await self.decide(request)
+                except Exception:
+                    channel.failed += 1  # A broken rule fails only this request
+                    continue
+                if decision is None:
+                    channel.undecided += 1
+                    continue
+                outstanding[broadcaster_id] += 1
+                await queue.put((request, decision))
+            if not outstanding[broadcaster_id]:
+                finish(broadcaster_id)
+
+        async def resolve() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                request, decision = item
+                channel = stats[request.broadcaster_id]
+                try:
+                    if not self.dry_run:
+                        params = ResolveUnbanRequestRequest(
+                            broadcaster_id=request.broadcaster_id,
+                            moderator_id=self.moderator_id,
+                            unban_request_id=request.id,
+                            status=decision.status,
+                            resolution_text=decision.resolution_text,
+                        )
+                        await call_with_retry(
+                            lambda: moderation.resolve_unban_request(self.client, params),
+                            budget=self.budget,
+                            max_retries=self.max_retries,
+                        )
+                except Exception:
+                    channel.failed += 1
+                else:
+                    self.decisions.append((request, decision))
+                    if decision.status == APPROVED:
+                        channel.approved += 1
+                    else:
+                        channel.denied += 1
+                outstanding[request.broadcaster_id] -= 1
+                if not outstanding[request.broadcaster_id]:
+                    finish(request.broadcaster_id)
+
+        workers = [asyncio.ensure_future(resolve()) for _ in range(self.concurrency)]
+        try:
+            await gather_limited(
+                (fetch(broadcaster_id) for broadcaster_id in broadcaster_ids),
+                self.fetch_concurrency,
+            )
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        return stats
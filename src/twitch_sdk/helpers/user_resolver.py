@@ -0,0 +1,300 @@
+"""Persistent login <-> id resolution backed by memory and SQLite."""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from twitch_sdk.endpoints import users
+from twitch_sdk.schemas.users import GetUsersRequest, User
+
+from ._batching import BatchLoader
+from ._cache import TTLCache
+from ._events import event_data, event_type
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+RenameListener = Callable[[str, str, str], None]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    login TEXT,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_login ON users (login);
+"""
+
+
+class _UserStore:
+    """SQLite table of users keyed by id, with an index on login."""
+
+    def __init__(self, path: str | Path):
+        self._db = sqlite3.connect(str(path))
+        self._db.executescript(_SCHEMA)
+        self._db.execute("PRAGMA journal_mode=WAL")
+
+    def by_id(self, user_id: str) -> tuple[User, float] | None:
+        row = self._db.execute(
+            "SELECT data, fetched_at FROM users WHERE id = ?", (user_id,)
+        ).fetchone()
+        return (User.model_validate_json(row[0]), row[1]) if row else None
+
+    def by_login(self, login: str) -> tuple[User, float] | None:
+        row = self._db.execute(
+            "SELECT data, fetched_at FROM users WHERE login = ?", (login,)
+        ).fetchone()
+        return (User.model_validate_json(row[0]), row[1]) if row else None
+
+    def login_of(self, user_id: str) -> str | None:
+        row = self._db.execute("SELECT login FROM users WHERE id = ?", (user_id,)).fetchone()
+        return row[0] if row else None
+
+    def put_many(self, found: list[User], fetched_at: float) -> None:
+        with self._db:
+            for user in found:
+                # A login can be taken over by another account after a rename
+                self._db.execute(
+                    "UPDATE users SET login = NULL WHERE login = ? AND id != ?",
+                    (user.login, user.id),
+                )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO users (id, login, data, fetched_at) VALUES (?, ?, ?, ?)",
+                [(user.id, user.login, user.model_dump_json(), fetched_at) for user in found],
+            )
+
+    def expire(self, user_id: str) -> None:
+        # Keep the row so a later fetch can still detect a rename
+        with self._db:
+            self._db.execute("UPDATE users SET fetched_at = 0 WHERE id = ?", (user_id,))
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class UserResolver:
+    """Resolve logins to ids and ids to users, remembering across restarts.
+
+    Lookups check an in-memory LRU, then an optional SQLite file, and only
+    then Get Users; concurrent misses are coalesced into calls of up to 100
+    ids or logins. Entries expire after ``ttl`` seconds. When a fetched
+    user's login differs from the stored one, the old login is dropped and
+    rename listeners are called; ``user.update`` notifications are applied
+    the same way.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        path: str | Path | None = None,
+        ttl: float = 86400.0,
+        missing_ttl: float = 300.0,
+        max_entries: int | None = 100_000,
+        batch_delay: float = 0.01,
+    ):
+        """Initialize the resolver.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            path: SQLite file to persist users in. None keeps them in memory.
+            ttl: Seconds a fetched user stays valid, in memory and on disk.
+            missing_ttl: Seconds an unknown id or login is remembered as such.
+            max_entries: Maximum users held in memory.
+            batch_delay: Seconds to wait for more lookups before sending a batch.
+        """
+        self.client = client
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self._store = _UserStore(path) if path is not None else None
+        self._users: TTLCache[str, User | None] = TTLCache(ttl, max_entries)
+        self._ids: TTLCache[str, str | None] = TTLCache(ttl, max_entries)  # login -> id
+        self._by_id: BatchLoader[str, User] = BatchLoader(self._fetch_ids, delay=batch_delay)
+        self._by_login: BatchLoader[str, User] = BatchLoader(self._fetch_logins, delay=batch_delay)
+        self._listeners: list[RenameListener] = []
+
+    def add_rename_listener(self, listener: RenameListener) -> None:
+        """Call ``listener(user_id, old_login, new_login)`` on every detected rename."""
+        self._listeners.append(listener)
+
+    # Storage
+
+    def _remember(self, found: list[User]) -> None:
+        for user in found:
+            cached = self._users.get(user.id)
+            old_login = cached.login if cached is not None else None
+            if old_login is None and self._store is not None:
+                old_login = self._store.login_of(user.id)
+            if old_login and old_login != user.login:
+                if self._ids.get(old_login) == user.id:
+                    self._ids.pop(old_login)
+                for listener in list(self._listeners):
+                    listener(user.id, old_login, user.login)
+            self._users.set(user.id, user)
+            self._ids.set(user.login, user.id)
+        if self._store is not None and found:
+            self._store.put_many(found, time.time())
+
+    def _from_disk(self, row: tuple[User, float] | None) -> User | None:
+        """Promote a fresh on-disk entry into memory."""
+        if row is None:
+            return None
+        user, fetched_at = row
+        remaining = self.ttl - (time.time() - fetched_at)
+        if remaining <= 0:
+            return None
+        self._users.set(user.id, user, ttl=remaining)
+        self._ids.set(user.login, user.id, ttl=remaining)
+        return user
+
+    def peek(self, user_id: str) -> User | None:
+        """Get a user from memory or disk without any API call."""
+        user = self._users.get(user_id)
+        if user is None and self._store is not None:
+            user = self._from_disk(self._store.by_id(user_id))
+        return user
+
+    def peek_login(self, login: str) -> User | None:
+        """Get a user by login from memory or disk without any API call."""
+        login = login.lower()
+        user_id = self._ids.get(login)
+        if user_id is not None:
+            user = self.peek(user_id)
+            if user is not None and user.login == login:
+                return user
+        if self._store is not None:
+            return self._from_disk(self._store.by_login(login))
+        return None
+
+    # Fetching
+
+    async def _fetch_ids(self, user_ids: list[str]) -> dict[str, User]:
+        response = await users.get_users(self.client, GetUsersRequest(id=user_ids))
+        self._remember(response.data)
+        found = {user.id: user for user in response.data}
+        for user_id in user_ids:
+            if user_id not in found:
+                self._users.set(user_id, None, ttl=self.missing_ttl)
+        return found
+
+    async def _fetch_logins(self, logins: list[str]) -> dict[str, User]:
+        response = await users.get_users(self.client, GetUsersRequest(login=logins))
+        self._remember(response.data)
+        found = {user.login: user for user in response.data}
+        for login in logins:
+            if login not in found:
+                self._ids.set(login, None, ttl=self.missing_ttl)
+        return found
+
+    # Lookups
+
+    async def get_user(self, user_id: str) -> User | None:
+        """Get a user by id, or None if it does not exist."""
+        if user_id in self._users:
+            return self._users.get(user_id)
+        user = self.peek(user_id)
+        if user is not None:
+            return user
+        return await self._by_id.load(user_id)
+
+    async def get_users(self, user_ids: Iterable[str]) -> dict[str, User]:
+        """Get several users by id, omitting ones that do not exist."""
+        result: dict[str, User] = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            if user_id in self._users:
+                user = self._users.get(user_id)
+            else:
+                user = self.peek(user_id)
+                if user is None:
+                    missing.append(user_id)
+                    continue
+            if user is not None:
+                result[user_id] = user
+        if missing:
+            result.update(await self._by_id.load_many(missing))
+        return result
+
+    async def get_by_login(self, login: str) -> User | None:
+        """Get a user by login, or None if no account has it."""
+        login = login.lower()
+        if login in self._ids and self._ids.get(login) is None:
+            return None  # Recently confirmed missing
+        user = self.peek_login(login)
+        if user is not None:
+            return user
+        return await self._by_login.load(login)
+
+    async def get_by_logins(self, logins: Iterable[str]) -> dict[str, User]:
+        """Get several users by login, omitting logins no account has."""
+        result: dict[str, User] = {}
+        missing = []
+        for login in dict.fromkeys(login.lower() for login in logins):
+            if login in self._ids and self._ids.get(login) is None:
+                continue
+            user = self.peek_login(login)
+            if user is None:
+                missing.append(login)
+            else:
+                result[login] = user
+        if missing:
+            result.update(await self._by_login.load_many(missing))
+        return result
+
+    async def resolve_login(self, login: str) -> str | None:
+        """Turn a login into a user id."""
+        user = await self.get_by_login(login)
+        return user.id if user is not None else None
+
+    async def resolve_logins(self, logins: Iterable[str]) -> dict[str, str]:
+        """Turn several logins into user ids, keyed by lowercased login."""
+        found = await self.get_by_logins(logins)
+        return {login: user.id for login, user in found.items()}
+
+    async def login_of(self, user_id: str) -> str | None:
+        """Turn a user id into its current login."""
+        user = await self.get_user(user_id)
+        return user.login if user is not None else None
+
+    # Updates
+
+    def invalidate(self, user_id: str) -> None:
+        """Mark a user stale so the next lookup refetches it."""
+        user = self._users.pop(user_id)
+        if user is not None and self._ids.get(user.login) == user_id:
+            self._ids.pop(user.login)
+        if self._store is not None:
+            self._store.expire(user_id)
+
+    def handle_event(self, payload: dict) -> bool:
+        """Apply a ``user.update`` EventSub notification.
+
+        Returns:
+            True if the payload was a user update event.
+        """
+        if event_type(payload) != "user.update":
+            return False
+        event = event_data(payload)
+        user_id = event.get("user_id")
+        login = event.get("user_login")
+        if not user_id or not login:
+            return True
+        user = self.peek(user_id)
+        if user is None:
+            return True
+        update = {"login": login}
+        if event.get("user_name"):
+            update["display_name"] = event["user_name"]
+        if "description" in event:
+            update["description"] = event["description"]
+        self._remember([user.model_copy(update=update)])
+        return True
+
+    def close(self) -> None:
+        """Close the on-disk store."""
+        if self._store is not None:
+            self._store.close()
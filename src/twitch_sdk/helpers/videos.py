@@ -0,0 +1,272 @@
+"""Incremental mirroring of channels' video metadata."""
+
+import hashlib
+import inspect
+import json
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable, NamedTuple
+
+from twitch_client import TwitchAPIError
+
+from twitch_sdk.endpoints import videos
+from twitch_sdk.schemas.videos import GetVideosRequest, Video
+
+from ._batching import MAX_IDS_PER_REQUEST, chunked, gather_limited
+from ._pagination import MAX_PAGE_SIZE, next_cursor
+from ._ratelimit import RateBudget, call_with_retry
+
+if TYPE_CHECKING:
+    from twitch_client import TwitchHTTPClient
+
+ADDED = "added"
+UPDATED = "updated"
+DELETED = "deleted"
+
+_STATE_VERSION = 1
+
+
+class VideoDelta(NamedTuple):
+    """A change to a mirrored video."""
+
+    kind: str  # "added", "updated" or "deleted"
+    user_id: str
+    video_id: str
+    video: Video | None  # None for deletions
+
+
+VideoSink = Callable[[VideoDelta], None | Awaitable[None]]
+
+
+class JsonlVideoSink:
+    """Append deltas to a JSON lines file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a")
+
+    def __call__(self, delta: VideoDelta) -> None:
+        record = {"kind": delta.kind, "user_id": delta.user_id, "video_id": delta.video_id}
+        if delta.video is not None:
+            record["video"] = delta.video.model_dump(mode="json")
+        self._file.write(json.dumps(record))
+        self._file.write("\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class VideoSyncStats:
+    """Counters for one sync or verify run."""
+
+    __slots__ = ("channels", "pages", "added", "updated", "deleted", "errors", "started_at", "finished_at")
+
+    def __init__(self):
+        self.channels = 0
+        self.pages = 0
+        self.added = 0
+        self.updated = 0
+        self.deleted = 0
+        self.errors: dict[str, Exception] = {}
+        self.started_at = time.monotonic()
+        self.finished_at: float | None = None
+
+    @property
+    def duration(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    def __repr__(self) -> str:
+        return (
+            f"VideoSyncStats(channels={self.channels}, pages={self.pages}, "
+            f"added={self.added}, updated={self.updated}, deleted={self.deleted}, "
+            f"errors={len(self.errors)}, duration={self.duration:.1f}s)"
+        )
+
+
+class VideoSync:
+    """Keep a mirror of many channels' videos current with few requests.
+
+    :meth:`sync` pages each channel's videos newest first and stops at the
+    first video already known, so a nightly run costs about one request per
+    channel. :meth:`verify` re-reads known videos 100 ids at a time to
+    find deletions and metadata changes (titles, muted segments, ...)
+    that newest-first paging cannot see. Every change is passed to the
+    sink as a :class:`VideoDelta`. The known ids and a fingerprint of each
+    video are kept in memory and can be saved to and restored from a file.
+    """
+
+    def __init__(
+        self,
+        client: "TwitchHTTPClient",
+        sink: VideoSink,
+        budget: RateBudget | None = None,
+        concurrency: int = 20,
+        ignore_fields: Iterable[str] = ("view_count", "thumbnail_url"),
+    ):
+        """Initialize the sync engine.
+
+        Args:
+            client: TwitchHTTPClient for making API calls.
+            sink: Called with every delta. May be sync or async.
+            budget: Shared rate budget. Defaults to a fresh Helix budget.
+            concurrency: Channels, or id batches, fetched at once.
+            ignore_fields: Video fields whose changes are not reported.
+        """
+        self.client = client
+        self.sink = sink
+        self.budget = budget or RateBudget()
+        self.concurrency = concurrency
+        self.ignore_fields = set(ignore_fields)
+        self._known: dict[str, dict[str, int]] = {}  # user_id -> video_id -> fingerprint
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._known
+
+    def known_videos(self, user_id: str) -> list[str]:
+        """Ids of the mirrored videos of a channel."""
+        return list(self._known.get(user_id, ()))
+
+    def _fingerprint(self, video: Video) -> int:
+        data = video.model_dump_json(exclude=self.ignore_fields).encode()
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+    async def _emit(self, delta: VideoDelta) -> None:
+        result = self.sink(delta)
+        if inspect.isawaitable(result):
+            await result
+
+    # Newest-first sync
+
+    async def sync_channel(self, user_id: str, stats: VideoSyncStats | None = None) -> int:
+        """Fetch a channel's videos newer than the newest known one.
+
+        Returns:
+            Number of new videos.
+        """
+        stats = stats or VideoSyncStats()
+        known = self._known.get(user_id)
+        fresh: dict[str, int] = {}
+        params = GetVideosRequest(user_id=user_id, sort="time", type="all", first=MAX_PAGE_SIZE)
+        new = []
+        while True:
+            response = await call_with_retry(
+                lambda: videos.get_videos(self.client, params), budget=self.budget
+            )
+            stats.pages += 1
+            reached_known = False
+            for video in response.data:
+                if known is not None and video.id in known:
+                    reached_known = True
+                    break
+                new.append(video)
+            cursor = next_cursor(response)
+            if reached_known or not cursor or not response.data:
+                break
+            params = params.model_copy(update={"after": cursor})
+
+        # Record only after the whole channel was read, so a failed run retries it
+        for video in reversed(new):
+            fresh[video.id] = self._fingerprint(video)
+            stats.added += 1
+            await self._emit(VideoDelta(ADDED, user_id, video.id, video))
+        self._known.setdefault(user_id, {}).update(fresh)
+        return len(new)
+
+    async def sync(self, user_ids: Iterable[str]) -> VideoSyncStats:
+        """Sync many channels concurrently."""
+        user_ids = list(dict.fromkeys(user_ids))
+        stats = VideoSyncStats()
+        stats.channels = len(user_ids)
+        results = await gather_limited(
+            (self.sync_channel(user_id, stats) for user_id in user_ids),
+            self.concurrency,
+            return_exceptions=True,
+        )
+        stats.errors = {
+            user_id: result
+            for user_id, result in zip(user_ids, results)
+            if isinstance(result, Exception)
+        }
+        stats.finished_at = time.monotonic()
+        return stats
+
+    # Deletion and change checks
+
+    async def _verify_batch(self, batch: list[tuple[str, str]], stats: VideoSyncStats) -> None:
+        params = GetVideosRequest(id=[video_id for _, video_id in batch])
+        try:
+            response = await call_with_retry(
+                lambda: videos.get_videos(self.client, params), budget=self.budget
+            )
+            found = {video.id: video for video in response.data}
+        except TwitchAPIError as exc:
+            if exc.status_code != 404:
+                raise
+            found = {}  # None of the ids exist any more
+        stats.pages += 1
+
+        for user_id, video_id in batch:
+            known = self._known.get(user_id)
+            if known is None or video_id not in known:
+                continue
+            video = found.get(video_id)
+            if video is None:
+                del known[video_id]
+                stats.deleted += 1
+                await self._emit(VideoDelta(DELETED, user_id, video_id, None))
+                continue
+            fingerprint = self._fingerprint(video)
+            if fingerprint != known[video_id]:
+                known[video_id] = fingerprint
+                stats.updated += 1
+                await self._emit(VideoDelta(UPDATED, user_id, video_id, video))
+
+    async def verify(self, user_ids: Iterable[str] | None = None) -> VideoSyncStats:
+        """Re-read known videos by id to find deletions and changes.
+
+        Args:
+            user_ids: Channels to check. Defaults to every mirrored channel.
+        """
+        user_ids = list(self._known if user_ids is None else dict.fromkeys(user_ids))
+        stats = VideoSyncStats()
+        stats.channels = len(user_ids)
+        pairs = [
+            (user_id, video_id)
+            for user_id in user_ids
+            for video_id in self._known.get(user_id, ())
+        ]
+        batches = list(chunked(pairs, MAX_IDS_PER_REQUEST))
+        results = await gather_limited(
+            (self._verify_batch(batch, stats) for batch in batches),
+            self.concurrency,
+            return_exceptions=True,
+        )
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                for user_id, _ in batch:
+                    stats.errors.setdefault(user_id, result)
+        stats.finished_at = time.monotonic()
+        return stats
+
+    def forget(self, user_id: str) -> None:
+        """Stop mirroring a channel."""
+        self._known.pop(user_id, None)
+
+    # State
+
+    def save(self, path: str | Path) -> None:
+        """Write the known ids and fingerprints to a file."""
+        state = {"version": _STATE_VERSION, "known": self._known}
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(state, separators=(",", ":")))
+        tmp.replace(path)
+
+    def restore(self, path: str | Path) -> None:
+        """Replace the known ids and fingerprints with the contents of a file."""
+        state = json.loads(Path(path).read_text())
+        if state.get("version") != _STATE_VERSION:
+            raise ValueError(f"Unsupported video sync state version: {state.get('version')}")
+        self._known = state["known"]
@@ -1,9 +1,65 @@
 """Shared fixtures for Twitch SDK tests."""
 
+import asyncio
+
 import pytest
 from datetime import datetime
 
 
+class FakeHTTPClient:
+    """Stand-in for TwitchHTTPClient that serves canned responses.
+
+    Handlers are registered per (method, endpoint) and may be a response
+    dict or a callable taking (params, data) and returning one (or raising).
+    ``latency`` simulates the round trip of every call.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.routes: dict[tuple[str, str], object] = {}
+        self.calls: list[tuple[str, str, dict | None, dict | None]] = []
+        self.latency = latency
+
+    def route(self, method: str, endpoint: str, handler) -> None:
+        """Register a handler for an endpoint."""
+        self.routes[(method, endpoint)] = handler
+
+    def count(self, method: str, endpoint: str) -> int:
+        """Number of calls made to an endpoint."""
+        return sum(1 for m, e, _, _ in self.calls if (m, e) == (method, endpoint))
+
+    async def _request(self, method, endpoint, params=None, data=None):
+        self.calls.append((method, endpoint, params, data))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        handler = self.routes.get((method, endpoint))
+        if handler is None:
+            return {}
+        if callable(handler):
+            return handler(params or {}, data or {})
+        return handler
+
+    async def get(self, endpoint, params=None):
+        return await self._request("GET", endpoint, params)
+
+    async def post(self, endpoint, data=None, params=None):
+        return await self._request("POST", endpoint, params, data)
+
+    async def patch(self, endpoint, data=None, params=None):
+        return await self._request("PATCH", endpoint, params, data)
+
+    async def put(self, endpoint, data=None, params=None):
+        return await self._request("PUT", endpoint, params, data)
+
+    async def delete(self, endpoint, params=None):
+        return await self._request("DELETE", endpoint, params)
+
+
+@pytest.fixture
+def fake_client() -> FakeHTTPClient:
+    """Fake HTTP client with no routes registered."""
+    return FakeHTTPClient()
+
+
 @pytest.fixture
 def sample_user_id() -> str:
     """Sample Twitch user ID."""
@@ -0,0 +1,168 @@
+"""Tests for the analytics report downloader."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from twitch_sdk.helpers.analytics import AnalyticsReports, CsvStream
+from twitch_sdk.schemas.analytics import GameAnalytics
+
+REPORT = (
+    "Date,Game Name,Live Views,Notes\r\n"
+    '2024-01-01,Chess,120,"multi\r\nline, with ""quotes"""\r\n'
+    "2024-01-02,Chess,80.5,\r\n"
+)
+
+
+def _report(game_id: str = "g1", started_at: str = "2024-01-01T00:00:00Z", url: str = "https://s3/report.csv"):
+    return GameAnalytics.model_validate({
+        "game_id": game_id,
+        "URL": url,
+        "type": "overview_v2",
+        "date_range": {"started_at": started_at, "ended_at": "2024-01-08T00:00:00Z"},
+    })
+
+
+@pytest.fixture
+def served():
+    """Mock transport serving REPORT in small chunks, counting requests."""
+    requests = []
+
+    async def chunks():
+        data = REPORT.encode()
+        for start in range(0, len(data), 7):
+            yield data[start:start + 7]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        if "missing" in str(request.url):
+            return httpx.Response(404)
+        return httpx.Response(200, content=chunks())
+
+    return requests, httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture
+def flaky():
+    """Mock transport answering 503, then dropping the connection mid-report, then serving it."""
+    requests = []
+
+    async def chunks(fail: bool):
+        data = REPORT.encode()
+        for start in range(0, len(data), 7):
+            if fail and start >= 40:
+                raise httpx.ReadError("connection reset")
+            yield data[start:start + 7]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        if len(requests) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, content=chunks(fail=len(requests) == 2))
+
+    return requests, httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestCsvStream:
+    """Test incremental CSV parsing."""
+
+    def test_records_split_anywhere(self):
+        """Any chunking yields the same records as parsing the whole text."""
+        for size in (1, 2, 5, 13, len(REPORT)):
+            parser = CsvStream()
+            records = []
+            for start in range(0, len(REPORT), size):
+                records.extend(parser.feed(REPORT[start:start + size]))
+            records.extend(parser.close())
+            assert records[1][3] == 'multi\r\nline, with "quotes"'
+            assert len(records) == 3
+
+
+class TestAnalyticsReports:
+    """Test downloading, caching and parsing."""
+
+    async def test_rows_are_typed_and_cached(self, fake_client, served, tmp_path):
+        """Rows are converted; a second read with a new signed URL hits the cache."""
+        requests, http = served
+        reports = AnalyticsReports(fake_client, tmp_path, http=http)
+        rows = [row async for row in reports.rows(_report())]
+        assert [row["Live Views"] for row in rows] == [120, 80.5]
+        assert rows[1]["Notes"] is None
+        assert reports.is_cached(_report(url="https://s3/other-signature.csv"))
+
+        columns = await reports.columns(
+            _report(url="https://s3/other-signature.csv"), ["Date"], default=None
+        )
+        assert columns == {"Date": ["2024-01-01", "2024-01-02"]}
+        assert len(requests) == 1
+
+    async def test_download_many(self, fake_client, served, tmp_path):
+        """Reports download concurrently; shared keys download once and failures are reported."""
+        requests, http = served
+        reports = AnalyticsReports(fake_client, tmp_path, http=http)
+        batch = [
+            _report("g1"),
+            _report("g1"),
+            _report("g2"),
+            _report("g3", url="https://s3/missing.csv"),
+        ]
+        errors = await reports.download_many(batch)
+        assert list(errors) == ["https://s3/missing.csv"]
+        assert isinstance(errors["https://s3/missing.csv"], httpx.HTTPStatusError)
+        assert len(requests) == 3
+        assert not list(tmp_path.glob("*.part"))
+
+        assert await reports.download_many(batch[:3]) == {}
+        assert len(requests) == 3
+
+    async def test_game_reports_are_listed(self, fake_client, tmp_path):
+        """Reports are listed from Get Game Analytics."""
+        fake_client.route("GET", "/analytics/games", {
+            "data": [_report().model_dump(mode="json")],
+            "pagination": {},
+        })
+        async with AnalyticsReports(fake_client, tmp_path) as reports:
+            listed = await reports.game_reports()
+        assert [report.game_id for report in listed] == ["g1"]
+
+    async def test_transient_failures_are_retried(self, fake_client, flaky, tmp_path):
+        """5xx responses and dropped connections are retried without repeating rows."""
+        requests, http = flaky
+        reports = AnalyticsReports(fake_client, tmp_path, http=http, backoff=0)
+        rows = [row async for row in reports.rows(_report())]
+        assert [row["Live Views"] for row in rows] == [120, 80.5]
+        assert len(requests) == 3
+        assert reports.is_cached(_report())
+
+    async def test_download_retries_server_errors(self, fake_client, flaky, tmp_path):
+        """download() retries the same transient failures."""
+        requests, http = flaky
+        reports = AnalyticsReports(fake_client, tmp_path, http=http, backoff=0)
+        path = await reports.download(_report())
+        assert path.read_bytes() == REPORT.encode() and len(requests) == 3
+
+    async def test_slow_reader_holds_back_the_download(self, fake_client, tmp_path):
+        """The download runs only a bounded number of chunks ahead of the reader."""
+        served = []
+        lines = [f"2024-01-{day:02d},Chess,{day}\r\n" for day in range(1, 29)] * 10
+        body = ("Date,Game Name,Live Views\r\n" + "".join(lines)).encode()
+
+        async def chunks():
+            for start in range(0, len(body), 7):
+                served.append(start)
+                yield body[start:start + 7]
+
+        http = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, content=chunks())
+        ))
+        reports = AnalyticsReports(fake_client, tmp_path, http=http, chunk_size=7)
+        rows = reports.rows(_report())
+        assert (await rows.__anext__())["Live Views"] == 1
+        for _ in range(50):
+            await asyncio.sleep(0)
+        assert len(served) < 40 < len(body) // 7
+
+        remaining = [row async for row in rows]
+        assert len(remaining) == len(lines) - 1
+        assert reports.is_cached(_report())
@@ -0,0 +1,74 @@
+"""Tests for the held AutoMod message processor."""
+
+import asyncio
+
+from twitch_sdk.helpers.automod import ALLOW, DENY, AutoModQueue
+
+
+def _hold(message_id: str, text: str, broadcaster_id: str = "b1") -> dict:
+    return {
+        "subscription": {"type": "automod.message.hold"},
+        "event": {
+            "broadcaster_user_id": broadcaster_id,
+            "user_id": "42",
+            "user_login": "viewer",
+            "message_id": message_id,
+            "message": {"text": text, "fragments": []},
+            "category": "swearing",
+            "level": 2,
+            "held_at": "2024-01-01T00:00:00.123456789Z",
+        },
+    }
+
+
+async def _drain(queue: AutoModQueue) -> None:
+    task = asyncio.ensure_future(queue.run())
+    await queue.join()
+    task.cancel()
+
+
+class TestAutoModQueue:
+    """Test classification and resolution of held messages."""
+
+    async def test_first_decision_wins(self, fake_client):
+        """The first classifier to decide sets the action; undecided messages stay held."""
+        fake_client.route("POST", "/moderation/automod/message", {})
+        queue = AutoModQueue(fake_client, "mod", classifiers=[
+            lambda m: DENY if "spam" in m.text else None,
+            lambda m: "allow" if m.text == "hello" else None,
+        ])
+        queue.handle_event(_hold("m1", "buy spam"))
+        queue.handle_event(_hold("m2", "hello"))
+        queue.handle_event(_hold("m3", "something else"))
+        await _drain(queue)
+
+        actions = {data["msg_id"]: data["action"] for _, _, _, data in fake_client.calls}
+        assert actions == {"m1": DENY, "m2": ALLOW}
+        assert (queue.stats.denied, queue.stats.allowed, queue.stats.undecided) == (1, 1, 1)
+        assert queue.stats.latency.count == 2
+
+    async def test_resolved_elsewhere_is_skipped(self, fake_client):
+        """An update event for a queued message prevents acting on it."""
+        fake_client.route("POST", "/moderation/automod/message", {})
+        queue = AutoModQueue(fake_client, "mod", classifiers=[lambda m: DENY])
+        queue.handle_event(_hold("m1", "x"))
+        queue.handle_event({
+            "subscription": {"type": "automod.message.update"},
+            "event": {"message_id": "m1", "status": "approved"},
+        })
+        await _drain(queue)
+
+        assert queue.stats.skipped == 1
+        assert fake_client.count("POST", "/moderation/automod/message") == 0
+
+    async def test_classifier_error_and_full_queue(self, fake_client):
+        """Classifier errors count as failures and overflow is dropped."""
+        def broken(message):
+            raise RuntimeError("boom")
+
+        queue = AutoModQueue(fake_client, "mod", classifiers=[broken], max_pending=1)
+        queue.handle_event(_hold("m1", "x"))
+        queue.handle_event(_hold("m2", "y"))
+        await _drain(queue)
+
+        assert (queue.stats.received, queue.stats.dropped, queue.stats.failed) == (1, 1, 1)
@@ -0,0 +1,104 @@
+"""Tests for the banned-users mirror."""
+
+import random
+
+import pytest
+from twitch_sdk.helpers._compact import IdSet
+from twitch_sdk.helpers.bans import BannedUsersMirror
+
+
+def _banned(user_id: str, expires_at: str | None = None) -> dict:
+    return {
+        "user_id": user_id,
+        "user_login": f"u{user_id}",
+        "user_name": f"U{user_id}",
+        "expires_at": expires_at,
+        "created_at": "2024-01-01T00:00:00Z",
+        "reason": "",
+        "moderator_id": "mod",
+        "moderator_login": "mod",
+        "moderator_name": "Mod",
+    }
+
+
+def _event(kind: str, user_id: str, **extra) -> dict:
+    return {
+        "subscription": {"type": kind},
+        "event": {"broadcaster_user_id": "b1", "user_id": user_id, **extra},
+    }
+
+
+@pytest.fixture
+def bans_client(fake_client):
+    pages = {
+        None: {"data": [_banned("1"), _banned("2", "2999-01-01T00:00:00Z")], "pagination": {"cursor": "p2"}},
+        "p2": {"data": [_banned("3", "2000-01-01T00:00:00Z")], "pagination": {}},
+    }
+    fake_client.route("GET", "/moderation/banned", lambda p, d: pages[p.get("after")])
+    return fake_client
+
+
+class TestIdSet:
+    """Test the compact id set."""
+
+    def test_matches_builtin_set(self):
+        """Random adds and discards agree with a built-in set."""
+        rng = random.Random(1)
+        ids, reference = IdSet(), set()
+        for _ in range(20000):
+            user_id = str(rng.randrange(5000)) if rng.random() < 0.9 else f"x{rng.randrange(50)}"
+            if rng.random() < 0.6:
+                assert ids.add(user_id) == (user_id not in reference)
+                reference.add(user_id)
+            else:
+                assert ids.discard(user_id) == (user_id in reference)
+                reference.discard(user_id)
+        assert len(ids) == len(reference)
+        assert set(ids) == reference
+
+
+class TestBannedUsersMirror:
+    """Test crawling, events and timeout expiry."""
+
+    async def test_sync(self, bans_client):
+        """sync() loads every page."""
+        mirror = BannedUsersMirror(bans_client)
+        assert await mirror.sync("b1") == 3
+        assert mirror.is_banned("b1", "1")
+        assert mirror.is_timed_out("b1", "2")
+        assert not mirror.is_banned("b1", "3")  # Timeout already over
+        assert not mirror.is_banned("b2", "1")
+
+    async def test_expire(self, bans_client):
+        """expire() removes ended timeouts from the set."""
+        mirror = BannedUsersMirror(bans_client)
+        await mirror.sync("b1")
+        assert mirror.expire() == 1
+        assert mirror.banned_count("b1") == 2
+
+    async def test_ban_and_unban_events(self, bans_client):
+        """channel.ban and channel.unban events update membership."""
+        mirror = BannedUsersMirror(bans_client)
+        await mirror.sync("b1")
+        mirror.expire()
+        mirror.handle_event(_event("channel.ban", "9", is_permanent=True))
+        mirror.handle_event(_event("channel.unban", "1"))
+        mirror.handle_event(_event("channel.ban", "2", is_permanent=True))
+
+        assert mirror.is_banned("b1", "9")
+        assert not mirror.is_banned("b1", "1")
+        # A permanent ban replaces the earlier timeout
+        assert not mirror.is_timed_out("b1", "2")
+        assert mirror.expire(now=10**12) == 0
+        assert mirror.is_banned("b1", "2")
+
+    async def test_timeout_event(self, bans_client):
+        """Timeouts from events expire via the heap."""
+        mirror = BannedUsersMirror(bans_client)
+        await mirror.sync("b1")
+        mirror.handle_event(
+            _event("channel.ban", "7", is_permanent=False, ends_at="2999-01-01T00:00:00Z")
+        )
+        assert mirror.is_timed_out("b1", "7")
+        mirror.expire(now=10**12)
+        assert not mirror.is_banned("b1", "7")
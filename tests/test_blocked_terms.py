@@ -0,0 +1,111 @@
+"""Tests for the blocked-terms matcher."""
+
+import pytest
+from twitch_sdk.helpers.blocked_terms import BlockedTermsAutomaton, BlockedTermsIndex
+
+
+def _automaton(*terms: str) -> BlockedTermsAutomaton:
+    return BlockedTermsAutomaton((term, None) for term in terms)
+
+
+def _term(term_id: str, text: str) -> dict:
+    return {
+        "broadcaster_id": "b1",
+        "moderator_id": "mod",
+        "id": term_id,
+        "text": text,
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+
+class TestBlockedTermsAutomaton:
+    """Test term matching."""
+
+    def test_literal_terms_whole_words(self):
+        """Literal terms match case-insensitively on word boundaries."""
+        automaton = _automaton("bad", "very bad")
+        assert sorted(m.term for m in automaton.find("This is VERY bad")) == ["bad", "very bad"]
+        assert automaton.find("badger") == []
+
+    def test_overlapping_terms(self):
+        """Terms sharing suffixes are all found."""
+        automaton = _automaton("he", "she", "hers")
+        assert sorted(m.term for m in automaton.find("she hers he")) == ["he", "hers", "she"]
+
+    def test_wildcards(self):
+        """Wildcards match any non-space characters."""
+        automaton = _automaton("dog*", "*cat", "b*d word")
+        assert [m.term for m in automaton.find("doggo")] == ["dog*"]
+        assert [m.term for m in automaton.find("a bobcat")] == ["*cat"]
+        assert [m.term for m in automaton.find("so bird word")] == ["b*d word"]
+        assert automaton.find("hotdog") == []
+        assert automaton.find("catnip") == []
+        assert automaton.find("bird words") == []
+
+    def test_match_span(self):
+        """Matches report where they occur."""
+        automaton = _automaton("spam*")
+        match = automaton.find("no spamming")[0]
+        assert (match.start, match.end) == (3, 11)
+
+    def test_whitespace_runs_match_single_spaces(self):
+        """Tabs and repeated spaces in a message match a term's single space."""
+        automaton = _automaton("bad word", "b*d  thing")
+        message = "a BAD \t word and bird\n\nthing"
+        matches = automaton.find(message)
+        assert [m.term for m in matches] == ["bad word", "b*d thing"]
+        assert [message[m.start:m.end] for m in matches] == ["BAD \t word", "bird\n\nthing"]
+
+    def test_many_terms(self):
+        """Thousands of terms compile into one automaton."""
+        automaton = _automaton(*(f"term{i}" for i in range(5000)))
+        assert [m.term for m in automaton.find("x term4321 y")] == ["term4321"]
+
+
+class TestBlockedTermsIndex:
+    """Test syncing and updates."""
+
+    @pytest.fixture
+    def terms_client(self, fake_client):
+        pages = {
+            None: {"data": [_term("1", "alpha")], "pagination": {"cursor": "p2"}},
+            "p2": {"data": [_term("2", "beta*")], "pagination": {}},
+        }
+        fake_client.route("GET", "/moderation/blocked_terms", lambda p, d: pages[p.get("after")])
+        fake_client.route(
+            "POST", "/moderation/blocked_terms", lambda p, d: {"data": [_term("3", d["text"])]}
+        )
+        return fake_client
+
+    async def test_sync_all_pages(self, terms_client):
+        """sync() loads every page."""
+        index = BlockedTermsIndex(terms_client, "mod")
+        assert await index.sync("b1") == 2
+        assert index.is_blocked("b1", "betamax")
+        assert index.terms("b1") == {"alpha": "1", "beta*": "2"}
+
+    async def test_add_and_remove(self, terms_client):
+        """add_term/remove_term update the automaton."""
+        index = BlockedTermsIndex(terms_client, "mod")
+        await index.sync("b1")
+        await index.add_term("b1", "gamma")
+        assert index.is_blocked("b1", "Gamma ray")
+
+        await index.remove_term("b1", "1")
+        assert not index.is_blocked("b1", "alpha")
+
+    async def test_eventsub_updates(self, terms_client):
+        """automod.terms.update events add and remove blocked terms."""
+        index = BlockedTermsIndex(terms_client, "mod")
+        await index.sync("b1")
+        index.handle_event({
+            "subscription": {"type": "automod.terms.update"},
+            "event": {"broadcaster_user_id": "b1", "action": "add_blocked", "terms": ["delta"]},
+        })
+        index.handle_event({
+            "subscription": {"type": "automod.terms.update"},
+            "event": {"broadcaster_user_id": "b1", "action": "remove_blocked", "terms": ["alpha"]},
+        })
+        assert index.is_blocked("b1", "delta force")
+        assert not index.is_blocked("b1", "alpha")
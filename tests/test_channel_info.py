@@ -0,0 +1,75 @@
+"""Tests for bulk channel information refresh."""
+
+from twitch_sdk.helpers.channel_info import ChannelInfoWatcher
+
+
+def _channel(broadcaster_id: str, title: str = "Playing chess") -> dict:
+    return {
+        "broadcaster_id": broadcaster_id,
+        "broadcaster_login": f"c{broadcaster_id}",
+        "broadcaster_name": f"C{broadcaster_id}",
+        "broadcaster_language": "en",
+        "game_id": "743",
+        "game_name": "Chess",
+        "title": title,
+        "delay": 0,
+        "tags": ["English"],
+        "content_classification_labels": [],
+        "is_branded_content": False,
+    }
+
+
+def _serve(channels: dict[str, dict], failing: set[str] | None = None):
+    """Handler returning the known channels among the requested ids."""
+    def handler(params, data):
+        ids = params["broadcaster_id"]
+        if failing and failing.intersection(ids):
+            raise RuntimeError("boom")
+        return {"data": [channels[broadcaster_id] for broadcaster_id in ids if broadcaster_id in channels]}
+    return handler
+
+
+class TestChannelInfoWatcher:
+    """Test change detection, missing ids and failed batches."""
+
+    async def test_only_changes_are_reported(self, fake_client):
+        """First sightings and edited channels are reported; unchanged ones are not."""
+        channels = {str(i): _channel(str(i)) for i in range(3)}
+        fake_client.route("GET", "/channels", _serve(channels))
+        batches = []
+        watcher = ChannelInfoWatcher(fake_client, on_change=batches.append)
+
+        first = await watcher.refresh(channels)
+        assert [channel.broadcaster_id for channel in first.changed] == ["0", "1", "2"]
+        assert len(watcher) == 3
+
+        channels["1"] = _channel("1", title="Playing go")
+        second = await watcher.refresh(channels)
+        assert [channel.title for channel in second.changed] == ["Playing go"]
+        assert (second.checked, second.requests) == (3, 1)
+        assert len(batches) == 2
+
+        watcher.forget("2")
+        watcher.forget("2")
+        assert len(watcher) == 2
+        third = await watcher.refresh(channels)
+        assert [channel.broadcaster_id for channel in third.changed] == ["2"]
+        assert len(watcher) == 3
+
+    async def test_missing_ids(self, fake_client):
+        """Ids Helix returns nothing for are listed as missing."""
+        fake_client.route("GET", "/channels", _serve({"1": _channel("1")}))
+        watcher = ChannelInfoWatcher(fake_client)
+        result = await watcher.refresh(["1", "404"])
+        assert result.missing == ["404"]
+        assert len(result.changed) == 1 and len(watcher) == 1
+
+    async def test_failed_batch(self, fake_client):
+        """A failing batch reports an error per id without stopping the others."""
+        channels = {str(i): _channel(str(i)) for i in range(150)}
+        fake_client.route("GET", "/channels", _serve(channels, failing={"120"}))
+        watcher = ChannelInfoWatcher(fake_client, concurrency=2)
+        result = await watcher.refresh(channels)
+        assert len(result.changed) == 100
+        assert len(result.errors) == 50 and isinstance(result.errors["120"], RuntimeError)
+        assert result.checked == 100 and len(watcher) == 100
@@ -0,0 +1,79 @@
+"""Tests for the chat color resolver."""
+
+import asyncio
+
+import pytest
+from twitch_sdk.helpers.chat_colors import ChatColorResolver
+
+
+@pytest.fixture
+def color_client(fake_client):
+    """Fake client answering Get User Chat Color for any ids."""
+    def handler(params, data):
+        return {"data": [
+            {"user_id": uid, "user_login": f"u{uid}", "user_name": f"U{uid}", "color": "#FF0000"}
+            for uid in params["user_id"]
+            if uid != "unknown"
+        ]}
+
+    fake_client.route("GET", "/chat/color", handler)
+    return fake_client
+
+
+class TestChatColorResolver:
+    """Test batching, caching and event invalidation."""
+
+    async def test_concurrent_lookups_batched(self, color_client):
+        """Concurrent lookups are coalesced into 100-id calls."""
+        resolver = ChatColorResolver(color_client, batch_delay=0)
+        ids = [str(i) for i in range(150)]
+        colors = await asyncio.gather(*(resolver.get_color(uid) for uid in ids))
+
+        assert colors == ["#FF0000"] * 150
+        batches = [params["user_id"] for _, _, params, _ in color_client.calls]
+        assert sorted(len(b) for b in batches) == [50, 100]
+
+    async def test_cached_lookups_skip_api(self, color_client):
+        """Resolved colors are served from the cache."""
+        resolver = ChatColorResolver(color_client, batch_delay=0)
+        await resolver.get_color("1")
+        await resolver.get_color("1")
+        assert color_client.count("GET", "/chat/color") == 1
+
+    async def test_unknown_user(self, color_client):
+        """Users missing from the response resolve to None."""
+        resolver = ChatColorResolver(color_client, batch_delay=0)
+        assert await resolver.get_color("unknown") is None
+        assert await resolver.get_many(["1", "unknown"]) == {"1": resolver.peek("1")}
+
+    async def test_chat_message_event_updates_color(self, color_client):
+        """channel.chat.message colors replace cached entries."""
+        resolver = ChatColorResolver(color_client, batch_delay=0)
+        await resolver.get_color("1")
+        handled = resolver.handle_event({
+            "subscription": {"type": "channel.chat.message"},
+            "event": {"chatter_user_id": "1", "chatter_user_login": "u1", "color": "#00FF00"},
+        })
+
+        assert handled is True
+        assert await resolver.get_color("1") == "#00FF00"
+        assert color_client.count("GET", "/chat/color") == 1
+
+    async def test_other_events_ignored(self, color_client):
+        """Unrelated events are not handled."""
+        resolver = ChatColorResolver(color_client)
+        assert resolver.handle_event({"subscription": {"type": "channel.ban"}, "event": {}}) is False
+
+    async def test_cancelled_lookup_does_not_cancel_others(self, color_client):
+        """Cancelling one caller leaves others waiting on the same user unaffected."""
+        resolver = ChatColorResolver(color_client, batch_delay=0.01)
+        cancelled = asyncio.ensure_future(resolver.get_color("1"))
+        waiting = asyncio.ensure_future(resolver.get_color("1"))
+        many = asyncio.ensure_future(resolver.get_many(["1", "2"]))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        assert await waiting == "#FF0000"
+        assert set(await many) == {"1", "2"}
+        assert cancelled.cancelled()
+        assert color_client.count("GET", "/chat/color") == 1
@@ -0,0 +1,119 @@
+"""Tests for the chat settings mirror."""
+
+import asyncio
+
+from twitch_sdk.helpers.chat_settings import ChatSettingsMirror
+from twitch_sdk.schemas.chat import UpdateChatSettingsRequest
+
+
+def _settings(broadcaster_id: str, **overrides) -> dict:
+    settings = {
+        "broadcaster_id": broadcaster_id,
+        "emote_mode": False,
+        "follower_mode": False,
+        "follower_mode_duration": None,
+        "moderator_id": "mod",
+        "non_moderator_chat_delay": True,
+        "non_moderator_chat_delay_duration": 4,
+        "slow_mode": False,
+        "slow_mode_wait_time": None,
+        "subscriber_mode": False,
+        "unique_chat_mode": False,
+    }
+    settings.update(overrides)
+    return settings
+
+
+def _event(broadcaster_id: str, **fields) -> dict:
+    event = {
+        "broadcaster_user_id": broadcaster_id,
+        "emote_mode": False,
+        "follower_mode": False,
+        "follower_mode_duration_minutes": None,
+        "slow_mode": False,
+        "slow_mode_wait_time_seconds": None,
+        "subscriber_mode": False,
+        "unique_chat_mode": False,
+    }
+    event.update(fields)
+    return {"subscription": {"type": "channel.chat_settings.update"}, "event": event}
+
+
+class TestChatSettingsMirror:
+    """Test loading, events, updates and listeners."""
+
+    async def test_load_reports_failures(self, fake_client):
+        """Channels load concurrently; failures are returned, not raised."""
+        def handler(params, data):
+            if params["broadcaster_id"] == "bad":
+                raise RuntimeError("boom")
+            return {"data": [_settings(params["broadcaster_id"], slow_mode=True, slow_mode_wait_time=30)]}
+
+        fake_client.route("GET", "/chat/settings", handler)
+        mirror = ChatSettingsMirror(fake_client, moderator_id="mod")
+        errors = await mirror.load(["b1", "b2", "b1", "bad"])
+        assert list(errors) == ["bad"]
+        assert sorted(mirror.broadcasters()) == ["b1", "b2"]
+        assert mirror.get("b1").slow_mode_wait_time == 30
+        assert fake_client.count("GET", "/chat/settings") == 3
+        assert fake_client.calls[0][2]["moderator_id"] == "mod"
+
+    async def test_events_update_the_mirror(self, fake_client):
+        """Settings events replace the event fields and keep the rest."""
+        fake_client.route("GET", "/chat/settings", {
+            "data": [_settings("b1", slow_mode=True, slow_mode_wait_time=30)],
+        })
+        mirror = ChatSettingsMirror(fake_client)
+        await mirror.refresh("b1")
+
+        assert mirror.handle_event(_event("b1", follower_mode=True, follower_mode_duration_minutes=10))
+        settings = mirror.get("b1")
+        assert (settings.slow_mode, settings.slow_mode_wait_time) == (False, None)
+        assert (settings.follower_mode, settings.follower_mode_duration) == (True, 10)
+        assert settings.non_moderator_chat_delay_duration == 4
+
+        assert mirror.handle_event(_event("b2", emote_mode=True))
+        assert mirror.get("b2").emote_mode
+        assert not mirror.handle_event({"subscription": {"type": "channel.follow"}, "event": {}})
+
+    async def test_disabling_a_mode_clears_its_duration(self, fake_client):
+        """An update response replaces the mirrored settings, keeping omitted delay fields."""
+        fake_client.route("GET", "/chat/settings", {"data": [_settings(
+            "b1", slow_mode=True, slow_mode_wait_time=30, follower_mode=True, follower_mode_duration=10,
+        )]})
+        fake_client.route("PATCH", "/chat/settings", {"data": [_settings(
+            "b1", non_moderator_chat_delay=None, non_moderator_chat_delay_duration=None,
+        )]})
+        mirror = ChatSettingsMirror(fake_client)
+        await mirror.refresh("b1")
+
+        settings = await mirror.update(UpdateChatSettingsRequest(
+            broadcaster_id="b1", moderator_id="mod", slow_mode=False, follower_mode=False,
+        ))
+        assert (settings.slow_mode, settings.slow_mode_wait_time) == (False, None)
+        assert (settings.follower_mode, settings.follower_mode_duration) == (False, None)
+        assert (settings.non_moderator_chat_delay, settings.non_moderator_chat_delay_duration) == (True, 4)
+        assert mirror.get("b1") == settings
+
+    async def test_listeners_see_changes_only(self, fake_client):
+        """Listeners are called with old and new settings when something changed."""
+        mirror = ChatSettingsMirror(fake_client)
+        seen = []
+
+        def listener(broadcaster_id, old, new):
+            seen.append((broadcaster_id, old, new))
+
+        mirror.add_listener(listener)
+        mirror.handle_event(_event("b1", emote_mode=True))
+        mirror.handle_event(_event("b1", emote_mode=True))
+        assert len(seen) == 1 and seen[0][1] is None
+
+        mirror.remove_listener(listener)
+        mirror.handle_event(_event("b1", unique_chat_mode=True))
+        assert len(seen) == 1
+
+        waiter = asyncio.ensure_future(mirror.wait_for_change("b1"))
+        await asyncio.sleep(0)
+        mirror.handle_event(_event("b2", subscriber_mode=True))
+        mirror.handle_event(_event("b1", slow_mode=True, slow_mode_wait_time_seconds=5))
+        assert (await waiter).slow_mode_wait_time == 5
@@ -0,0 +1,72 @@
+"""Tests for the time-sliced clip crawler."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from twitch_sdk.helpers._ratelimit import RateBudget
+from twitch_sdk.helpers.clips import ClipCrawler
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def clip_api(fake_client):
+    # Bursty: most clips fall in the first hour of the day
+    times = [START + timedelta(seconds=i) for i in range(900)]
+    times += [START + timedelta(hours=1 + i // 10) for i in range(200)]
+    table = [
+        {
+            "id": f"c{i}",
+            "url": "", "embed_url": "",
+            "broadcaster_id": "b1", "broadcaster_name": "B",
+            "creator_id": "1", "creator_name": "C",
+            "video_id": "", "game_id": "g", "language": "en", "title": "t",
+            "view_count": i, "created_at": created.isoformat(),
+            "thumbnail_url": "", "duration": 30.0, "is_featured": False,
+        }
+        for i, created in enumerate(times)
+    ]
+
+    def get_clips(params, data):
+        window = [
+            clip for clip in table
+            if params["started_at"] <= datetime.fromisoformat(clip["created_at"]) <= params["ended_at"]
+        ]
+        start = int(params.get("after", 0))
+        end = start + int(params["first"])
+        # Like the API, results stop after a fixed depth
+        cursor = {"cursor": str(end)} if end < min(len(window), 300) else {}
+        return {"data": window[start:min(end, 300)], "pagination": cursor}
+
+    fake_client.route("GET", "/clips", get_clips)
+    return fake_client, table
+
+
+class TestClipCrawler:
+    """Test window splitting and deduplication."""
+
+    async def test_splits_full_windows(self, clip_api):
+        """Dense windows are split until every clip is reachable."""
+        client, table = clip_api
+        crawler = ClipCrawler(
+            client,
+            budget=RateBudget(points=100_000),
+            initial_windows=4,
+            max_pages=2,
+            min_window=timedelta(seconds=10),
+        )
+        found = [
+            clip.id
+            async for clip in crawler.crawl(START, START + timedelta(days=1), broadcaster_id="b1")
+        ]
+
+        assert len(found) == len(set(found)) == len(table)
+        assert crawler.stats.splits > 0 and crawler.stats.truncated == 0
+        assert crawler.stats.clips == len(table)
+
+    async def test_requires_one_filter(self, clip_api):
+        """A crawl needs a broadcaster or a game, not both."""
+        client, _ = clip_api
+        with pytest.raises(ValueError):
+            async for _ in ClipCrawler(client).crawl(START, START + timedelta(days=1)):
+                pass
@@ -0,0 +1,140 @@
+"""Tests for the emote and badge index."""
+
+import asyncio
+
+import pytest
+from twitch_sdk.helpers.emotes import EmoteIndex
+
+
+def _emote(emote_id: str, name: str, emote_set_id: str = "0") -> dict:
+    return {
+        "id": emote_id,
+        "name": name,
+        "images": {"url_1x": f"https://example.com/{emote_id}.png"},
+        "format": ["static"],
+        "scale": ["1.0"],
+        "theme_mode": ["light", "dark"],
+        "emote_set_id": emote_set_id,
+    }
+
+
+@pytest.fixture
+def emote_client(fake_client, sample_broadcaster_id):
+    """Fake client serving global and channel emote/badge tables."""
+    fake_client.route("GET", "/chat/emotes/global", {
+        "data": [_emote("1", "Kappa"), _emote("2", "LUL")],
+    })
+    fake_client.route("GET", "/chat/emotes", {
+        "data": [_emote("100", "chanHype"), _emote("101", "LUL")],
+    })
+    fake_client.route("GET", "/chat/badges/global", {
+        "data": [{"set_id": "subscriber", "versions": [
+            {"id": "0", "image_url_1x": "https://example.com/global-sub.png"},
+        ]}],
+    })
+    fake_client.route("GET", "/chat/badges", {
+        "data": [{"set_id": "subscriber", "versions": [
+            {"id": "0", "image_url_1x": "https://example.com/chan-sub.png"},
+        ]}],
+    })
+    return fake_client
+
+
+class TestEmoteMatcher:
+    """Test message tokenization."""
+
+    async def test_tokenize_merges_text(self, emote_client, sample_broadcaster_id):
+        """Text between emotes is merged into single fragments."""
+        index = EmoteIndex(emote_client)
+        await index.load_global()
+        await index.load_channel(sample_broadcaster_id)
+
+        fragments = index.tokenize(sample_broadcaster_id, "hi there Kappa chanHype  bye")
+        assert [(f.type, f.text) for f in fragments] == [
+            ("text", "hi there "),
+            ("emote", "Kappa"),
+            ("text", " "),
+            ("emote", "chanHype"),
+            ("text", "  bye"),
+        ]
+        assert fragments[1].emote.id == "1"
+
+    async def test_channel_overrides_global(self, emote_client, sample_broadcaster_id):
+        """Channel emotes win over global emotes with the same code."""
+        index = EmoteIndex(emote_client)
+        await index.load_global()
+        await index.load_channel(sample_broadcaster_id)
+
+        assert index.matcher(sample_broadcaster_id).get("LUL").id == "101"
+        assert index.matcher().get("LUL").id == "2"
+
+    async def test_partial_words_not_matched(self, emote_client):
+        """Emote codes only match whole whitespace-delimited words."""
+        index = EmoteIndex(emote_client)
+        await index.load_global()
+
+        fragments = index.tokenize(None, "KappaKappa xKappa")
+        assert [f.type for f in fragments] == ["text"]
+
+    async def test_matcher_reused_until_reload(self, emote_client, sample_broadcaster_id):
+        """The compiled matcher is cached until its tables change."""
+        index = EmoteIndex(emote_client)
+        await index.load_channel(sample_broadcaster_id)
+        matcher = index.matcher(sample_broadcaster_id)
+        assert index.matcher(sample_broadcaster_id) is matcher
+
+        await index.load_channel(sample_broadcaster_id, force=True)
+        assert index.matcher(sample_broadcaster_id) is not matcher
+
+
+class TestEmoteIndexCache:
+    """Test table caching and badges."""
+
+    async def test_fresh_tables_not_refetched(self, emote_client, sample_broadcaster_id):
+        """Loading a fresh table does not hit the API again."""
+        index = EmoteIndex(emote_client)
+        await index.load_channel(sample_broadcaster_id)
+        await index.load_channel(sample_broadcaster_id)
+        assert emote_client.count("GET", "/chat/emotes") == 1
+
+    async def test_stale_tables_refreshed(self, emote_client, sample_broadcaster_id):
+        """refresh() reloads tables older than the TTL."""
+        index = EmoteIndex(emote_client, ttl=0)
+        await index.load_channel(sample_broadcaster_id)
+        await index.refresh()
+        assert emote_client.count("GET", "/chat/emotes") == 2
+        assert emote_client.count("GET", "/chat/emotes/global") == 0
+
+    async def test_failed_refresh_keeps_running(self, emote_client, sample_broadcaster_id):
+        """A failing channel is reported without stopping the others or the loop."""
+        index = EmoteIndex(emote_client, ttl=0)
+        await index.load_channel(sample_broadcaster_id)
+        await index.load_channel("bad")
+
+        def failing(params, data):
+            if params["broadcaster_id"] == "bad":
+                raise RuntimeError("boom")
+            return {"data": [_emote("102", "chanWave")]}
+
+        emote_client.route("GET", "/chat/emotes", failing)
+        errors = await index.refresh()
+        assert list(errors) == ["bad"] and isinstance(errors["bad"], RuntimeError)
+        assert index.matcher(sample_broadcaster_id).get("chanWave") is not None
+
+        runner = asyncio.ensure_future(index.run(interval=0))
+        while emote_client.count("GET", "/chat/emotes") < 10:
+            await asyncio.sleep(0)
+        assert not runner.done() and list(index.last_errors) == ["bad"]
+        runner.cancel()
+
+    async def test_badge_lookup(self, emote_client, sample_broadcaster_id):
+        """Channel badges take precedence over global badges."""
+        index = EmoteIndex(emote_client)
+        await index.load_global()
+        await index.load_channel(sample_broadcaster_id)
+
+        assert index.badge_image_url(sample_broadcaster_id, "subscriber", "0").endswith(
+            "chan-sub.png"
+        )
+        assert index.badge_image_url("other", "subscriber", "0").endswith("global-sub.png")
+        assert index.badge(sample_broadcaster_id, "missing", "1") is None
@@ -0,0 +1,101 @@
+"""Tests for the resumable follower crawler."""
+
+import json
+
+import pytest
+from twitch_client import TwitchAPIError
+from twitch_sdk.helpers.followers import CsvFollowerSink, FollowerCrawler, JsonlFollowerSink
+from twitch_sdk.schemas.channels import Follower
+
+
+@pytest.fixture
+def followers(fake_client):
+    # Newest first, like the API
+    table = [
+        {"user_id": str(i), "user_login": f"u{i}", "user_name": f"U{i}",
+         "followed_at": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}Z"}
+        for i in reversed(range(1050))
+    ]
+    state = {"fail_at": None, "calls": 0}
+
+    def get_followers(params, data):
+        state["calls"] += 1
+        if state["calls"] == state["fail_at"]:
+            raise TwitchAPIError(400, "boom")
+        start = int(params.get("after", 0))
+        end = start + int(params["first"])
+        page = table[start:end]
+        return {
+            "data": page,
+            "pagination": {"cursor": str(end)} if end < len(table) else {},
+            "total": len(table),
+        }
+
+    fake_client.route("GET", "/channels/followers", get_followers)
+    return fake_client, table, state
+
+
+def _lines(path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestFollowerCrawler:
+    """Test streaming, resume and incremental runs."""
+
+    async def test_resume_after_failure(self, followers, tmp_path):
+        """A crawl killed mid-way resumes from its cursor without duplicates."""
+        client, table, state = followers
+        out = tmp_path / "followers.jsonl"
+        state["fail_at"] = 5
+
+        sink = JsonlFollowerSink(out)
+        crawler = FollowerCrawler(client, "b1", sink, tmp_path / "state.json")
+        with pytest.raises(TwitchAPIError):
+            await crawler.crawl()
+        sink.close()
+        assert len(_lines(out)) == 400
+
+        sink = JsonlFollowerSink(out)
+        result = await FollowerCrawler(client, "b1", sink, tmp_path / "state.json").crawl()
+        sink.close()
+        assert result.resumed and result.written == 650
+        assert [row["user_id"] for row in _lines(out)] == [row["user_id"] for row in table]
+
+    async def test_incremental_run(self, followers, tmp_path):
+        """A later run stops at the previous high-water mark."""
+        client, table, _ = followers
+        out = tmp_path / "followers.csv"
+        sink = CsvFollowerSink(out)
+        first = await FollowerCrawler(client, "b1", sink, tmp_path / "state.json").crawl()
+        assert first.written == 1050 and not first.incremental
+
+        table[:0] = [
+            {"user_id": f"n{i}", "user_login": "n", "user_name": "N",
+             "followed_at": f"2024-02-01T00:00:{i:02d}Z"}
+            for i in reversed(range(30))
+        ]
+        second = await FollowerCrawler(client, "b1", sink, tmp_path / "state.json").crawl()
+        sink.close()
+        assert (second.written, second.pages, second.incremental) == (30, 1, True)
+        assert out.read_text().count("\n") == 1 + 1050 + 30
+
+    async def test_unsaved_page_after_complete_run_is_dropped(self, followers, tmp_path):
+        """A page flushed after a completed run's last save is not written twice."""
+        client, table, _ = followers
+        out = tmp_path / "followers.jsonl"
+        sink = JsonlFollowerSink(out)
+        crawler = FollowerCrawler(client, "b1", sink, tmp_path / "state.json")
+        await crawler.crawl()
+
+        new = [
+            {"user_id": "n1", "user_login": "n", "user_name": "N", "followed_at": "2024-02-01T00:00:00Z"},
+        ]
+        table[:0] = new
+        # A run that flushed its page but died before saving its state
+        sink.write([Follower.model_validate(row) for row in new])
+        sink.flush()
+
+        result = await crawler.crawl()
+        sink.close()
+        assert result.written == 1
+        assert [row["user_id"] for row in _lines(out)].count("n1") == 1
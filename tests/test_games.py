@@ -0,0 +1,82 @@
+"""Tests for the game catalog."""
+
+import asyncio
+
+import pytest
+from twitch_sdk.helpers.games import GameCatalog
+
+
+def _game(game_id: str, name: str, igdb_id: str = "") -> dict:
+    return {"id": game_id, "name": name, "box_art_url": "", "igdb_id": igdb_id}
+
+
+@pytest.fixture
+def catalog_api(fake_client):
+    top = [_game(str(i), f"Game {i}", f"i{i}") for i in range(250)]
+    extra = {"9999": _game("9999", "Obscure", "i9999")}
+
+    def get_top(params, data):
+        start = int(params.get("after", 0))
+        end = start + int(params["first"])
+        return {"data": top[start:end], "pagination": {"cursor": str(end)} if end < len(top) else {}}
+
+    def get_games(params, data):
+        if "id" in params:
+            return {"data": [extra[i] for i in params["id"] if i in extra]}
+        names = {name.lower() for name in params.get("name", [])}
+        return {"data": [g for g in extra.values() if g["name"].lower() in names]}
+
+    fake_client.route("GET", "/games/top", get_top)
+    fake_client.route("GET", "/games", get_games)
+    return fake_client
+
+
+class TestGameCatalog:
+    """Test crawling, lookups and persistence."""
+
+    async def test_crawl_and_lookup(self, catalog_api, tmp_path):
+        """A crawl fills all three indexes and survives a restart."""
+        catalog = GameCatalog(catalog_api, path=tmp_path / "games.json")
+        assert await catalog.crawl() == 250
+        assert catalog.name_of("42") == "Game 42"
+        assert catalog.by_name("game 7").id == "7"
+        assert catalog.by_igdb_id("i3").id == "3"
+
+        restored = GameCatalog(catalog_api, path=tmp_path / "games.json")
+        assert len(restored) == 250 and restored.by_name("GAME 1").id == "1"
+
+    async def test_resolve_batches_misses(self, catalog_api):
+        """Unknown ids are fetched in one batch and negative-cached."""
+        catalog = GameCatalog(catalog_api)
+        results = await asyncio.gather(
+            catalog.resolve("9999"),
+            catalog.resolve("nope"),
+        )
+        assert [game.name if game else None for game in results] == ["Obscure", None]
+        assert catalog_api.count("GET", "/games") == 1
+
+        assert await catalog.resolve("nope") is None
+        assert (await catalog.resolve_names(["OBSCURE"]))["OBSCURE"].id == "9999"
+        assert catalog_api.count("GET", "/games") == 1
+
+    async def test_run_reports_crawl_errors(self, catalog_api):
+        """Failed scheduled crawls are reported and cleared by the next success."""
+        failures = [RuntimeError("boom")]
+
+        def get_top(params, data):
+            if failures:
+                raise failures.pop()
+            return {"data": [_game("1", "Chess")]}
+
+        catalog_api.route("GET", "/games/top", get_top)
+        errors = []
+        catalog = GameCatalog(catalog_api, refresh_interval=0.001, on_error=errors.append)
+        task = asyncio.ensure_future(catalog.run())
+        while not errors:
+            await asyncio.sleep(0)
+        assert isinstance(catalog.last_error, RuntimeError) and errors == [catalog.last_error]
+
+        while catalog.last_error is not None:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        assert catalog.get("1").name == "Chess" and len(errors) == 1
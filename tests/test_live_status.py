@@ -0,0 +1,135 @@
+"""Tests for the batched live-status tracker."""
+
+import pytest
+from twitch_sdk.helpers.live_status import (
+    COLD,
+    GAME_CHANGE,
+    HOT,
+    OFFLINE,
+    ONLINE,
+    TITLE_CHANGE,
+    LiveStatusTracker,
+)
+
+
+def _stream(user_id: str, title: str = "hi", game_id: str = "1", stream_id: str | None = None) -> dict:
+    return {
+        "id": stream_id or f"s{user_id}",
+        "user_id": user_id,
+        "user_login": f"u{user_id}",
+        "user_name": f"U{user_id}",
+        "game_id": game_id,
+        "game_name": "Game",
+        "type": "live",
+        "title": title,
+        "viewer_count": 1,
+        "started_at": "2024-01-01T00:00:00Z",
+        "language": "en",
+        "thumbnail_url": "",
+        "is_mature": False,
+    }
+
+
+@pytest.fixture
+def live(fake_client):
+    state: dict[str, dict] = {}
+
+    def get_streams(params, data):
+        ids = params["user_id"]
+        assert len(ids) <= 100
+        return {"data": [state[user_id] for user_id in ids if user_id in state], "pagination": {}}
+
+    fake_client.route("GET", "/streams", get_streams)
+    return fake_client, state
+
+
+class TestLiveStatusTracker:
+    """Test batching, diffing and tiering."""
+
+    async def test_batches_and_diffs(self, live):
+        """Channels are polled 100 at a time and changes are emitted."""
+        client, state = live
+        tracker = LiveStatusTracker(client)
+        changes = []
+        tracker.add_listener(changes.append)
+        tracker.track(str(i) for i in range(250))
+        state["7"] = _stream("7")
+
+        cycle = await tracker.poll(COLD)
+        assert (cycle.channels, cycle.requests, cycle.changes) == (250, 3, 1)
+        assert [(c.kind, c.broadcaster_id) for c in changes] == [(ONLINE, "7")]
+        assert tracker.is_live("7") and tracker.tier_size(HOT) == 1
+
+        changes.clear()
+        state["7"] = _stream("7", title="new", game_id="2")
+        await tracker.poll(HOT)
+        assert [(c.kind, c.previous) for c in changes] == [(TITLE_CHANGE, "hi"), (GAME_CHANGE, "1")]
+
+        changes.clear()
+        del state["7"]
+        await tracker.poll(HOT)
+        assert [c.kind for c in changes] == [OFFLINE]
+        assert not tracker.is_live("7")
+
+    async def test_eventsub_consistency(self, live):
+        """EventSub changes are not re-emitted by polls; missed ones are counted."""
+        client, state = live
+        tracker = LiveStatusTracker(client)
+        changes = []
+        tracker.add_listener(changes.append)
+        tracker.track(["1", "2"])
+
+        tracker.handle_event({
+            "subscription": {"type": "stream.online"},
+            "event": {"broadcaster_user_id": "1", "type": "live"},
+        })
+        state["1"] = _stream("1")
+        state["2"] = _stream("2")
+        await tracker.poll(HOT)
+        await tracker.poll(COLD)
+
+        assert [(c.kind, c.broadcaster_id, c.source) for c in changes] == [
+            (ONLINE, "1", "eventsub"),
+            (ONLINE, "2", "poll"),
+        ]
+        assert tracker.get("1").title == "hi"
+        assert tracker.missed_events == 1
+
+    async def test_stale_poll_does_not_overrule_event(self, live):
+        """A poll lagging behind an event is ignored until the grace period ends."""
+        client, state = live
+        now = [0.0]
+        tracker = LiveStatusTracker(client, hot_interval=30, clock=lambda: now[0])
+        changes = []
+        tracker.add_listener(changes.append)
+        tracker.track(["1"])
+        state["1"] = _stream("1")
+        await tracker.poll(COLD)
+
+        tracker.handle_event({
+            "subscription": {"type": "stream.offline"},
+            "event": {"broadcaster_user_id": "1"},
+        })
+        await tracker.poll(HOT)  # Helix still lists the stream
+        assert not tracker.is_live("1") and tracker.missed_events == 0
+        assert [(c.kind, c.source) for c in changes] == [(ONLINE, "poll"), (OFFLINE, "eventsub")]
+
+        now[0] = 30
+        await tracker.poll(HOT)  # Still listed a full interval later: the event was wrong
+        assert tracker.is_live("1") and tracker.missed_events == 1
+
+    async def test_cooldown_demotes_to_cold(self, live):
+        """Channels offline for longer than the cooldown return to the cold tier."""
+        client, state = live
+        now = [0.0]
+        tracker = LiveStatusTracker(client, cooldown=60, clock=lambda: now[0])
+        tracker.track(["1"])
+        state["1"] = _stream("1")
+        await tracker.poll(COLD)
+        del state["1"]
+        await tracker.poll(HOT)
+        assert tracker.tier_size(HOT) == 1
+
+        now[0] = 61
+        await tracker.poll(HOT)
+        assert (tracker.tier_size(HOT), tracker.tier_size(COLD)) == (0, 1)
@@ -0,0 +1,124 @@
+"""Tests for the mass-moderation engine."""
+
+import json
+import time
+
+import pytest
+from twitch_client import TwitchAPIError
+from twitch_sdk.helpers._ratelimit import RateBudget
+from twitch_sdk.helpers.mass_moderation import BanTarget, MassModeration
+
+
+def _ban_response(params, data):
+    return {"data": [{
+        "broadcaster_id": params["broadcaster_id"],
+        "moderator_id": params["moderator_id"],
+        "user_id": data["data"]["user_id"],
+        "created_at": "2024-01-01T00:00:00Z",
+    }]}
+
+
+@pytest.fixture
+def ban_client(fake_client):
+    """Fake client accepting every ban."""
+    fake_client.route("POST", "/moderation/bans", _ban_response)
+    return fake_client
+
+
+def _engine(client, **kwargs) -> MassModeration:
+    kwargs.setdefault("budget", RateBudget(points=100_000))
+    return MassModeration(client, "b1", "mod", **kwargs)
+
+
+class TestMassModeration:
+    """Test mass ban and unban."""
+
+    async def test_ban_all(self, ban_client):
+        """Every unique target is banned once."""
+        targets = [("1", "spam", None), BanTarget("2", duration=600), ("1", "dupe", None)]
+        progress = await _engine(ban_client).ban(targets)
+
+        assert progress.succeeded == 2
+        assert progress.in_flight == 0
+        assert ban_client.count("POST", "/moderation/bans") == 2
+
+    async def test_transient_failures_retried(self, ban_client):
+        """5xx errors are retried; 400 already-banned counts as skipped."""
+        attempts = {}
+
+        def flaky(params, data):
+            user_id = data["data"]["user_id"]
+            attempts[user_id] = attempts.get(user_id, 0) + 1
+            if user_id == "flaky" and attempts[user_id] == 1:
+                raise TwitchAPIError(503, "Service Unavailable")
+            if user_id == "old":
+                raise TwitchAPIError(400, "The user specified in the user_id field is already banned.")
+            if user_id == "forbidden":
+                raise TwitchAPIError(403, "Forbidden")
+            return _ban_response(params, data)
+
+        ban_client.route("POST", "/moderation/bans", flaky)
+        progress = await _engine(ban_client).ban(["flaky", "old", "forbidden"])
+
+        assert (progress.succeeded, progress.skipped, progress.failed) == (1, 1, 1)
+        assert progress.retries == 1
+        assert "forbidden" in progress.errors
+
+    async def test_checkpoint_resume(self, ban_client, tmp_path):
+        """A second run skips users finished in the checkpoint."""
+        path = tmp_path / "wave.jsonl"
+        await _engine(ban_client, checkpoint_path=path).ban(["1", "2"])
+        progress = await _engine(ban_client, checkpoint_path=path).ban(["1", "2", "3"])
+
+        assert progress.resumed == 2
+        assert progress.succeeded == 1
+        assert ban_client.count("POST", "/moderation/bans") == 3
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [r["user_id"] for r in records] == ["1", "2", "3"]
+
+    async def test_unban(self, fake_client):
+        """Unban mode calls unban_user for each id."""
+        progress = await _engine(fake_client).unban(["1", "2", "3"])
+        assert progress.succeeded == 3
+        assert fake_client.count("DELETE", "/moderation/bans") == 3
+
+    async def test_progress_callback(self, ban_client):
+        """The final progress report is always delivered."""
+        reports = []
+        await _engine(ban_client, on_progress=reports.append).ban(["1"])
+        assert reports[-1].finished_at is not None
+
+    async def test_throughput_against_mock(self, ban_client):
+        """Concurrent workers beat serial calls against a mock with latency."""
+        ban_client.latency = 0.01
+        count = 1000
+        start = time.perf_counter()
+        progress = await _engine(ban_client, concurrency=100).ban(
+            (str(i), "raid", None) for i in range(count)
+        )
+        elapsed = time.perf_counter() - start
+
+        assert progress.succeeded == count
+        # Serial would take count * latency = 10s
+        assert elapsed < count * ban_client.latency / 5
+        assert progress.rate > 5 / ban_client.latency
+
+
+class TestRateBudget:
+    """Test the shared rate budget."""
+
+    async def test_burst_then_refill(self):
+        """Points beyond the burst wait for the bucket to refill."""
+        budget = RateBudget(points=5, per=0.1)
+        start = time.perf_counter()
+        for _ in range(10):
+            await budget.acquire()
+        assert time.perf_counter() - start >= 0.09
+
+    async def test_block_for(self):
+        """block_for pauses all acquisitions."""
+        budget = RateBudget(points=100, per=1.0)
+        budget.block_for(0.05)
+        start = time.perf_counter()
+        await budget.acquire()
+        assert time.perf_counter() - start >= 0.04
@@ -0,0 +1,144 @@
+"""Tests for batched redemption updates."""
+
+import asyncio
+
+from twitch_client import TwitchAPIError
+
+from twitch_sdk.helpers.redemptions import CANCELED, FULFILLED, RedemptionBatcher
+
+ENDPOINT = "/channel_points/custom_rewards/redemptions"
+
+
+def _redemption(redemption_id: str, broadcaster_id: str = "b1", reward_id: str = "r1") -> dict:
+    return {
+        "broadcaster_id": broadcaster_id,
+        "broadcaster_login": "streamer",
+        "broadcaster_name": "Streamer",
+        "id": redemption_id,
+        "user_id": "42",
+        "user_login": "viewer",
+        "user_name": "Viewer",
+        "user_input": "",
+        "status": "FULFILLED",
+        "redeemed_at": "2024-01-01T00:00:00Z",
+        "reward": {"id": reward_id, "title": "Hydrate", "prompt": "", "cost": 100},
+    }
+
+
+def _add(redemption_id: str, user_input: str = "", reward_id: str = "r1") -> dict:
+    return {
+        "subscription": {"type": "channel.channel_points_custom_reward_redemption.add"},
+        "event": {
+            "id": redemption_id,
+            "broadcaster_user_id": "b1",
+            "user_id": "42",
+            "user_login": "viewer",
+            "user_input": user_input,
+            "status": "unfulfilled",
+            "reward": {"id": reward_id, "title": "Hydrate", "cost": 100, "prompt": ""},
+            "redeemed_at": "2024-01-01T00:00:00.123456789Z",
+        },
+    }
+
+
+def _echo(params: dict, data: dict) -> dict:
+    return {"data": [_redemption(redemption_id) for redemption_id in params["id"]]}
+
+
+async def _drain(batcher: RedemptionBatcher) -> None:
+    task = asyncio.ensure_future(batcher.run())
+    await batcher.join()
+    task.cancel()
+
+
+class TestRedemptionBatcher:
+    """Test grouping, flushing and partial failures."""
+
+    async def test_groups_by_reward_and_status(self, fake_client):
+        """Ids are sent in one call per (broadcaster, reward, status) group."""
+        fake_client.route("PATCH", ENDPOINT, _echo)
+        batcher = RedemptionBatcher(fake_client, max_delay=10)
+        for index in range(30):
+            batcher.fulfill("b1", "r1", f"f{index}")
+        batcher.cancel("b1", "r1", "c1")
+        batcher.fulfill("b1", "r2", "x1")
+        await _drain(batcher)
+
+        sent = sorted((params["reward_id"], data["status"], len(params["id"]))
+                      for _, _, params, data in fake_client.calls)
+        assert sent == [("r1", CANCELED, 1), ("r1", FULFILLED, 30), ("r2", FULFILLED, 1)]
+        assert batcher.stats.updated == 32
+        assert batcher.pending == 0
+
+    async def test_full_batch_is_sent_without_waiting(self, fake_client):
+        """A group reaching 50 ids is sent immediately; the rest waits for its deadline."""
+        fake_client.route("PATCH", ENDPOINT, _echo)
+        batcher = RedemptionBatcher(fake_client, max_delay=0.05)
+        task = asyncio.ensure_future(batcher.run())
+        for index in range(60):
+            batcher.fulfill("b1", "r1", f"f{index}")
+        await asyncio.sleep(0.01)
+        assert [len(params["id"]) for _, _, params, _ in fake_client.calls] == [50]
+        await asyncio.sleep(0.1)
+        assert [len(params["id"]) for _, _, params, _ in fake_client.calls] == [50, 10]
+        task.cancel()
+
+    async def test_partial_results_and_bad_ids(self, fake_client):
+        """Ids missing from the response are skipped; a 400 is bisected down to the bad id."""
+        def handler(params, data):
+            if "bad" in params["id"]:
+                raise TwitchAPIError(400, "Invalid redemption id")
+            return {"data": [_redemption(i) for i in params["id"] if i != "done"]}
+
+        fake_client.route("PATCH", ENDPOINT, handler)
+        outcomes = []
+        batcher = RedemptionBatcher(fake_client, max_delay=10, on_batch=outcomes.append)
+        for redemption_id in ("a", "b", "bad", "c", "done"):
+            batcher.fulfill("b1", "r1", redemption_id)
+        await _drain(batcher)
+
+        assert (batcher.stats.updated, batcher.stats.skipped, batcher.stats.failed) == (3, 1, 1)
+        assert batcher.stats.splits > 0
+        failed = [outcome for outcome in outcomes if outcome.failed]
+        assert [outcome.failed for outcome in failed] == [["bad"]]
+        assert failed[0].error.status_code == 400
+
+    async def test_events_go_through_deciders(self, fake_client):
+        """Add events are decided and batched; update events withdraw queued ids."""
+        fake_client.route("PATCH", ENDPOINT, _echo)
+        batcher = RedemptionBatcher(fake_client, max_delay=10, deciders=[
+            lambda r: CANCELED if "spam" in r.user_input else None,
+            lambda r: "fulfilled" if r.reward_id == "r1" else None,
+        ])
+        task = asyncio.ensure_future(batcher.run())
+        batcher.handle_event(_add("e1"))
+        batcher.handle_event(_add("e2", "spam spam"))
+        batcher.handle_event(_add("e3", reward_id="r9"))
+        batcher.handle_event(_add("e4"))
+        batcher.handle_event(_add("e4"))
+        await asyncio.sleep(0)
+        assert batcher.handle_event({
+            "subscription": {"type": "channel.channel_points_custom_reward_redemption.update"},
+            "event": {"id": "e4", "status": "canceled"},
+        })
+        await batcher.join()
+        task.cancel()
+
+        sent = {data["status"]: params["id"] for _, _, params, data in fake_client.calls}
+        assert sent == {FULFILLED: ["e1"], CANCELED: ["e2"]}
+        assert (batcher.stats.undecided, batcher.stats.duplicates, batcher.stats.withdrawn) == (1, 1, 1)
+
+    async def test_load_backlog(self, fake_client):
+        """Existing unfulfilled redemptions are read 50 per page and queued."""
+        fake_client.route("GET", ENDPOINT, {
+            "data": [_redemption(f"old{index}") for index in range(3)],
+            "pagination": {},
+        })
+        fake_client.route("PATCH", ENDPOINT, _echo)
+        batcher = RedemptionBatcher(fake_client, max_delay=10, deciders=[lambda r: FULFILLED])
+        assert await batcher.load_backlog("b1", "r1") == 3
+        await _drain(batcher)
+
+        _, _, params, _ = fake_client.calls[0]
+        assert (params["status"], params["first"]) == ("UNFULFILLED", 50)
+        assert fake_client.count("PATCH", ENDPOINT) == 1
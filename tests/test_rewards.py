@@ -0,0 +1,133 @@
+"""Tests for the custom reward cache."""
+
+import pytest
+from twitch_client import TwitchAPIError
+
+from twitch_sdk.helpers.rewards import CustomRewardCache
+from twitch_sdk.schemas.channel_points import UpdateCustomRewardRequest
+
+ENDPOINT = "/channel_points/custom_rewards"
+IMAGE = {"url_1x": "a", "url_2x": "b", "url_4x": "c"}
+
+
+def _reward(reward_id: str, **overrides) -> dict:
+    reward = {
+        "broadcaster_id": "b1",
+        "broadcaster_login": "streamer",
+        "broadcaster_name": "Streamer",
+        "id": reward_id,
+        "title": f"Reward {reward_id}",
+        "prompt": "",
+        "cost": 100,
+        "image": None,
+        "default_image": IMAGE,
+        "background_color": "#00E5CB",
+        "is_enabled": True,
+        "is_user_input_required": False,
+        "max_per_stream_setting": {"is_enabled": False, "max_per_stream": 0},
+        "max_per_user_per_stream_setting": {"is_enabled": False, "max_per_user_per_stream": 0},
+        "global_cooldown_setting": {"is_enabled": False, "global_cooldown_seconds": 0},
+        "is_paused": False,
+        "is_in_stock": True,
+        "should_redemptions_skip_request_queue": False,
+        "redemptions_redeemed_current_stream": 0,
+        "cooldown_expires_at": None,
+    }
+    reward.update(overrides)
+    return reward
+
+
+def _event(kind: str, event: dict) -> dict:
+    return {"subscription": {"type": kind}, "event": event}
+
+
+async def _loaded(fake_client, *rewards) -> CustomRewardCache:
+    fake_client.route("GET", ENDPOINT, {"data": list(rewards)})
+    cache = CustomRewardCache(fake_client)
+    assert await cache.load(["b1"]) == {}
+    return cache
+
+
+class TestCustomRewardCache:
+    """Test loading, optimistic writes and event folding."""
+
+    async def test_refresh_drops_deleted_rewards(self, fake_client):
+        """A refresh replaces the broadcaster's rewards and reports removals."""
+        cache = await _loaded(fake_client, _reward("r1"), _reward("r2"))
+        changes = []
+        cache.add_listener(lambda b, old, new: changes.append((old and old.id, new and new.id)))
+        fake_client.route("GET", ENDPOINT, {"data": [_reward("r1")]})
+        await cache.refresh("b1")
+
+        assert [reward.id for reward in cache.rewards("b1")] == ["r1"]
+        assert changes == [("r2", None)]  # Unchanged r1 is not reported
+
+    async def test_update_is_optimistic(self, fake_client):
+        """The cache shows the change before Helix answers, then the response."""
+        cache = await _loaded(fake_client, _reward("r1"))
+        seen_during_call = []
+
+        def handler(params, data):
+            seen_during_call.append(cache.get("b1", "r1").is_paused)
+            return {"data": [_reward("r1", is_paused=True, cost=5)]}
+
+        fake_client.route("PATCH", ENDPOINT, handler)
+        reward = await cache.update(UpdateCustomRewardRequest(
+            broadcaster_id="b1", id="r1", is_paused=True, is_max_per_stream_enabled=True, max_per_stream=3,
+        ))
+        assert seen_during_call == [True]
+        assert reward.cost == 5
+        assert cache.get("b1", "r1") is reward
+
+    async def test_failed_update_rolls_back(self, fake_client):
+        """A failed update restores the previous state and raises."""
+        cache = await _loaded(fake_client, _reward("r1"))
+        original = cache.get("b1", "r1")
+
+        def handler(params, data):
+            assert cache.get("b1", "r1").is_paused
+            raise TwitchAPIError(403, "Forbidden")
+
+        fake_client.route("PATCH", ENDPOINT, handler)
+        with pytest.raises(TwitchAPIError):
+            await cache.set_paused("b1", "r1", True)
+        assert cache.get("b1", "r1") is original
+
+    async def test_events(self, fake_client):
+        """Reward events add, update and remove rewards; redemptions bump the stream count."""
+        cache = await _loaded(fake_client, _reward(
+            "r1", max_per_stream_setting={"is_enabled": True, "max_per_stream": 2}
+        ))
+        redemption = _event("channel.channel_points_custom_reward_redemption.add", {
+            "broadcaster_user_id": "b1", "id": "x", "reward": {"id": "r1"},
+        })
+        assert cache.handle_event(redemption)
+        assert cache.get("b1", "r1").is_in_stock
+        cache.handle_event(redemption)
+        reward = cache.get("b1", "r1")
+        assert (reward.redemptions_redeemed_current_stream, reward.is_in_stock) == (2, False)
+
+        added = _reward("r2", is_paused=True)
+        for key in ("broadcaster_id", "broadcaster_login", "broadcaster_name",
+                    "max_per_stream_setting", "max_per_user_per_stream_setting",
+                    "global_cooldown_setting"):
+            del added[key]
+        added.update({
+            "broadcaster_user_id": "b1",
+            "broadcaster_user_login": "streamer",
+            "broadcaster_user_name": "Streamer",
+            "max_per_stream": {"is_enabled": True, "value": 10},
+            "max_per_user_per_stream": {"is_enabled": False, "value": 0},
+            "global_cooldown": {"is_enabled": True, "seconds": 60},
+        })
+        assert cache.handle_event(_event("channel.channel_points_custom_reward.add", added))
+        reward = cache.get("b1", "r2")
+        assert reward.is_paused
+        assert reward.max_per_stream_setting.max_per_stream == 10
+        assert reward.global_cooldown_setting.global_cooldown_seconds == 60
+
+        cache.handle_event(_event("channel.channel_points_custom_reward.remove", {
+            "broadcaster_user_id": "b1", "id": "r1",
+        }))
+        assert [reward.id for reward in cache.rewards("b1")] == ["r2"]
+        assert not cache.handle_event(_event("channel.follow", {}))
@@ -0,0 +1,116 @@
+"""Tests for the moderator and VIP role index."""
+
+import pytest
+from twitch_sdk.helpers.roles import MODERATOR, VIP, RoleIndex
+
+
+def _user(user_id: str) -> dict:
+    return {"user_id": user_id, "user_login": f"u{user_id}", "user_name": f"U{user_id}"}
+
+
+def _roles(members: dict[tuple[str, str], list[str]], page_size: int = 2):
+    """Handler factory serving ``members[(role, broadcaster_id)]`` in pages."""
+    def handler(role: str):
+        def serve(params, data):
+            users = members.get((role, params["broadcaster_id"]), [])
+            start = int(params.get("after") or 0)
+            end = start + page_size
+            return {
+                "data": [_user(user_id) for user_id in users[start:end]],
+                "pagination": {"cursor": str(end)} if end < len(users) else {},
+            }
+        return serve
+    return handler
+
+
+def _event(kind: str, broadcaster_id: str, user_id: str) -> dict:
+    return {
+        "subscription": {"type": kind},
+        "event": {"broadcaster_user_id": broadcaster_id, "user_id": user_id, "user_login": f"u{user_id}"},
+    }
+
+
+@pytest.fixture
+def members() -> dict[tuple[str, str], list[str]]:
+    return {
+        (MODERATOR, "c1"): ["1", "2", "3"],
+        (VIP, "c1"): ["4"],
+        (MODERATOR, "c2"): ["1"],
+    }
+
+
+@pytest.fixture
+def role_client(fake_client, members):
+    serve = _roles(members)
+    fake_client.route("GET", "/moderation/moderators", serve(MODERATOR))
+    fake_client.route("GET", "/channels/vips", serve(VIP))
+    return fake_client
+
+
+class TestRoleIndex:
+    """Test crawling, events and snapshots."""
+
+    async def test_build_indexes_both_directions(self, role_client):
+        """A build crawls every page of each channel's moderators and VIPs."""
+        index = RoleIndex(role_client)
+        assert await index.build(["c1", "c2", "c1"]) == {}
+        assert index.members("c1") == ["1", "2", "3"]
+        assert index.members("c1", VIP) == ["4"]
+        assert sorted(index.channels_for("1")) == ["c1", "c2"]
+        assert index.has_role("c1", "4", VIP) and not index.has_role("c2", "4", VIP)
+        assert index.login("3") == "u3"
+        assert sorted(index.indexed_channels()) == ["c1", "c2"]
+        assert role_client.count("GET", "/moderation/moderators") == 3
+
+    async def test_recrawl_shrinks_reverse_map(self, role_client, members):
+        """Users dropped from a channel lose it from their channel list."""
+        index = RoleIndex(role_client)
+        await index.build(["c1", "c2"])
+        members[(MODERATOR, "c1")] = ["3", "5"]
+        assert await index.crawl("c1") == (2, 1)
+
+        assert index.members("c1") == ["3", "5"]
+        assert index.channels_for("1") == ["c2"]
+        assert index.channels_for("2") == []
+        assert index.channels_for("5") == ["c1"]
+
+    async def test_build_reports_failures(self, role_client):
+        """A channel that fails to crawl is reported and leaves the index as it was."""
+        def failing(params, data):
+            raise RuntimeError("boom")
+
+        role_client.route("GET", "/channels/vips", failing)
+        index = RoleIndex(role_client)
+        errors = await index.build(["c1"])
+        assert list(errors) == ["c1"]
+        assert index.members("c1") == []
+
+    async def test_events_add_and_remove(self, role_client):
+        """Role events update both maps."""
+        index = RoleIndex(role_client)
+        await index.build(["c1"])
+
+        assert index.handle_event(_event("channel.vip.add", "c2", "4"))
+        assert sorted(index.channels_for("4", VIP)) == ["c1", "c2"]
+        assert index.handle_event(_event("channel.moderator.remove", "c1", "2"))
+        assert index.members("c1") == ["1", "3"]
+        assert index.channels_for("2") == []
+        index.handle_event(_event("channel.moderator.remove", "c9", "2"))  # Unknown channel
+        assert not index.handle_event({"subscription": {"type": "channel.follow"}, "event": {}})
+
+    async def test_save_and_restore(self, role_client, tmp_path):
+        """A restored snapshot answers the same queries, reverse maps included."""
+        index = RoleIndex(role_client)
+        await index.build(["c1", "c2"])
+        path = tmp_path / "roles.json"
+        index.save(path)
+
+        restored = RoleIndex(role_client)
+        restored.restore(path)
+        assert restored.members("c1") == index.members("c1")
+        assert sorted(restored.channels_for("1")) == ["c1", "c2"]
+        assert restored.members("c1", VIP) == ["4"] and restored.login("4") == "u4"
+
+        path.write_text('{"version": 0}')
+        with pytest.raises(ValueError):
+            restored.restore(path)
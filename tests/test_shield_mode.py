@@ -0,0 +1,115 @@
+"""Tests for the Shield Mode anomaly detector."""
+
+from twitch_sdk.helpers.shield_mode import ShieldModeDetector
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _detector(fake_client, clock, **kwargs) -> ShieldModeDetector:
+    fake_client.route("PUT", "/moderation/shield_mode", lambda p, d: {"data": [{
+        "is_active": d["is_active"],
+        "moderator_id": "mod",
+        "moderator_login": "mod",
+        "moderator_name": "Mod",
+        "last_activated_at": "2024-01-01T00:00:00Z",
+    }]})
+    options = dict(window=10, warmup=60, hold=30, min_rate=2.0)
+    options.update(kwargs)
+    return ShieldModeDetector(fake_client, "mod", clock=clock, **options)
+
+
+def _chat(detector, clock, seconds: int, per_second: int, users) -> None:
+    for _ in range(seconds):
+        for _ in range(per_second):
+            detector.observe("b1", next(users))
+        clock.now += 1
+
+
+class TestShieldModeDetector:
+    """Test rate features and hysteresis."""
+
+    async def test_raid_activates_then_releases(self, fake_client):
+        """A surge of new chatters activates; it releases only after the hold."""
+        clock = FakeClock()
+        detector = _detector(fake_client, clock)
+        regulars = iter(str(i % 20) for i in range(10**6))
+        _chat(detector, clock, 120, 1, regulars)
+        assert detector.evaluate() == []
+
+        raiders = iter(str(1000 + i) for i in range(10**6))
+        _chat(detector, clock, 10, 30, raiders)
+        snapshot = detector.snapshot("b1")
+        assert snapshot.rate > 25 and snapshot.new_chatter_ratio == 1.0
+        assert detector.evaluate() == [("b1", True)]
+        await detector.set_shield_mode("b1", True)
+        assert detector.is_active("b1")
+
+        # Calm again, but Shield Mode stays on until calm for `hold` seconds
+        _chat(detector, clock, 20, 1, regulars)
+        assert detector.evaluate() == []
+        _chat(detector, clock, 31, 1, regulars)
+        assert detector.evaluate() == [("b1", False)]
+        await detector.set_shield_mode("b1", False)
+        assert [d["is_active"] for _, _, _, d in fake_client.calls] == [True, False]
+
+    async def test_warmup_and_manual_shield_mode(self, fake_client):
+        """Nothing triggers during warmup; manual Shield Mode is never released."""
+        clock = FakeClock()
+        detector = _detector(fake_client, clock)
+        users = iter(str(i) for i in range(10**6))
+        _chat(detector, clock, 10, 50, users)
+        assert detector.evaluate() == []
+
+        detector.handle_event({
+            "subscription": {"type": "channel.shield_mode.begin"},
+            "event": {"broadcaster_user_id": "b1", "moderator_user_id": "someone"},
+        })
+        clock.now += 1000
+        assert detector.is_active("b1")
+        assert detector.evaluate() == []
+
+    def test_burstiness(self, fake_client):
+        """Bursty counts give a high variance-to-mean ratio at the same rate."""
+        clock = FakeClock()
+        detector = _detector(fake_client, clock)
+        users = iter(str(i % 5) for i in range(10**6))
+        _chat(detector, clock, 9, 0, users)
+        _chat(detector, clock, 1, 50, users)
+        clock.now -= 1
+        assert detector.snapshot("b1").burstiness > 40
+
+    async def test_failed_toggle_is_reported(self, fake_client):
+        """Toggle errors are returned and passed to on_error; the channel is retried."""
+        clock = FakeClock()
+        failures = []
+        detector = _detector(fake_client, clock, warmup=0, on_error=lambda *args: failures.append(args))
+
+        def refuse(params, data):
+            raise RuntimeError("forbidden")
+
+        fake_client.route("PUT", "/moderation/shield_mode", refuse)
+        _chat(detector, clock, 10, 30, iter(str(i) for i in range(10**6)))
+        errors = await detector.act()
+        assert list(errors) == ["b1"] and isinstance(errors["b1"], RuntimeError)
+        assert failures == [("b1", True, errors["b1"])]
+        assert not detector.is_active("b1")
+        assert detector.evaluate() == [("b1", True)]
+
+    def test_remembered_chatters_are_capped(self, fake_client):
+        """The default new-chatter check forgets the oldest chatters past the cap."""
+        clock = FakeClock()
+        detector = _detector(fake_client, clock, max_chatters=4)
+        for user_id in ("1", "2", "3", "4", "1"):
+            detector.observe("b1", user_id)
+        assert detector.snapshot("b1").new_chatter_ratio == 1.0  # "1" was forgotten
+        detector.observe("b1", "4")  # Still remembered
+        detector.observe("b1", "3")  # Forgotten once "4" was carried over
+        channel = detector._channels["b1"]
+        assert len(channel.seen) + len(channel.seen_before) <= 4
+        assert detector.snapshot("b1").new_chatter_ratio == 6 / 7
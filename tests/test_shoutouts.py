@@ -0,0 +1,174 @@
+"""Tests for the shoutout and announcement scheduler."""
+
+import asyncio
+
+import pytest
+from twitch_client import TwitchAPIError, TwitchRateLimitError
+from twitch_sdk.helpers._timers import TimerWheel
+from twitch_sdk.helpers.shoutouts import ShoutoutScheduler
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+async def _drain(scheduler: ShoutoutScheduler) -> None:
+    scheduler.process()
+    await asyncio.sleep(0)
+
+
+class TestTimerWheel:
+    """Test the timer wheel."""
+
+    def test_fires_due_keys(self):
+        """Keys fire once their deadline passes."""
+        wheel = TimerWheel(tick=1.0, slots=8)
+        wheel.schedule("a", 2.5)
+        wheel.schedule("b", 5.0)
+        assert wheel.advance(1.0) == []
+        assert wheel.advance(3.0) == ["a"]
+        assert wheel.advance(10.0) == ["b"]
+        assert len(wheel) == 0
+
+    def test_deadline_beyond_one_lap(self):
+        """Deadlines more than a lap away wait for their time."""
+        wheel = TimerWheel(tick=1.0, slots=4)
+        wheel.schedule("far", 10.0)
+        assert wheel.advance(2.0) == []
+        assert wheel.advance(6.0) == []
+        assert wheel.advance(10.0) == ["far"]
+
+    def test_reschedule_moves_key(self):
+        """Scheduling an existing key replaces its deadline."""
+        wheel = TimerWheel(tick=1.0, slots=8)
+        wheel.schedule("a", 2.0)
+        wheel.schedule("a", 6.0)
+        assert wheel.advance(3.0) == []
+        assert wheel.deadline("a") == 6.0
+
+
+class TestShoutoutScheduler:
+    """Test cooldown tracking and dedupe."""
+
+    async def test_global_cooldown(self, fake_client, clock):
+        """Shoutouts from one broadcaster are spaced by the global cooldown."""
+        scheduler = ShoutoutScheduler(fake_client, moderator_id="mod", clock=clock)
+        first = scheduler.shoutout("b1", "t1")
+        second = scheduler.shoutout("b1", "t2")
+
+        await _drain(scheduler)
+        assert first.done() and not second.done()
+
+        clock.now += scheduler.SHOUTOUT_COOLDOWN - 1
+        await _drain(scheduler)
+        assert not second.done()
+
+        clock.now += 1
+        await _drain(scheduler)
+        assert second.done()
+        assert fake_client.count("POST", "/chat/shoutouts") == 2
+
+    async def test_target_cooldown_skips_ahead(self, fake_client, clock):
+        """A target on cooldown does not block shoutouts to other targets."""
+        scheduler = ShoutoutScheduler(fake_client, moderator_id="mod", clock=clock)
+        scheduler.record_shoutout("b1", "t1", cooldown_ends_in=0)
+        blocked = scheduler.shoutout("b1", "t1")
+        other = scheduler.shoutout("b1", "t2")
+
+        await _drain(scheduler)
+        assert other.done() and not blocked.done()
+        assert scheduler.next_shoutout_time("b1", "t1") == 1000.0 + scheduler.SHOUTOUT_TARGET_COOLDOWN
+
+    async def test_pending_deduped(self, fake_client, clock):
+        """Identical pending requests share one future."""
+        scheduler = ShoutoutScheduler(fake_client, moderator_id="mod", clock=clock)
+        assert scheduler.shoutout("b1", "t1") is scheduler.shoutout("b1", "t1")
+        assert scheduler.announce("b1", "hi") is scheduler.announce("b1", "hi")
+        assert scheduler.pending == 2
+
+    async def test_channels_independent(self, fake_client, clock):
+        """Each broadcaster has its own cooldown."""
+        scheduler = ShoutoutScheduler(fake_client, moderator_id="mod", clock=clock)
+        futures = [scheduler.shoutout(f"b{i}", "t1") for i in range(5)]
+        await _drain(scheduler)
+        assert all(f.done() for f in futures)
+
+    async def test_shoutout_event_records_cooldown(self, fake_client, clock):
+        """channel.shoutout.create events start the cooldowns."""
+        scheduler = ShoutoutScheduler(fake_client, moderator_id="mod", clock=clock)
+        scheduler.handle_event({
+            "subscription": {"type": "channel.shoutout.create"},
+            "event": {
+                "broadcaster_user_id": "b1",
+                "to_broadcaster_user_id": "t1",
+                "cooldown_ends_at": "2999-01-01T00:00:00Z",
+                "target_cooldown_ends_at": "2999-01-01T00:00:00Z",
+            },
+        })
+        future = scheduler.shoutout("b1", "t2")
+        await _drain(scheduler)
+        assert not future.done()
+
+    async def test_rate_limited_shoutout_is_retried(self, fake_client, clock):
+        """A 429 gives the cooldowns back, so the requeued shoutout is sent on retry."""
+        responses = [TwitchRateLimitError("Too Many Requests")]
+
+        def handler(params, data):
+            if responses:
+                raise responses.pop()
+            return {}
+
+        fake_client.route("POST", "/chat/shoutouts", handler)
+        scheduler = ShoutoutScheduler(fake_client, moderator_id="mod", clock=clock)
+        future = scheduler.shoutout("b1", "t1")
+        await _drain(scheduler)
+        assert not future.done() and scheduler.pending == 1
+        assert scheduler.next_shoutout_time("b1", "t1") == clock.now + 1.0
+
+        clock.now += 1.0
+        await _drain(scheduler)
+        assert future.done() and future.exception() is None
+        assert fake_client.count("POST", "/chat/shoutouts") == 2
+        assert scheduler.next_shoutout_time("b1", "t1") == clock.now + scheduler.SHOUTOUT_TARGET_COOLDOWN
+
+    async def test_failed_shoutout_releases_cooldowns(self, fake_client, clock):
+        """A shoutout that fails leaves no cooldown behind."""
+        def handler(params, data):
+            raise TwitchAPIError(400, "The broadcaster is not streaming live")
+
+        fake_client.route("POST", "/chat/shoutouts", handler)
+        scheduler = ShoutoutScheduler(fake_client, moderator_id="mod", clock=clock)
+        future = scheduler.shoutout("b1", "t1")
+        await _drain(scheduler)
+        assert isinstance(future.exception(), TwitchAPIError)
+        assert scheduler.next_shoutout_time("b1", "t1") == clock.now
+
+    async def test_announcement_cooldown_survives_idle_channel(self, fake_client, clock):
+        """An announcement queued within the cooldown waits for it to end."""
+        scheduler = ShoutoutScheduler(
+            fake_client, moderator_id="mod", announcement_cooldown=10, clock=clock
+        )
+        first = scheduler.announce("b1", "one")
+        await _drain(scheduler)
+        assert first.done()
+
+        clock.now += 0.5
+        second = scheduler.announce("b1", "two")
+        await _drain(scheduler)
+        assert not second.done()
+
+        clock.now += 9.5
+        await _drain(scheduler)
+        assert second.done()
+        assert fake_client.count("POST", "/chat/announcements") == 2
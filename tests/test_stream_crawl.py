@@ -0,0 +1,96 @@
+"""Tests for the partitioned live-stream crawler."""
+
+import pytest
+from twitch_sdk.helpers._ratelimit import RateBudget
+from twitch_sdk.helpers.stream_crawl import Partition, StreamCrawler
+
+
+def _paginate(items: list[dict], params: dict) -> dict:
+    start = int(params.get("after", 0))
+    end = start + int(params.get("first", 20))
+    cursor = {"cursor": str(end)} if end < len(items) else {}
+    return {"data": items[start:end], "pagination": cursor}
+
+
+@pytest.fixture
+def world(fake_client):
+    languages = ["en", "es", "de"]
+    all_streams = [
+        {
+            "id": f"s{i}",
+            "user_id": str(i),
+            "user_login": f"u{i}",
+            "user_name": f"U{i}",
+            "game_id": str(i % 7 if i % 3 else 0),  # Game "0" is the biggest
+            "game_name": "Game",
+            "type": "live",
+            "title": "t",
+            "viewer_count": 10_000 - i,
+            "started_at": "2024-01-01T00:00:00Z",
+            "language": languages[i % 3],
+            "thumbnail_url": "",
+            "is_mature": False,
+        }
+        for i in range(2000)
+    ]
+
+    def get_streams(params, data):
+        game_ids = params.get("game_id")
+        langs = params.get("language")
+        matching = [
+            stream for stream in all_streams
+            if (not game_ids or stream["game_id"] in game_ids)
+            and (not langs or stream["language"] in langs)
+        ]
+        return _paginate(matching, params)
+
+    top_games = [{"id": str(i), "name": f"G{i}", "box_art_url": ""} for i in range(7)]
+    fake_client.route("GET", "/streams", get_streams)
+    fake_client.route("GET", "/games/top", lambda p, d: _paginate(top_games, p))
+    return fake_client, all_streams
+
+
+class TestStreamCrawler:
+    """Test partitioning and deduplication."""
+
+    def test_partition_plan(self, fake_client):
+        """Top categories split by language, then solo, then grouped."""
+        crawler = StreamCrawler(fake_client, split_games=1, solo_games=2, languages=("en", "es"))
+        partitions = crawler.partitions_for(["a", "b", "c", "d"], rank=0)
+        assert partitions == [
+            Partition(("a",), ("en",)),
+            Partition(("a",), ("es",)),
+            Partition(("b",)),
+            Partition(("c", "d")),
+        ]
+
+    async def test_crawl_finds_every_stream(self, world):
+        """Every stream is found once, across parallel cursors."""
+        client, all_streams = world
+        crawler = StreamCrawler(
+            client,
+            budget=RateBudget(points=10_000),
+            split_games=1,
+            solo_games=3,
+            languages=("en", "es", "de"),
+        )
+        snapshot = await crawler.crawl()
+
+        assert set(snapshot.streams) == {stream["user_id"] for stream in all_streams}
+        assert snapshot.duplicates == 0 and not snapshot.failed
+        assert len(snapshot.partitions) == 3 + 2 + 1
+        assert snapshot.pages == client.count("GET", "/streams")
+
+    async def test_unlisted_sweep_dedupes(self, world):
+        """The per-language sweep refetches listed streams but dedupes them."""
+        client, all_streams = world
+        crawler = StreamCrawler(
+            client,
+            budget=RateBudget(points=10_000),
+            languages=("en", "es", "de"),
+            include_unlisted=True,
+        )
+        snapshot = await crawler.crawl()
+
+        assert len(snapshot) == len(all_streams)
+        assert snapshot.duplicates == len(all_streams)
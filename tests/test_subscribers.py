@@ -0,0 +1,169 @@
+"""Tests for the subscriber tracker."""
+
+import asyncio
+
+import pytest
+from twitch_sdk.helpers.subscribers import CHANGED, LOST, NEW, SubscriberSet, SubscriberTracker
+
+ENDPOINT = "/subscriptions"
+
+
+def _sub(user_id: str, tier: str = "1000", is_gift: bool = False) -> dict:
+    return {
+        "broadcaster_id": "b1",
+        "broadcaster_login": "streamer",
+        "broadcaster_name": "Streamer",
+        "gifter_id": "9" if is_gift else None,
+        "is_gift": is_gift,
+        "plan_name": "Sub",
+        "tier": tier,
+        "user_id": user_id,
+        "user_login": f"u{user_id}",
+        "user_name": f"U{user_id}",
+    }
+
+
+def _paged(subs: list[dict], page_size: int = 2):
+    """Handler serving ``subs`` in pages with integer cursors."""
+    def handler(params, data):
+        start = int(params.get("after") or 0)
+        end = start + page_size
+        return {
+            "data": subs[start:end],
+            "pagination": {"cursor": str(end)} if end < len(subs) else {},
+            "total": len(subs),
+            "points": len(subs),
+        }
+    return handler
+
+
+def _event(kind: str, user_id: str, tier: str = "1000", is_gift: bool = False) -> dict:
+    return {
+        "subscription": {"type": kind},
+        "event": {"broadcaster_user_id": "b1", "user_id": user_id, "tier": tier, "is_gift": is_gift},
+    }
+
+
+class TestSubscriberSet:
+    """Test the compact set and its aggregates."""
+
+    def test_aggregates_follow_updates(self):
+        """Tier counts, gifts and points change with every set and remove."""
+        subscribers = SubscriberSet()
+        subscribers.set("30", "1000", False)
+        subscribers.set("10", "3000", True)
+        subscribers.set("20", "2000", False)
+        assert [user_id for user_id, _, _ in subscribers] == ["10", "20", "30"]
+        assert subscribers.counts() == {"1000": 1, "2000": 1, "3000": 1}
+        assert (subscribers.points, subscribers.gifted) == (9, 1)
+
+        subscribers.set("10", "1000", False)
+        subscribers.remove("20")
+        assert subscribers.counts() == {"1000": 2, "2000": 0, "3000": 0}
+        assert (subscribers.points, subscribers.gift_ratio) == (2, 0.0)
+        assert subscribers.get("10") == ("1000", False)
+        assert "20" not in subscribers
+
+
+class TestSubscriberTracker:
+    """Test crawling, diffing and events."""
+
+    async def test_diff_against_previous_crawl(self, fake_client):
+        """A second crawl reports new, lost and changed subscribers."""
+        fake_client.route("GET", ENDPOINT, _paged([_sub("1"), _sub("2"), _sub("3", "2000")]))
+        tracker = SubscriberTracker(fake_client)
+        first = await tracker.crawl("b1")
+        assert first.initial and first.count(NEW) == 3 and first.pages == 2
+
+        fake_client.route("GET", ENDPOINT, _paged([
+            _sub("1"), _sub("3", "3000", is_gift=True), _sub("4"),
+        ]))
+        second = await tracker.crawl("b1")
+        changes = {change.user_id: change for change in second.changes}
+        assert {user_id: change.kind for user_id, change in changes.items()} == {
+            "2": LOST, "3": CHANGED, "4": NEW,
+        }
+        assert (changes["3"].old_tier, changes["3"].tier, changes["3"].is_gift) == ("2000", "3000", True)
+        subscribers = tracker.get("b1")
+        assert subscribers.counts() == {"1000": 2, "2000": 0, "3000": 1}
+        assert subscribers.gifted == 1
+
+    async def test_duplicates_across_pages_are_ignored(self, fake_client):
+        """A subscriber shifted onto the next page is counted once."""
+        fake_client.route("GET", ENDPOINT, _paged([_sub("1"), _sub("2"), _sub("2"), _sub("3")]))
+        tracker = SubscriberTracker(fake_client)
+        await tracker.crawl("b1")
+        assert len(tracker.get("b1")) == 3
+
+    async def test_next_page_is_prefetched(self, fake_client):
+        """The next page is requested before the current one is processed."""
+        fake_client.route("GET", ENDPOINT, _paged([_sub(str(i)) for i in range(6)]))
+        tracker = SubscriberTracker(fake_client)
+        requested_while_processing = [
+            fake_client.count("GET", ENDPOINT) async for _ in tracker._pages("b1")
+        ]
+        assert requested_while_processing == [2, 3, 3]
+
+    async def test_overlapping_crawls_share_one(self, fake_client):
+        """A crawl started while one is running joins it."""
+        fake_client.latency = 0.01
+        fake_client.route("GET", ENDPOINT, _paged([_sub("1"), _sub("2"), _sub("3")]))
+        tracker = SubscriberTracker(fake_client)
+        first, second = await asyncio.gather(tracker.crawl("b1"), tracker.crawl("b1"))
+        assert first is second
+        assert fake_client.count("GET", ENDPOINT) == 2
+
+    async def test_failed_crawl_reports_nothing(self, fake_client):
+        """Changes are reported only by crawls that complete."""
+        subs = [_sub(str(i)) for i in range(1, 7)]
+        serve = _paged(subs)
+
+        def failing(params, data):
+            if params.get("after") == "4":
+                raise RuntimeError("connection reset")
+            return serve(params, data)
+
+        changes = []
+        tracker = SubscriberTracker(fake_client, on_change=lambda b, c: changes.extend(c))
+        fake_client.route("GET", ENDPOINT, failing)
+        with pytest.raises(RuntimeError):
+            await tracker.crawl("b1")
+        assert changes == [] and "b1" not in tracker
+
+        fake_client.route("GET", ENDPOINT, serve)
+        await tracker.crawl("b1")
+        assert sorted(change.user_id for change in changes) == ["1", "2", "3", "4", "5", "6"]
+
+    async def test_events_between_and_during_crawls(self, fake_client):
+        """Events update the set; events during a crawl are applied to its result."""
+        fake_client.latency = 0.01
+        fake_client.route("GET", ENDPOINT, _paged([_sub("1"), _sub("2")]))
+        changes = []
+        tracker = SubscriberTracker(fake_client, on_change=lambda b, c: changes.extend(c))
+        await tracker.crawl("b1")
+        changes.clear()
+
+        assert tracker.handle_event(_event("channel.subscribe", "5", "2000"))
+        assert tracker.get("b1").counts()["2000"] == 1
+
+        crawl = asyncio.ensure_future(tracker.crawl("b1"))
+        await asyncio.sleep(0.005)
+        tracker.handle_event(_event("channel.subscription.end", "1"))
+        await crawl
+        assert "1" not in tracker.get("b1")
+        assert [(change.kind, change.user_id) for change in changes] == [
+            (NEW, "5"), (LOST, "5"), (LOST, "1"),
+        ]
+
+    async def test_save_and_restore(self, fake_client, tmp_path):
+        """Snapshots survive a restart, so the next crawl still diffs."""
+        fake_client.route("GET", ENDPOINT, _paged([_sub("1"), _sub("2", "3000")]))
+        tracker = SubscriberTracker(fake_client)
+        await tracker.crawl("b1")
+        tracker.save(tmp_path / "subs.json")
+
+        restored = SubscriberTracker(fake_client)
+        restored.restore(tmp_path / "subs.json")
+        assert restored.get("b1").points == 7
+        result = await restored.crawl("b1")
+        assert not result.initial and result.changes == []
@@ -0,0 +1,131 @@
+"""Tests for the live poll and prediction tallies."""
+
+from twitch_sdk.helpers.tallies import POLL, PREDICTION, TallyAggregator
+from twitch_sdk.schemas.polls import Poll
+
+
+def _poll_event(phase: str, votes: tuple[int, int], status: str | None = None) -> dict:
+    event = {
+        "id": "p1",
+        "broadcaster_user_id": "b1",
+        "title": "Best game?",
+        "choices": [
+            {"id": "c1", "title": "Chess", "votes": votes[0], "channel_points_votes": 0, "bits_votes": 0},
+            {"id": "c2", "title": "Go", "votes": votes[1], "channel_points_votes": 1, "bits_votes": 0},
+        ],
+    }
+    if status:
+        event["status"] = status
+    return {"subscription": {"type": f"channel.poll.{phase}"}, "event": event}
+
+
+def _prediction_event(phase: str, points: tuple[int, int], **extra) -> dict:
+    event = {
+        "id": "q1",
+        "broadcaster_user_id": "b1",
+        "title": "Win?",
+        "outcomes": [
+            {"id": "o1", "title": "Yes", "color": "blue", "users": 2, "channel_points": points[0],
+             "top_predictors": [{"user_id": "7", "user_login": "big", "channel_points_used": points[0],
+                                 "channel_points_won": None}]},
+            {"id": "o2", "title": "No", "color": "pink", "users": 1, "channel_points": points[1]},
+        ],
+        **extra,
+    }
+    return {"subscription": {"type": f"channel.prediction.{phase}"}, "event": event}
+
+
+def _poll(poll_id: str, votes: int, status: str = "ACTIVE") -> dict:
+    return {
+        "id": poll_id,
+        "broadcaster_id": "b1",
+        "broadcaster_login": "streamer",
+        "broadcaster_name": "Streamer",
+        "title": "Best game?",
+        "choices": [{"id": "c1", "title": "Chess", "votes": votes}, {"id": "c2", "title": "Go", "votes": 0}],
+        "status": status,
+        "duration": 60,
+        "started_at": "2024-01-01T00:00:00Z",
+    }
+
+
+class TestTallyAggregator:
+    """Test in-place event application and the polling fallback."""
+
+    async def test_progress_updates_views_in_place(self, fake_client):
+        """Views obtained once keep showing current counts; late progress is ignored."""
+        updates = []
+        aggregator = TallyAggregator(fake_client, on_update=updates.append)
+        assert aggregator.handle_event(_poll_event("progress", (3, 1)))
+        tally = aggregator.get("p1")
+        votes = tally.votes
+        assert (tally.kind, tally.choice_ids, votes.tolist()) == (POLL, ("c1", "c2"), [3, 1])
+        assert votes.readonly
+
+        aggregator.handle_event(_poll_event("progress", (5, 1)))
+        aggregator.handle_event(_poll_event("progress", (5, 1)))  # No change, no update
+        assert aggregator.get("p1") is tally
+        assert votes.tolist() == [5, 1] and tally.total == 6 and tally.leader() == "c1"
+        assert len(updates) == 2 and tally.version == 2
+
+        aggregator.handle_event(_poll_event("end", (6, 9), status="completed"))
+        aggregator.handle_event(_poll_event("progress", (7, 9)))
+        assert (tally.status, tally.is_final, votes.tolist()) == ("COMPLETED", True, [6, 9])
+        assert aggregator.active() == []
+
+    async def test_prediction_lifecycle(self, fake_client):
+        """Prediction events update points, top predictors, lock and winner."""
+        aggregator = TallyAggregator(fake_client)
+        aggregator.handle_event(_prediction_event("begin", (0, 0)))
+        aggregator.handle_event(_prediction_event("progress", (500, 200)))
+        tally = aggregator.get("q1")
+        assert tally.kind == PREDICTION
+        assert tally.channel_points.tolist() == [500, 200]
+        assert tally.top_predictors[0][0].channel_points_used == 500
+
+        aggregator.handle_event(_prediction_event("lock", (500, 200)))
+        assert tally.status == "LOCKED" and not tally.is_final
+        aggregator.handle_event(_prediction_event("end", (500, 200), status="resolved", winning_outcome_id="o1"))
+        assert (tally.status, tally.winning_choice_id) == ("RESOLVED", "o1")
+
+    async def test_fallback_polls_only_stale_contests(self, fake_client):
+        """Only contests without recent events are polled, batched per broadcaster."""
+        fake_client.route("GET", "/polls", lambda params, data: {
+            "data": [_poll(poll_id, 42) for poll_id in params["id"]],
+        })
+        aggregator = TallyAggregator(fake_client, stale_after=0.0)
+        aggregator.handle_event(_poll_event("progress", (1, 0)))
+        aggregator.apply_poll(Poll.model_validate(_poll("p2", 0)))
+        assert "p2" in aggregator
+
+        assert await aggregator.refresh_stale() == {}
+        assert fake_client.count("GET", "/polls") == 1
+        assert fake_client.calls[0][2]["id"] == ["p1", "p2"]
+        assert aggregator.get("p1").votes[0] == 42
+
+        aggregator.stale_after = 60.0
+        aggregator.handle_event(_poll_event("progress", (50, 0)))
+        await aggregator.refresh_stale()
+        assert fake_client.count("GET", "/polls") == 1
+
+    async def test_locked_prediction_polled_less_often(self, fake_client):
+        """A quiet locked prediction waits ``locked_stale_after``, not ``stale_after``."""
+        fake_client.route("GET", "/predictions", {"data": []})
+        aggregator = TallyAggregator(fake_client, stale_after=0.0, locked_stale_after=60.0)
+        aggregator.handle_event(_prediction_event("lock", (500, 200)))
+        await aggregator.refresh_stale()
+        assert fake_client.count("GET", "/predictions") == 0
+
+        aggregator.locked_stale_after = 0.0
+        await aggregator.refresh_stale()
+        assert fake_client.count("GET", "/predictions") == 1
+
+    async def test_seed(self, fake_client):
+        """Seeding reads each broadcaster's latest poll and prediction once."""
+        fake_client.route("GET", "/polls", {"data": [_poll("p9", 4)]})
+        fake_client.route("GET", "/predictions", {"data": []})
+        aggregator = TallyAggregator(fake_client)
+        assert await aggregator.seed(["b1"]) == {}
+        assert aggregator.get("p9").votes.tolist() == [4, 0]
+        assert fake_client.count("GET", "/polls") == fake_client.count("GET", "/predictions") == 1
+
@@ -0,0 +1,71 @@
+"""Tests for the typeahead search layer."""
+
+import asyncio
+
+import pytest
+from twitch_sdk.helpers.search import PrefixIndex, TypeaheadSearch, word_keys
+
+
+@pytest.fixture
+def search_api(fake_client):
+    names = ["Grand Theft Auto V", "Grounded", "Minecraft", "Mini Motorways", "Just Chatting"]
+    categories = [{"id": str(i), "name": name, "box_art_url": ""} for i, name in enumerate(names)]
+
+    def search_categories(params, data):
+        query = params["query"].lower()
+        return {"data": [c for c in categories if query in c["name"].lower()]}
+
+    fake_client.route("GET", "/search/categories", search_categories)
+    return fake_client
+
+
+class TestPrefixIndex:
+    """Test the sorted-array prefix index."""
+
+    def test_word_prefixes(self):
+        """Items are found by a prefix of any word-suffix, once each."""
+        index: PrefixIndex[str] = PrefixIndex()
+        index.add("1", word_keys("Grand Theft Auto"), "gta")
+        index.add("2", word_keys("Auto Chess"), "chess")
+        assert index.search("auto") == ["gta", "chess"]
+        assert index.search("theft a") == ["gta"]
+
+        index.add("2", word_keys("Dota Underlords"), "underlords")
+        assert index.search("auto") == ["gta"]
+        index.remove("1")
+        assert index.search("g") == []
+
+
+class TestTypeaheadSearch:
+    """Test caching, local answers and debouncing."""
+
+    async def test_local_answers_after_fetch(self, search_api):
+        """Once results are indexed, narrower prefixes need no request."""
+        typeahead = TypeaheadSearch(search_api, debounce=0)
+        results = await typeahead.search_categories("mi", limit=2)
+        assert [c.name for c in results] == ["Minecraft", "Mini Motorways"]
+
+        assert [c.name for c in await typeahead.search_categories("min", limit=2)] == [
+            "Minecraft", "Mini Motorways",
+        ]
+        await typeahead.search_categories("mi", limit=2)
+        assert search_api.count("GET", "/search/categories") == 1
+        assert (typeahead.stats.local, typeahead.stats.cached) == (1, 1)
+
+    async def test_debounce_and_dedupe(self, search_api):
+        """Superseded keystrokes skip Helix; identical queries share a request."""
+        typeahead = TypeaheadSearch(search_api, debounce=0.01)
+        keystrokes = await asyncio.gather(
+            typeahead.search_categories("g", session="box"),
+            typeahead.search_categories("gr", session="box"),
+            typeahead.search_categories("gra", session="box"),
+        )
+        assert keystrokes[:2] == [[], []]
+        assert [c.name for c in keystrokes[2]] == ["Grand Theft Auto V"]
+
+        await asyncio.gather(
+            typeahead.search_categories("just"),
+            typeahead.search_categories("just"),
+        )
+        assert search_api.count("GET", "/search/categories") == 2
+        assert (typeahead.stats.superseded, typeahead.stats.shared) == (2, 1)
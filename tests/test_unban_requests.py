@@ -0,0 +1,93 @@
+"""Tests for the unban-request triage pipeline."""
+
+import pytest
+from twitch_sdk.helpers.unban_requests import (
+    APPROVED,
+    DENIED,
+    UnbanDecision,
+    UnbanTriage,
+    text_rule,
+    user_rule,
+)
+
+
+def _request(request_id: str, broadcaster_id: str, user_id: str, text: str) -> dict:
+    return {
+        "id": request_id,
+        "broadcaster_id": broadcaster_id,
+        "broadcaster_login": "b",
+        "broadcaster_name": "B",
+        "moderator_id": "mod",
+        "moderator_login": "mod",
+        "moderator_name": "Mod",
+        "user_id": user_id,
+        "user_login": f"u{user_id}",
+        "user_name": f"U{user_id}",
+        "text": text,
+        "status": "pending",
+        "created_at": "2024-01-01T00:00:00Z",
+    }
+
+
+@pytest.fixture
+def unban_client(fake_client):
+    pending = {
+        "b1": [
+            _request("r1", "b1", "1", "I am sorry, please unban"),
+            _request("r2", "b1", "2", "you suck"),
+            _request("r3", "b1", "3", "why was I banned?"),
+        ],
+        "b2": [_request("r4", "b2", "4", "sorry!")],
+    }
+    fake_client.route(
+        "GET", "/moderation/unban_requests", lambda p, d: {"data": pending[p["broadcaster_id"]]}
+    )
+    fake_client.route(
+        "PATCH", "/moderation/unban_requests", lambda p, d: {"data": []}
+    )
+    return fake_client
+
+
+class TestUnbanTriage:
+    """Test rule decisions and resolution."""
+
+    async def test_rules_first_match_wins(self, unban_client):
+        """Requests are resolved by the first matching rule; others stay pending."""
+        triage = UnbanTriage(unban_client, "mod", rules=[
+            user_rule(["2"], APPROVED),
+            text_rule(r"\bsuck\b", DENIED, "Be nice"),
+            text_rule(r"sorry", APPROVED),
+        ])
+        stats = await triage.run(["b1", "b2"])
+
+        assert (stats["b1"].approved, stats["b1"].denied, stats["b1"].undecided) == (2, 0, 1)
+        assert stats["b2"].approved == 1
+        resolved = {params["unban_request_id"]: params["status"]
+                    for _, _, params, _ in unban_client.calls if params.get("unban_request_id")}
+        assert resolved == {"r1": APPROVED, "r2": APPROVED, "r4": APPROVED}
+
+    async def test_async_rule_and_dry_run(self, unban_client):
+        """Async rules are awaited and dry runs resolve nothing."""
+        async def deny_all(request):
+            return UnbanDecision(DENIED)
+
+        triage = UnbanTriage(unban_client, "mod", rules=[deny_all], dry_run=True)
+        stats = await triage.run(["b1"])
+
+        assert stats["b1"].denied == 3
+        assert unban_client.count("PATCH", "/moderation/unban_requests") == 0
+        assert len(triage.decisions) == 3
+
+    async def test_failing_rule_fails_only_its_request(self, unban_client):
+        """A rule that raises counts its request as failed; the run carries on."""
+        def picky(request):
+            if request.id == "r2":
+                raise ValueError("bad rule")
+            return UnbanDecision(APPROVED)
+
+        triage = UnbanTriage(unban_client, "mod", rules=[picky])
+        stats = await triage.run(["b1", "b2"])
+
+        assert (stats["b1"].approved, stats["b1"].failed) == (2, 1)
+        assert stats["b2"].approved == 1
+        assert all(channel.finished_at >= channel.started_at for channel in stats.values())
@@ -0,0 +1,94 @@
+"""Tests for the persistent login/id resolver."""
+
+import asyncio
+
+import pytest
+from twitch_sdk.helpers.user_resolver import UserResolver
+
+
+def _user(user_id: str, login: str) -> dict:
+    return {
+        "id": user_id,
+        "login": login,
+        "display_name": login.title(),
+        "created_at": "2020-01-01T00:00:00Z",
+    }
+
+
+@pytest.fixture
+def accounts(fake_client):
+    table = {"1": "alice", "2": "bob", "3": "carol"}
+
+    def get_users(params, data):
+        if "id" in params:
+            found = [_user(i, table[i]) for i in params["id"] if i in table]
+        else:
+            by_login = {login: user_id for user_id, login in table.items()}
+            found = [_user(by_login[l], l) for l in params["login"] if l in by_login]
+        return {"data": found}
+
+    fake_client.route("GET", "/users", get_users)
+    return fake_client, table
+
+
+class TestUserResolver:
+    """Test batching, persistence and rename handling."""
+
+    async def test_coalesces_lookups(self, accounts):
+        """Concurrent misses share one Get Users call per direction."""
+        client, _ = accounts
+        resolver = UserResolver(client)
+        ids = await asyncio.gather(
+            resolver.resolve_login("Alice"),
+            resolver.resolve_login("bob"),
+            resolver.resolve_login("nobody"),
+        )
+        assert ids == ["1", "2", None]
+        assert client.count("GET", "/users") == 1
+
+        assert await resolver.login_of("1") == "alice"
+        assert await resolver.resolve_login("nobody") is None
+        assert client.count("GET", "/users") == 1
+
+    async def test_cold_start_from_disk(self, accounts, tmp_path):
+        """A new resolver on the same file answers without the network."""
+        client, _ = accounts
+        path = tmp_path / "users.db"
+        first = UserResolver(client, path=path)
+        await first.get_users(["1", "2", "3"])
+        first.close()
+        calls = client.count("GET", "/users")
+
+        second = UserResolver(client, path=path)
+        assert await second.resolve_logins(["alice", "carol"]) == {"alice": "1", "carol": "3"}
+        assert (await second.get_user("2")).login == "bob"
+        assert client.count("GET", "/users") == calls
+        second.close()
+
+    async def test_rename_invalidates_old_login(self, accounts, tmp_path):
+        """A refetched login change drops the old login and notifies listeners."""
+        client, table = accounts
+        resolver = UserResolver(client, path=tmp_path / "users.db")
+        renames = []
+        resolver.add_rename_listener(lambda *args: renames.append(args))
+        assert await resolver.resolve_login("alice") == "1"
+
+        table["1"] = "alicia"
+        table["4"] = "alice"  # Someone else takes the old login
+        resolver.invalidate("1")
+        assert await resolver.login_of("1") == "alicia"
+        assert renames == [("1", "alice", "alicia")]
+        assert resolver.peek_login("alice") is None
+        assert await resolver.resolve_login("alice") == "4"
+
+    async def test_user_update_event(self, accounts):
+        """user.update events rename cached users."""
+        client, _ = accounts
+        resolver = UserResolver(client)
+        await resolver.get_user("2")
+        resolver.handle_event({
+            "subscription": {"type": "user.update"},
+            "event": {"user_id": "2", "user_login": "robert", "user_name": "Robert"},
+        })
+        assert resolver.peek_login("robert").id == "2"
+        assert resolver.peek_login("bob") is None
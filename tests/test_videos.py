@@ -0,0 +1,79 @@
+"""Tests for the incremental video sync engine."""
+
+import pytest
+from twitch_client import TwitchAPIError
+from twitch_sdk.helpers.videos import ADDED, DELETED, UPDATED, VideoSync
+
+
+def _video(video_id: int, user_id: str, title: str = "vod") -> dict:
+    return {
+        "id": str(video_id),
+        "user_id": user_id, "user_login": "u", "user_name": "U",
+        "title": title, "description": "",
+        "created_at": f"2024-01-01T00:00:{video_id % 60:02d}Z",
+        "published_at": "2024-01-01T00:00:00Z",
+        "url": "", "thumbnail_url": "", "viewable": "public",
+        "view_count": video_id, "language": "en", "type": "archive",
+        "duration": "1h", "muted_segments": None,
+    }
+
+
+@pytest.fixture
+def channel_videos(fake_client):
+    # Newest first per channel
+    table = {"a": [_video(i, "a") for i in reversed(range(250))], "b": []}
+
+    def get_videos(params, data):
+        if "id" in params:
+            by_id = {v["id"]: v for vs in table.values() for v in vs}
+            found = [by_id[i] for i in params["id"] if i in by_id]
+            if not found:
+                raise TwitchAPIError(404, "Not Found")
+            return {"data": found}
+        items = table[params["user_id"]]
+        start = int(params.get("after", 0))
+        end = start + int(params["first"])
+        return {"data": items[start:end], "pagination": {"cursor": str(end)} if end < len(items) else {}}
+
+    fake_client.route("GET", "/videos", get_videos)
+    return fake_client, table
+
+
+class TestVideoSync:
+    """Test incremental sync and verification."""
+
+    async def test_incremental_sync(self, channel_videos, tmp_path):
+        """A second run only reads until the newest known video."""
+        client, table = channel_videos
+        deltas = []
+        sync = VideoSync(client, deltas.append)
+        stats = await sync.sync(["a", "b"])
+        assert (stats.added, stats.pages) == (250, 4)
+        assert deltas[0].video_id == "0" and deltas[-1].video_id == "249"
+
+        sync.save(tmp_path / "state.json")
+        restored = VideoSync(client, deltas.append)
+        restored.restore(tmp_path / "state.json")
+        deltas.clear()
+        table["a"][:0] = [_video(251, "a"), _video(250, "a")]
+        stats = await restored.sync(["a"])
+        assert (stats.added, stats.pages) == (2, 1)
+        assert [(d.kind, d.video_id) for d in deltas] == [(ADDED, "250"), (ADDED, "251")]
+
+    async def test_verify_finds_deletions_and_changes(self, channel_videos):
+        """Batched id checks report deleted and edited videos, not view counts."""
+        client, table = channel_videos
+        deltas = []
+        sync = VideoSync(client, deltas.append)
+        await sync.sync(["a"])
+        deltas.clear()
+
+        table["a"] = [v for v in table["a"] if v["id"] != "5"]
+        for video in table["a"]:
+            video["view_count"] += 1
+        table["a"][0]["title"] = "renamed"
+        stats = await sync.verify()
+
+        assert stats.pages == 3
+        assert sorted((d.kind, d.video_id) for d in deltas) == [(DELETED, "5"), (UPDATED, "249")]
+        assert "5" not in sync.known_videos("a")